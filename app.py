@@ -0,0 +1,301 @@
+"""Electrical Calculator application: services, QML engine and startup.
+
+Imported by main.py, which calls main() after freeze_support(). Keeping the
+application out of main.py means process pool workers, which are spawned with
+main.py imported as __mp_main__, never load Qt or the services.
+"""
+# Standard library imports
+import time
+_IMPORTS_STARTED = time.perf_counter()
+_IMPORTS_CPU_STARTED = time.process_time()
+
+import sys
+import traceback
+import os
+from pathlib import Path
+
+from services.startup_profiler import StartupProfiler, trace_path_from_argv
+
+# Start profiling before the application imports so their cost is recorded
+_profile_trace = trace_path_from_argv(sys.argv)
+if _profile_trace:
+    StartupProfiler.get_instance().start(_profile_trace, origin=_IMPORTS_STARTED)
+
+# Qt imports
+from PySide6.QtCore import QObject
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QIcon
+from PySide6.QtQuickControls2 import QQuickStyle
+from PySide6.QtQml import qmlRegisterType, QQmlApplicationEngine
+
+# Application imports
+# Core services
+from services.qml_types import register_qml_types, log_startup_import_report
+from services.loading_manager import LoadingManager
+from services.task_scheduler import TaskScheduler
+from services.process_pool import ProcessKernelPool
+
+# Utilities
+from services.config import app_config
+from services.qml_debug import register_debug_helper
+# Use the new logger directly
+from services.logger import QLogManager
+from services.platform_helper import PlatformHelper
+from services.cache_manager import CacheManager
+from services.cache_utils import setup_qml_cache
+from services.windows_utils import setup_windows_specifics, set_gpu_attributes
+from services.preload_manager import PreloadManager
+from services.lightweight_performance import LightweightPerformanceMonitor
+from services.logger_config import configure_logger
+from services.about_program import ConfigBridge
+
+from services.file_saver import FileSaver
+from services.database_manager import DatabaseManager
+from services.calculation_cache import CalculationCache
+from services.calculation_disk_cache import default_disk_cache_path
+
+from services.resource_loader import load_resources
+
+# Resources: memory-mapped data/resources.rcc, or the generated module as fallback
+load_resources()
+
+# Constants
+CURRENT_DIR = Path(__file__).parent
+MODULE_IMPORT_TIME = time.perf_counter() - _IMPORTS_STARTED
+profiler = StartupProfiler.get_instance()
+profiler.record_phase("imports", _IMPORTS_STARTED, _IMPORTS_STARTED + MODULE_IMPORT_TIME,
+                      time.process_time() - _IMPORTS_CPU_STARTED)
+
+# Set up application-wide logger
+logger = configure_logger("qmltest", component="main")
+
+class Application:
+    """Main application class implementing component management.
+    
+    This class serves as the primary application controller, managing:
+    - QML registration
+    - Application lifecycle
+    """
+    
+    def __init__(self):
+        """Initialize application with configuration."""
+        self.config = app_config
+        
+        with profiler.phase("create_application"):
+            self.app = QApplication(sys.argv)
+
+        # Use the configured logger instead of creating a new one
+        self.logger = logger
+        
+        with profiler.phase("create_engine"):
+            # Setup QML engine directly
+            self.qml_engine = QQmlApplicationEngine()
+
+            self.debug_helper = register_debug_helper(self.qml_engine)
+
+            self.qml_engine.addImportPath(str(CURRENT_DIR.parent))
+            self.qml_engine.addImportPath(str(CURRENT_DIR))
+            self.qml_engine.addImportPath(str(CURRENT_DIR / "qml" / "components"))
+            self.qml_engine.clearComponentCache()
+
+            # Setup core services
+            self.loading_manager = LoadingManager()
+            self.qml_engine.rootContext().setContextProperty("loadingManager", self.loading_manager)
+            self.task_scheduler = TaskScheduler.get_instance()
+
+        # Initialize application
+        self.setup()
+
+    def setup_app(self):
+        """Configure application using loaded config."""
+        QQuickStyle.setStyle(self.config.style)
+        QApplication.setApplicationName(self.config.app_name)
+        QApplication.setOrganizationName(self.config.org_name)
+        QApplication.setWindowIcon(QIcon(self.config.icon_path))
+        QIcon.setThemeName("gallery")
+
+    def register_qml_types(self):
+        """Register QML types using external registration function."""
+        # Calculator modules are imported when a page first uses them
+        self.qml_type_registry = register_qml_types(self.qml_engine, str(CURRENT_DIR))
+
+        # Register the FileSaver class
+        qmlRegisterType(FileSaver, "FileSaverUtils", 1, 0, "FileSaver")
+
+    def init_database(self):
+        """Initialize application database."""
+        try:
+            # Get database path from config or use default
+            db_path = os.path.join(CURRENT_DIR, 'data', 'application_data.db')
+            
+            # Initialize database through manager
+            self.logger.info(f"Initializing database at {db_path}")
+            # This will create and initialize the database if it doesn't exist
+            DatabaseManager.get_instance(db_path)
+            self.logger.info("Database initialization complete")
+        except Exception as e:
+            self.logger.error(f"Database initialization error: {e}")
+            # We continue even if there's a database error, to allow the app to run
+
+    def load_qml(self):
+        """Load main QML file and register context properties."""
+        # Create and expose log manager to QML
+        self.log_manager = QLogManager()
+        self.qml_engine.rootContext().setContextProperty("logManager", self.log_manager)
+
+        # Use ConfigBridge to expose app config to QML instead of direct exposure
+        self.config_bridge = ConfigBridge()
+        self.qml_engine.rootContext().setContextProperty("appConfig", self.config_bridge)
+        
+        # PlatformHelper keeps a context property for backward compatibility
+        self.qml_engine.rootContext().setContextProperty("PlatformHelper", PlatformHelper())
+
+        # Load main QML file
+        main_qml = CURRENT_DIR / "qml" / "main.qml"
+        self.qml_engine.load(str(main_qml))
+
+        # Keep the window's wrapper alive; wrappers of its children die with it
+        roots = self.qml_engine.rootObjects()
+        self.main_window = roots[0] if roots else None
+
+    def setup(self):
+        """Configure application components and initialize subsystems."""
+        with profiler.phase("setup_app"):
+            self.setup_app()
+
+        # Initialize database
+        with profiler.phase("init_database"):
+            self.init_database()
+
+        # Persist calculation results between sessions unless caching is disabled
+        if not self.config.args.no_cache:
+            with profiler.phase("calculation_disk_cache"):
+                CalculationCache.get_instance().enable_disk_tier(
+                    default_disk_cache_path(self.config.app_name)
+                )
+
+        with profiler.phase("register_qml_types"):
+            self.register_qml_types()
+
+        # Core properties needed for the app
+        self.preload_manager = PreloadManager()
+        self.qml_engine.rootContext().setContextProperty("preloadManager", self.preload_manager)
+        
+        self.performance_monitor = LightweightPerformanceMonitor()
+        self.qml_engine.rootContext().setContextProperty("perfMonitor", self.performance_monitor)
+        
+        # Application metadata
+        self.qml_engine.rootContext().setContextProperty("appVersion", self.config.version)
+        self.qml_engine.rootContext().setContextProperty("applicationTitle", self.config.app_name)
+
+        with profiler.phase("load_qml"):
+            self.load_qml()
+        log_startup_import_report(MODULE_IMPORT_TIME)
+
+        if profiler.enabled:
+            self._setup_profiling_marks()
+        
+        # Start preloading QML components after the main UI is loaded
+        with profiler.phase("start_preloading"):
+            self._setup_preloading()
+
+        # Start numeric worker processes now so the first large transform doesn't pay for it
+        with profiler.phase("process_pool_warm_up"):
+            ProcessKernelPool.get_instance().warm_up()
+
+    def _setup_profiling_marks(self):
+        """Mark the first frame and finish the startup profile once preloading is done."""
+        preload_started = time.perf_counter()
+        preload_cpu_started = time.process_time()
+
+        window = self.main_window
+        if window is not None and hasattr(window, "frameSwapped"):
+
+            def on_first_frame():
+                window.frameSwapped.disconnect(on_first_frame)
+                profiler.mark("first_frame")
+            window.frameSwapped.connect(on_first_frame)
+
+        def on_preloading_finished():
+            profiler.record_phase("preloading", preload_started, time.perf_counter(),
+                                  time.process_time() - preload_cpu_started)
+            profiler.finish()
+        self.preload_manager.loadingFinished.connect(on_preloading_finished)
+    
+    def _setup_preloading(self):
+        """Set up preloading of QML components."""
+        # Get QML directories from config
+        qml_directories = app_config.get_qml_directories()
+        
+        # Add each directory to preload manager
+        for _, dir_path in qml_directories.items():
+            self.preload_manager.add_directory(str(dir_path))
+
+        # Order preloading by the visible page and record which pages are used
+        stack_view = self.main_window.findChild(QObject, "calculatorLoader") if self.main_window else None
+        if stack_view is not None:
+            self.preload_manager.track_navigation(stack_view)
+        
+        # Start preloading
+        self.preload_manager.start_preloading(self.qml_engine)
+    
+    def run(self):
+        """Run the application."""
+        try:
+            sys.exit(self.app.exec())
+        finally:
+            # Clean up resources when application exits
+            if hasattr(self, 'log_manager') and hasattr(self.log_manager, '_async_handler'):
+                # Stop the async log handler to allow thread to exit
+                self.log_manager._async_handler.stop()
+            
+            # Startup may end before preloading completes
+            profiler.finish()
+
+            self.task_scheduler.shutdown()
+            ProcessKernelPool.get_instance().shutdown()
+            CalculationCache.get_instance().disable_disk_tier()
+
+def main():
+    """Application entry point."""
+    try:
+        # Enable debug logging if requested via command line
+        if "--debug-logging" in sys.argv:
+            os.environ["QMLTEST_DEBUG_LOGGING"] = "1"
+            print("DEBUG LOGGING ENABLED")
+        
+        # Log application startup
+        logger.info("Application starting...")
+        
+        # Setup environment from config
+        with profiler.phase("setup_environment"):
+            app_config.setup_environment()
+        
+            # Setup Windows-specific configuration
+            setup_windows_specifics()
+        
+        with profiler.phase("qml_cache"):
+            # Handle cache setup
+            if app_config.args.clear_cache:
+                cache_manager = CacheManager()
+                print("Clearing QML cache...")
+                cache_manager.clear_cache()
+        
+            # Set up QML cache unless disabled
+            if not app_config.args.no_cache:
+                cache_manager = CacheManager()
+                app_name = app_config.app_name
+                cache_manager.initialize(app_name)
+                setup_qml_cache(str(CURRENT_DIR), app_name)
+        
+        # Set GPU-specific attributes
+        with profiler.phase("gpu_attributes"):
+            set_gpu_attributes()
+        
+        # Create and run application as a single step
+        Application().run()
+        
+    except Exception as e:
+        logger.critical(f"ERROR during startup: {str(e)}")
+        logger.critical(traceback.format_exc())
+        sys.exit(1)
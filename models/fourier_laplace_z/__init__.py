@@ -1,3 +1,10 @@
-from .transform_calculator import TransformCalculator
-
+# TransformCalculator is imported on first access so that process pool
+# workers can import the NumPy kernels without loading Qt and matplotlib
 __all__ = ['TransformCalculator']
+
+
+def __getattr__(name):
+    if name == 'TransformCalculator':
+        from .transform_calculator import TransformCalculator
+        return TransformCalculator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
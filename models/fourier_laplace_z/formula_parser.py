@@ -1,122 +1,174 @@
+import ast
 import re
+from functools import lru_cache
+
 import numpy as np
 
+# Time samples evaluated per chunk, bounding temporaries for long time vectors
+FORMULA_CHUNK_SIZE = 65536
+
+# Functions a formula may call, mapped to their NumPy ufuncs
+FORMULA_FUNCTIONS = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "exp": np.exp,
+    "sqrt": np.sqrt,
+    "abs": np.abs,
+    # Additional functions for more complex expressions
+    "sinh": np.sinh,
+    "cosh": np.cosh,
+    "tanh": np.tanh,
+    "log": np.log,
+    "log10": np.log10
+}
+
+# Variables a formula may reference; t, w and f are bound at evaluation time
+FORMULA_VARIABLES = ("t", "w", "f", "pi")
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.USub, ast.UAdd
+)
+
+# Harmonic patterns like A*sin(n*f*t), A*sin(n*2π*f*t), A*sin(f*t) and A*sin(2π*f*t)
+_HARMONIC_PATTERN = re.compile(r'([+-]?\s*\d*\.?\d*)\s*\*?\s*sin\(\s*(\d+)\s*\*?\s*(\d*\.?\d*)\s*\*?\s*t\s*\)')
+_HARMONIC_2PI_PATTERN = re.compile(r'([+-]?\s*\d*\.?\d*)\s*\*?\s*sin\(\s*(\d+)\s*\*?\s*2\s*\*?\s*[πp]i?\s*\*?\s*(\d*\.?\d*)\s*\*?\s*t\s*\)')
+_SIMPLE_PATTERN = re.compile(r'([+-]?\s*\d*\.?\d*)\s*\*?\s*sin\(\s*(\d*\.?\d*)\s*\*?\s*t\s*\)')
+_SIMPLE_2PI_PATTERN = re.compile(r'([+-]?\s*\d*\.?\d*)\s*\*?\s*sin\(\s*2\s*\*?\s*[πp]i?\s*\*?\s*(\d*\.?\d*)\s*\*?\s*t\s*\)')
+
+
+def _parse_amplitude(amplitude_str):
+    """Default to 1.0 if amplitude is just a sign or empty"""
+    amplitude_str = amplitude_str.strip()
+    if amplitude_str and amplitude_str not in ['+', '-']:
+        return float(amplitude_str)
+    return 1.0 if amplitude_str != '-' else -1.0
+
+
+def _find_harmonics(formula):
+    """Extract (amplitude, harmonic, frequency or None) terms from harmonic patterns
+
+    A frequency of None means the base frequency supplied at evaluation time.
+    """
+    terms = []
+
+    harmonics = _HARMONIC_PATTERN.findall(formula)
+    if not harmonics:
+        # Try alternative pattern with 2π notation
+        harmonics = _HARMONIC_2PI_PATTERN.findall(formula)
+
+    simple_harmonics = []
+    if not harmonics:
+        # Try looking for sin(w*t) pattern without harmonics
+        simple_harmonics = _SIMPLE_PATTERN.findall(formula)
+        for amplitude_str, freq_str in simple_harmonics:
+            terms.append((_parse_amplitude(amplitude_str), 1,
+                          float(freq_str) if freq_str.strip() else None))
+
+    # Handle 2π notation pattern
+    for amplitude_str, freq_str in _SIMPLE_2PI_PATTERN.findall(formula):
+        terms.append((_parse_amplitude(amplitude_str), 1,
+                      float(freq_str) if freq_str.strip() else None))
+
+    # Process the harmonic components
+    for amplitude_str, harmonic_str, freq_str in harmonics:
+        # Get harmonic number, default to 1 if not specified
+        harmonic = int(harmonic_str) if harmonic_str.strip() else 1
+        terms.append((_parse_amplitude(amplitude_str), harmonic,
+                      float(freq_str) if freq_str.strip() else None))
+
+    return terms
+
+
+def _validate_expression(tree):
+    """Reject anything other than arithmetic on known names and function calls"""
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Unsupported element in formula: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported constant in formula: {node.value!r}")
+        if isinstance(node, ast.Name) and node.id not in FORMULA_VARIABLES and node.id not in FORMULA_FUNCTIONS:
+            raise ValueError(f"Unknown name in formula: {node.id}")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FORMULA_FUNCTIONS:
+                raise ValueError("Only sin, cos, tan, exp, sqrt, abs, sinh, cosh, tanh, log and log10 can be called")
+            if node.keywords:
+                raise ValueError(f"Keyword arguments are not supported in {node.func.id}()")
+
+
+@lru_cache(maxsize=128)
+def compile_formula(formula):
+    """Compile a custom formula into a vectorized function of (t, base_frequency)
+
+    Formulas are parsed and validated once and cached by their text, so
+    re-evaluating the same formula skips the regex matching and compilation.
+
+    Raises:
+        ValueError/SyntaxError: If the formula is empty, malformed or unsafe
+    """
+    if not formula:
+        raise ValueError("Empty formula")
+
+    terms = _find_harmonics(formula)
+    if terms:
+        def evaluate(t, base_frequency):
+            result = np.zeros_like(t)
+            for amplitude, harmonic, freq in terms:
+                freq = base_frequency if freq is None else freq
+                result += amplitude * np.sin(harmonic * 2 * np.pi * freq * t)
+            return result
+        return evaluate
+
+    # Process the formula by replacing common shorthand
+    formula_code = formula.replace("^", "**").replace("π", "pi")
+    tree = ast.parse(formula_code.strip(), mode="eval")
+    _validate_expression(tree)
+    code = compile(tree, "<formula>", "eval")
+
+    def evaluate(t, base_frequency):
+        namespace = dict(FORMULA_FUNCTIONS, t=t, pi=np.pi, f=base_frequency,
+                         w=2 * np.pi * base_frequency)
+        # Constant formulas still produce one value per sample
+        return np.broadcast_to(eval(code, {"__builtins__": {}}, namespace), t.shape)
+    return evaluate
+
+
 def evaluate_custom_formula(t, formula, base_frequency):
     """Parse and evaluate a custom waveform formula with harmonics
-    
+
     Args:
         t: numpy array of time values
         formula: string containing the custom formula
         base_frequency: the base frequency to use for the waveform
-        
+
     Returns:
         tuple: (result_array, formula_display)
     """
     if not formula:
         return np.zeros_like(t), "Empty formula"
-    
+
     # Create a nice display version of the formula
     formula_display = formula
-    
-    # Initialize result array
-    result = np.zeros_like(t)
-    
-    # Handle basic formulas with harmonics
+
     try:
-        # Look for harmonic patterns like: A*sin(n*w*t)
-        # Pattern matching for harmonic components
-        harmonic_pattern = r'([+-]?\s*\d*\.?\d*)\s*\*?\s*sin\(\s*(\d+)\s*\*?\s*(\d*\.?\d*)\s*\*?\s*t\s*\)'
-        
-        # Find all harmonic components
-        harmonics = re.findall(harmonic_pattern, formula)
-        
-        if not harmonics:
-            # Try alternative pattern with 2π notation
-            harmonic_pattern = r'([+-]?\s*\d*\.?\d*)\s*\*?\s*sin\(\s*(\d+)\s*\*?\s*2\s*\*?\s*[πp]i?\s*\*?\s*(\d*\.?\d*)\s*\*?\s*t\s*\)'
-            harmonics = re.findall(harmonic_pattern, formula)
-        
-        if not harmonics:
-            # Try looking for sin(w*t) pattern without harmonics
-            simple_pattern = r'([+-]?\s*\d*\.?\d*)\s*\*?\s*sin\(\s*(\d*\.?\d*)\s*\*?\s*t\s*\)'
-            simple_harmonics = re.findall(simple_pattern, formula)
-            
-            if simple_harmonics:
-                for amplitude_str, freq_str in simple_harmonics:
-                    # Default to 1.0 if amplitude is just a sign or empty
-                    amplitude = float(amplitude_str) if amplitude_str.strip() and amplitude_str.strip() not in ['+', '-'] else (1.0 if amplitude_str.strip() != '-' else -1.0)
-                    
-                    # Default to base frequency if not specified
-                    freq = float(freq_str) if freq_str.strip() else base_frequency
-                    
-                    # Add component
-                    result += amplitude * np.sin(2 * np.pi * freq * t)
-        
-        # Handle 2π notation pattern 
-        simple_2pi_pattern = r'([+-]?\s*\d*\.?\d*)\s*\*?\s*sin\(\s*2\s*\*?\s*[πp]i?\s*\*?\s*(\d*\.?\d*)\s*\*?\s*t\s*\)'
-        simple_2pi_harmonics = re.findall(simple_2pi_pattern, formula)
-        
-        if simple_2pi_harmonics:
-            for amplitude_str, freq_str in simple_2pi_harmonics:
-                # Default to 1.0 if amplitude is just a sign or empty
-                amplitude = float(amplitude_str) if amplitude_str.strip() and amplitude_str.strip() not in ['+', '-'] else (1.0 if amplitude_str.strip() != '-' else -1.0)
-                
-                # Default to base frequency if not specified
-                freq = float(freq_str) if freq_str.strip() else base_frequency
-                
-                # Add component
-                result += amplitude * np.sin(2 * np.pi * freq * t)
-        
-        # Process the harmonic components
-        if harmonics:
-            for amplitude_str, harmonic_str, freq_str in harmonics:
-                # Default to 1.0 if amplitude is just a sign or empty
-                amplitude = float(amplitude_str) if amplitude_str.strip() and amplitude_str.strip() not in ['+', '-'] else (1.0 if amplitude_str.strip() != '-' else -1.0)
-                
-                # Get harmonic number, default to 1 if not specified
-                harmonic = int(harmonic_str) if harmonic_str.strip() else 1
-                
-                # Default to base frequency if not specified
-                freq = float(freq_str) if freq_str.strip() else base_frequency
-                
-                # Add harmonic component
-                result += amplitude * np.sin(harmonic * 2 * np.pi * freq * t)
-        
-        # If no recognized patterns were found, try a safe eval approach with limited functions
-        if not harmonics and not simple_harmonics and not simple_2pi_harmonics:
-            # Create a safe dictionary with only math functions and NumPy ufuncs
-            safe_dict = {
-                "sin": np.sin,
-                "cos": np.cos,
-                "tan": np.tan,
-                "exp": np.exp,
-                "sqrt": np.sqrt,
-                "pi": np.pi,
-                "abs": np.abs,
-                "t": t,
-                "w": 2 * np.pi * base_frequency,
-                "f": base_frequency,
-                # Add additional functions for more complex expressions
-                "sinh": np.sinh,
-                "cosh": np.cosh,
-                "tanh": np.tanh,
-                "log": np.log,
-                "log10": np.log10
-            }
-            
-            # Process the formula by replacing common shorthand
-            formula_code = formula
-            formula_code = formula_code.replace("^", "**")  # Replace ^ with ** for exponentiation
-            formula_code = formula_code.replace("π", "pi")  # Replace π with pi
-            
-            # Evaluate the formula
-            result = eval(formula_code, {"__builtins__": {}}, safe_dict)
-        
+        evaluate = compile_formula(formula)
+
+        t = np.asarray(t, dtype=float)
+        if len(t) <= FORMULA_CHUNK_SIZE:
+            result = np.array(evaluate(t, base_frequency), dtype=float)
+        else:
+            result = np.empty_like(t)
+            for start in range(0, len(t), FORMULA_CHUNK_SIZE):
+                chunk = t[start:start + FORMULA_CHUNK_SIZE]
+                result[start:start + len(chunk)] = evaluate(chunk, base_frequency)
+
         # If still no result, raise an error
         if np.all(result == 0):
             raise ValueError("No valid terms found in formula")
-        
+
         return result, formula_display
-    
+
     except Exception as e:
         print(f"Error evaluating custom formula: {str(e)}")
         # Return zeros and error message
@@ -0,0 +1,80 @@
+"""Numeric kernels for the transform workers.
+
+The sharded kernels fill ``out[start:stop]`` from shared input arrays and
+are also called inline (start=0, stop=len(out)) for small inputs, so results
+are identical whichever path runs.
+"""
+import numpy as np
+from scipy import signal
+
+from .formula_parser import evaluate_custom_formula
+from .transform_utils import PYWT_AVAILABLE
+
+if PYWT_AVAILABLE:
+    import pywt
+
+# Elements per temporary exp(-s*t) block in the numerical Laplace kernel
+LAPLACE_BLOCK_ELEMENTS = 1 << 20
+
+
+def cwt_rows(inputs, out, start, stop, wavelet="morl"):
+    """Continuous wavelet transform for scales[start:stop]."""
+    coefficients, _ = pywt.cwt(inputs["y"], inputs["widths"][start:stop], wavelet)
+    out[start:stop] = coefficients
+
+
+def laplace_numeric(inputs, out, start, stop):
+    """Trapezoidal Laplace integral F(s) = ∫ y(t)·e^(-st) dt for s[start:stop].
+
+    Evaluated as a block matrix-vector product so the exponential matrix never
+    exceeds LAPLACE_BLOCK_ELEMENTS entries.
+    """
+    t = inputs["t"]
+    y = inputs["y"]
+    s = inputs["s"]
+
+    # Trapezoid weights fold the integration rule into the product
+    weights = np.zeros_like(t)
+    if len(t) > 1:
+        dt = np.diff(t)
+        weights[:-1] += dt / 2
+        weights[1:] += dt / 2
+    weighted = y * weights
+
+    block = max(1, LAPLACE_BLOCK_ELEMENTS // max(1, len(t)))
+    for begin in range(start, stop, block):
+        end = min(stop, begin + block)
+        out[begin:end] = np.exp(-np.outer(s[begin:end], t)) @ weighted
+
+
+def custom_formula(inputs, out, start, stop, formula="", base_frequency=50.0):
+    """Evaluate a custom waveform formula for t[start:stop]."""
+    values, _ = evaluate_custom_formula(inputs["t"][start:stop], formula, base_frequency)
+    out[start:stop] = values
+
+
+def dtft(y, points=1024, w_start=0.0, w_stop=np.pi):
+    """Evaluate the DTFT of a finite sequence on ``points`` frequencies in [w_start, w_stop].
+
+    The full half band [0, π] is taken from a zero-padded real FFT whose bins
+    land exactly on the grid; any other band uses the chirp-Z transform, so
+    resolution is independent of the sequence length either way.
+
+    Returns:
+        tuple: (omega, spectrum) in radians/sample
+    """
+    y = np.asarray(y, dtype=float)
+    points = max(2, int(points))
+    omega = np.linspace(w_start, w_stop, points)
+
+    if w_start == 0.0 and w_stop == np.pi:
+        # Bins of an FFT of length 2(points-1)·m fall on omega every m bins;
+        # m is chosen so the sequence is never truncated
+        base = 2 * (points - 1)
+        stride = max(1, -(-len(y) // base))
+        spectrum = np.fft.rfft(y, n=base * stride)[::stride][:points]
+    else:
+        step = (w_stop - w_start) / (points - 1)
+        spectrum = signal.czt(y, m=points, w=np.exp(-1j * step), a=np.exp(1j * w_start))
+
+    return omega, spectrum
@@ -1,11 +1,16 @@
 import io
+import numpy as np
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-from PySide6.QtCore import QObject, Signal, Slot, Property, QThreadPool
+from PySide6.QtCore import QObject, Signal, Slot, Property
+from PySide6.QtCharts import QXYSeries
 from datetime import datetime
 from .transform_worker import TransformCalculatorWorker
+from .transform_utils import to_point_list, to_qml_list
 from services.file_saver import FileSaver
+from utils.series_helper import fill_spectrum_series, fill_time_series
+from services.task_scheduler import TaskScheduler, PRIORITY_HIGH
 from services.logger_config import configure_logger
 
 logger = configure_logger("qmltest", component="transform_calculator")
@@ -40,11 +45,13 @@ class TransformCalculator(QObject):
         self._calculating = False         # Flag for calculations in progress
         self._custom_formula = "sin(2*pi*f*t)"  # Default custom formula
         
-        # Result storage
-        self._time_domain = []            # Time domain signal
-        self._transform_result = []       # Transform result
-        self._phase_result = []           # Phase information
-        self._frequencies = []            # Frequency domain range
+        # Result storage - float64 arrays, converted for QML on first read
+        self._time_values = np.empty(0)   # Time axis of the signal
+        self._signal_values = np.empty(0) # Time domain signal
+        self._transform_result = np.empty(0)  # Transform result
+        self._phase_result = np.empty(0)  # Phase information
+        self._frequencies = np.empty(0)   # Frequency domain range
+        self._qml_cache = {}              # Converted results for the current result set
         self._equation_original = ""      # Text representation of input equation
         self._equation_transform = ""     # Text representation of transformed equation
         self._resonant_frequency = -1     # Resonant frequency for Laplace transforms
@@ -61,8 +68,8 @@ class TransformCalculator(QObject):
             "Flattop", "Kaiser", "Gaussian", "Tukey"
         ]
         
-        # Thread pool for calculations
-        self._thread_pool = QThreadPool.globalInstance()
+        # Shared scheduler for calculations
+        self._scheduler = TaskScheduler.get_instance()
         
         # Initialize FileSaver
         self._file_saver = FileSaver()
@@ -170,21 +177,28 @@ class TransformCalculator(QObject):
     def windowTypes(self):
         return self._window_types
     
+    def _qml_value(self, name, build):
+        """Convert a result for QML once per result set"""
+        value = self._qml_cache.get(name)
+        if value is None:
+            value = self._qml_cache[name] = build()
+        return value
+    
     @Property('QVariantList', notify=resultsCalculated)
     def timeDomain(self):
-        return self._time_domain
+        return self._qml_value("timeDomain", lambda: to_point_list(self._time_values, self._signal_values))
     
     @Property(list, notify=resultsCalculated)
     def transformResult(self):
-        return self._transform_result
+        return self._qml_value("transformResult", lambda: to_qml_list(self._transform_result))
     
     @Property(list, notify=resultsCalculated)
     def phaseResult(self):
-        return self._phase_result
+        return self._qml_value("phaseResult", lambda: to_qml_list(self._phase_result))
     
     @Property(list, notify=resultsCalculated)
     def frequencies(self):
-        return self._frequencies
+        return self._qml_value("frequencies", lambda: to_qml_list(self._frequencies))
     
     @Property(str, notify=resultsCalculated)
     def equationOriginal(self):
@@ -218,36 +232,57 @@ class TransformCalculator(QObject):
             # Create worker
             worker = TransformCalculatorWorker(self)
             
-            # Start the worker in a separate thread
-            self._thread_pool.start(worker)
+            # Latest request wins - superseded runs are cancelled
+            self._scheduler.submit(worker.run, name="transform_calculator",
+                                   priority=PRIORITY_HIGH, key=("transform_calculator", id(self)))
             
         except Exception:
             # Silently handle the error without logging
             self.calculating = False
     
-    @Slot("QVariantList", "QVariantList", "QVariantList", "QVariantList")
-    def updateResults(self, time_domain, frequencies, magnitude, phase):
-        """Update results from worker thread (called via invokeMethod)"""
+    @Slot("QVariant", "QVariant", "QVariant", "QVariant", "QVariant")
+    def updateResults(self, time_values, signal_values, frequencies, magnitude, phase):
+        """Update results from worker thread (called via invokeMethod with NumPy arrays)"""
+        self._qml_cache = {}
         try:
             # Update the result properties
-            self._time_domain = time_domain if time_domain else []
-            self._frequencies = frequencies if frequencies else []
-            self._transform_result = magnitude if magnitude else []
-            self._phase_result = phase if phase else []
+            self._time_values = np.asarray(time_values, dtype=float)
+            self._signal_values = np.asarray(signal_values, dtype=float)
+            self._frequencies = np.asarray(frequencies, dtype=float)
+            self._transform_result = np.asarray(magnitude, dtype=float)
+            self._phase_result = np.asarray(phase, dtype=float)
             
         except Exception as e:
             # Log the error
             print(f"Error updating results: {str(e)}")
-            # Ensure properties are at least empty lists, not None
-            self._time_domain = []
-            self._frequencies = []
-            self._transform_result = []
-            self._phase_result = []
+            # Ensure properties are at least empty arrays, not None
+            self._time_values = np.empty(0)
+            self._signal_values = np.empty(0)
+            self._frequencies = np.empty(0)
+            self._transform_result = np.empty(0)
+            self._phase_result = np.empty(0)
         finally:
             # Always set calculating to false regardless of success or failure
             self.calculating = False
             self.resultsCalculated.emit()
     
+    @Slot(QXYSeries, int, result='QVariantMap')
+    def fillTimeDomainSeries(self, series, stride=1):
+        """Fill a chart series straight from the time domain arrays
+        
+        Returns the point count and axis extents, see fill_time_series
+        """
+        return fill_time_series(series, self._time_values, self._signal_values, stride)
+    
+    @Slot(QXYSeries, QXYSeries, int, result='QVariantMap')
+    def fillTransformSeries(self, magnitude_series, phase_series, stride=1):
+        """Fill the magnitude and phase series straight from the result arrays
+        
+        Returns the point count and axis extents, see fill_spectrum_series
+        """
+        return fill_spectrum_series(magnitude_series, phase_series, self._frequencies,
+                                    self._transform_result, self._phase_result, stride)
+    
     # QML slots
     @Slot(str)
     def setTransformType(self, transform_type):
@@ -368,9 +403,9 @@ class TransformCalculator(QObject):
             plt.figure(figsize=(10, 4))
             
             # Time domain chart
-            if self._time_domain:
-                t_vals = [point['x'] for point in self._time_domain]
-                y_vals = [point['y'] for point in self._time_domain]
+            if len(self._time_values):
+                t_vals = self._time_values
+                y_vals = self._signal_values
                 
                 plt.plot(t_vals, y_vals, 'b-', linewidth=2)
                 plt.title(f"Time Domain: {self._function_type} Function")
@@ -379,9 +414,9 @@ class TransformCalculator(QObject):
                 plt.grid(True, linestyle='--', alpha=0.7)
                 
                 # Adjust y-axis limits for better visualization
-                if y_vals:
-                    y_min = min(y_vals)
-                    y_max = max(y_vals)
+                if len(y_vals):
+                    y_min = y_vals.min()
+                    y_max = y_vals.max()
                     y_range = y_max - y_min
                     
                     # Add some padding to y-axis
@@ -413,13 +448,13 @@ class TransformCalculator(QObject):
             plt.figure(figsize=(10, 6))
             
             # Plot magnitude
-            if self._frequencies and self._transform_result:
+            if len(self._frequencies) and len(self._transform_result):
                 plt.plot(self._frequencies, self._transform_result, 'r-', linewidth=2)
                 
                 # Add resonant frequency line for Laplace
                 if self._transform_type == "Laplace" and self._resonant_frequency > 0:
                     # Find y-range
-                    y_max = max(self._transform_result) * 1.1
+                    y_max = self._transform_result.max() * 1.1
                     plt.axvline(x=self._resonant_frequency, color='orange', linestyle='--')
                     plt.annotate(f"Resonant: {self._resonant_frequency:.1f} rad/s", 
                                 xy=(self._resonant_frequency, y_max*0.9),
@@ -1,3 +1,5 @@
+import numpy as np
+
 # Try to import pywt, but provide fallback if not available
 try:
     import pywt
@@ -14,3 +16,12 @@ def get_available_wavelet_types():
         return ['db1', 'db2', 'db4', 'sym2', 'sym4', 'coif1', 'coif3', 'morl']
     else:
         return ['Basic']
+
+def to_point_list(x_values, y_values):
+    """Convert x/y result arrays to the [{"x": .., "y": ..}] list QML charts consume"""
+    return [{"x": x, "y": y} for x, y in zip(np.asarray(x_values, dtype=float).tolist(),
+                                             np.asarray(y_values, dtype=float).tolist())]
+
+def to_qml_list(values):
+    """Convert a result array (any dimension) to plain Python floats for QML"""
+    return np.asarray(values, dtype=float).tolist()
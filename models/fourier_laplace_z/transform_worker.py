@@ -1,16 +1,34 @@
 import numpy as np
-import concurrent.futures
-import multiprocessing
-from PySide6.QtCore import QRunnable, QMetaObject, Qt, Q_ARG
+from PySide6.QtCore import QMetaObject, Qt, Q_ARG
 
 # Import the formula parser
 from .formula_parser import evaluate_custom_formula
+from .kernels import custom_formula, laplace_numeric
 
-class TransformCalculatorWorker(QRunnable):
-    """Worker thread for performing calculations"""
+from services.process_pool import ProcessKernelPool
+
+# Samples evaluated inline to validate a custom formula before sharding it
+FORMULA_PROBE_SAMPLES = 64
+
+# Laplace s-grid points relative to the original 200/300-point grids. The
+# closed forms are single array expressions, and the numerical kernel builds
+# exp(-s*t) in blocks of LAPLACE_BLOCK_ELEMENTS entries (16 MiB as complex128),
+# so memory stays bounded whatever the grid size.
+LAPLACE_GRID_SCALE = 10
+
+def _magnitude_phase(values):
+    """Magnitude and phase (degrees) of complex results, zeroing non-finite points"""
+    magnitude = np.abs(values)
+    phase = np.angle(values, deg=True)
+    invalid = ~np.isfinite(magnitude)
+    magnitude[invalid] = 0
+    phase[invalid] = 0
+    return magnitude, phase
+
+class TransformCalculatorWorker:
+    """Worker for performing calculations, run by the shared TaskScheduler"""
     
     def __init__(self, parent):
-        super().__init__()
         self.parent = parent
         self.transform_type = parent._transform_type
         self.function_type = parent._function_type
@@ -20,44 +38,44 @@ class TransformCalculatorWorker(QRunnable):
         self.sample_points = parent._sample_points
         self.window_type = parent._window_type
         self.custom_formula = parent._custom_formula
-        
-        # Add thread pool for parallelizing calculations
-        self.thread_pool = concurrent.futures.ThreadPoolExecutor(
-            max_workers=min(8, multiprocessing.cpu_count())
-        )
     
-    def run(self):
+    def run(self, token=None):
         try:
             # Generate the time domain signal
-            time_domain = self._generate_time_domain()
+            t, y = self._generate_time_domain()
             
             # Calculate the appropriate transform
             if self.transform_type == "Fourier":
-                freq, magnitude, phase = self._calculate_fourier_transform(time_domain)
+                freq, magnitude, phase = self._calculate_fourier_transform(t, y)
             else:  # Laplace
-                freq, magnitude, phase = self._calculate_laplace_transform(time_domain)
+                freq, magnitude, phase = self._calculate_laplace_transform(t, y)
+            
+            # A newer request superseded this one - let it deliver the results
+            if token is not None and token.cancelled:
+                return
             
-            # Use Qt's thread-safe mechanism to update the main object
+            # Use Qt's thread-safe mechanism to update the main object; the
+            # arrays are passed as-is and only converted when QML reads them
             QMetaObject.invokeMethod(self.parent, "updateResults", 
                                     Qt.ConnectionType.QueuedConnection,
-                                    Q_ARG("QVariantList", time_domain),
-                                    Q_ARG("QVariantList", freq),
-                                    Q_ARG("QVariantList", magnitude),
-                                    Q_ARG("QVariantList", phase))
+                                    Q_ARG("QVariant", t),
+                                    Q_ARG("QVariant", y),
+                                    Q_ARG("QVariant", freq),
+                                    Q_ARG("QVariant", magnitude),
+                                    Q_ARG("QVariant", phase))
             
         except Exception as e:
             # Log the error and ensure we reset the calculator status
             print(f"Error in calculation: {str(e)}")
             # Ensure we always call updateResults to finish the calculation
+            empty = np.empty(0)
             QMetaObject.invokeMethod(self.parent, "updateResults", 
                                     Qt.ConnectionType.QueuedConnection,
-                                    Q_ARG("QVariantList", []),
-                                    Q_ARG("QVariantList", []),
-                                    Q_ARG("QVariantList", []),
-                                    Q_ARG("QVariantList", []))
-        finally:
-            # Make sure to shut down the thread pool
-            self.thread_pool.shutdown(wait=False)
+                                    Q_ARG("QVariant", empty),
+                                    Q_ARG("QVariant", empty),
+                                    Q_ARG("QVariant", empty),
+                                    Q_ARG("QVariant", empty),
+                                    Q_ARG("QVariant", empty))
             
     def _generate_time_domain(self):
         """Generate the time domain signal based on the selected function"""
@@ -76,7 +94,7 @@ class TransformCalculatorWorker(QRunnable):
         # Generate the appropriate function
         if self.function_type == "Custom":
             try:
-                y, formula_display = evaluate_custom_formula(t, self.custom_formula, self.frequency)
+                y, formula_display = self._evaluate_custom_formula(t)
                 self.parent._equation_original = formula_display
             except Exception as e:
                 # Handle formula errors
@@ -112,15 +130,35 @@ class TransformCalculatorWorker(QRunnable):
             y = self.parameter_a * np.exp(-self.parameter_b * t) * np.sin(2 * np.pi * self.frequency * t)
             self.parent._equation_original = f"{self.parameter_a} e^(-{self.parameter_b}t) sin(2π·{self.frequency}t)"
         
-        # Optimize dictionary creation with list comprehension
-        return [{"x": float(x), "y": float(y)} for x, y in zip(t, y)]
+        return t, np.asarray(y, dtype=float)
     
-    def _calculate_fourier_transform(self, time_domain):
-        """Calculate the Fourier transform - optimized with numpy vectorization"""
-        # Extract t and y arrays from time_domain
-        t = np.array([point["x"] for point in time_domain])
-        y = np.array([point["y"] for point in time_domain])
+    def _evaluate_custom_formula(self, t):
+        """Evaluate the custom formula, sharding long time bases across processes"""
+        pool = ProcessKernelPool.get_instance()
+        if not pool.should_offload(len(t) * len(self.custom_formula)):
+            return evaluate_custom_formula(t, self.custom_formula, self.frequency)
+        
+        # Validate on a short probe so parse errors are reported with their message
+        probe, formula_display = evaluate_custom_formula(
+            t[:FORMULA_PROBE_SAMPLES], self.custom_formula, self.frequency)
+        if formula_display.startswith("Error"):
+            return np.zeros_like(t), formula_display
         
+        y = pool.run_sharded(custom_formula, {"t": t}, t.shape, np.float64,
+                             work_units=len(t) * len(self.custom_formula),
+                             formula=self.custom_formula, base_frequency=self.frequency)
+        return y, formula_display
+    
+    def _numeric_laplace(self, t, y, s):
+        """Numerical Laplace integral over all s-values, sharded when large"""
+        s = np.asarray(s)
+        return ProcessKernelPool.get_instance().run_sharded(
+            laplace_numeric, {"t": t, "y": y, "s": s}, s.shape, s.dtype,
+            work_units=len(t) * len(s)
+        )
+    
+    def _calculate_fourier_transform(self, t, y):
+        """Calculate the Fourier transform - optimized with numpy vectorization"""
         n = len(t)
         dt = t[1] - t[0]
         
@@ -145,8 +183,7 @@ class TransformCalculatorWorker(QRunnable):
         # Set the equation in a separate step
         self._set_fourier_equation(window_applied)
         
-        # Efficiently convert to list with proper data types
-        return freq.astype(float).tolist(), magnitude.astype(float).tolist(), phase.astype(float).tolist()
+        return freq, magnitude, phase
     
     def _apply_window(self, n, window_type):
         """Apply the selected window function"""
@@ -227,59 +264,50 @@ class TransformCalculatorWorker(QRunnable):
             if window_applied:
                 self.parent._equation_transform += f"\nWindow functions affect sidelobes and harmonic content"
     
-    def _calculate_laplace_transform(self, time_domain):
+    def _calculate_laplace_transform(self, t, y):
         """Calculate the Laplace transform"""
-        # Extract t and y arrays from time_domain
-        t = np.array([point["x"] for point in time_domain])
-        y = np.array([point["y"] for point in time_domain])
-        
         # Define frequency range based on function type
         if self.function_type == "Sine":
             omega = 2 * np.pi * self.frequency
-            s_values = np.linspace(0, max(300, omega * 3), 200)  # Show up to 3x the resonant frequency
+            s_values = np.linspace(0, max(300, omega * 3), 200 * LAPLACE_GRID_SCALE)  # Show up to 3x the resonant frequency
         elif self.function_type == "Custom":
             # For custom functions, use a wider frequency range like other periodic functions
             omega = 2 * np.pi * self.frequency
-            s_values = np.linspace(0, max(200, omega * 5), 300)  # Show up to 5x the fundamental frequency
+            s_values = np.linspace(0, max(200, omega * 5), 300 * LAPLACE_GRID_SCALE)  # Show up to 5x the fundamental frequency
         elif self.function_type == "Damped Sine":
             omega = 2 * np.pi * self.frequency
-            s_values = np.linspace(0, max(200, omega * 3), 300)  # Higher resolution
+            s_values = np.linspace(0, max(200, omega * 3), 300 * LAPLACE_GRID_SCALE)  # Higher resolution
         elif self.function_type == "Impulse":
-            s_values = np.linspace(0, 200, 300)  # Higher resolution over wider range
+            s_values = np.linspace(0, 200, 300 * LAPLACE_GRID_SCALE)  # Higher resolution over wider range
         elif self.function_type == "Square":
             omega = 2 * np.pi * self.frequency
-            s_values = np.linspace(0, max(200, omega * 5), 300)  # Show up to 5x the fundamental frequency
+            s_values = np.linspace(0, max(200, omega * 5), 300 * LAPLACE_GRID_SCALE)  # Show up to 5x the fundamental frequency
         elif self.function_type == "Sawtooth":
             omega = 2 * np.pi * self.frequency
-            s_values = np.linspace(0, max(200, omega * 5), 300)  # Show up to 5x the fundamental frequency
+            s_values = np.linspace(0, max(200, omega * 5), 300 * LAPLACE_GRID_SCALE)  # Show up to 5x the fundamental frequency
         elif self.function_type == "Exponential":
             cutoff = self.parameter_b
-            s_values = np.linspace(0, max(200, cutoff * 10), 300)
+            s_values = np.linspace(0, max(200, cutoff * 10), 300 * LAPLACE_GRID_SCALE)
         elif self.function_type == "Gaussian":
             center = self.parameter_b
             sigma = self.parameter_b/5 if self.parameter_b > 0 else 0.2
-            s_values = np.linspace(0, 200, 300)  # Similar range to impulse
+            s_values = np.linspace(0, 200, 300 * LAPLACE_GRID_SCALE)  # Similar range to impulse
         elif self.function_type == "Step":
-            s_values = np.linspace(0, 200, 300)  # Higher resolution over wider range
+            s_values = np.linspace(0, 200, 300 * LAPLACE_GRID_SCALE)  # Higher resolution over wider range
         else:
-            s_values = np.linspace(0.1, 5, 50)  # Standard range for other functions
+            s_values = np.linspace(0.1, 5, 50 * LAPLACE_GRID_SCALE)  # Standard range for other functions
         
-        # Initialize arrays for the results
-        magnitude = np.zeros_like(s_values)
-        phase = np.zeros_like(s_values)
+        # Complex frequency points along the imaginary axis, with a small real part for stability
+        s = 0.1 + 1j * s_values
         
-        # Generate the transformed equation and compute values
+        # Generate the transformed equation and compute values over the whole s-grid at once
         if self.function_type == "Sine":
             omega = 2 * np.pi * self.frequency
             self.parent._equation_transform = (f"L{{f(t)}} = {self.parameter_a}·ω/(s²+ω²), "
                                               f"where ω={omega:.1f} rad/s ({self.frequency:.1f} Hz)\n"
                                               f"Resonant peak at s=j·{omega:.1f} rad/s")
             
-            for i, s_imag in enumerate(s_values):
-                s = complex(0.1, s_imag)  # Use small real part for numerical stability
-                complex_result = self.parameter_a * omega / (s**2 + omega**2)
-                magnitude[i] = abs(complex_result)
-                phase[i] = np.angle(complex_result, deg=True)
+            magnitude, phase = _magnitude_phase(self.parameter_a * omega / (s**2 + omega**2))
             
             self.parent._resonant_frequency = omega
         elif self.function_type == "Square":
@@ -291,21 +319,16 @@ class TransformCalculatorWorker(QRunnable):
                                              f"{amplitude}·(1/s)·tanh(s·{period/2:.3f})\n"
                                              f"Showing harmonic structure up to {int(5*omega/(2*np.pi))} Hz")
             
-            for i, s_imag in enumerate(s_values):
-                try:
-                    s = complex(0.1, s_imag)  # Small real part for stability
-                    
-                    if s_imag < 0.001:  # Near zero frequency, use DC value
-                        complex_result = amplitude / s
-                    else:
-                        arg = np.clip(s * (period/2), -20, 20)  # Improved clipping for numerical stability
-                        complex_result = amplitude * (1/s) * np.tanh(arg)
-                    
-                    magnitude[i] = abs(complex_result)
-                    phase[i] = np.angle(complex_result, deg=True)
-                except Exception:
-                    magnitude[i] = 0
-                    phase[i] = 0
+            # Clip the real part of the tanh argument for numerical stability
+            arg = s * (period/2)
+            arg = np.clip(arg.real, -20, 20) + 1j * arg.imag
+            with np.errstate(all='ignore'):
+                complex_result = amplitude * (1/s) * np.tanh(arg)
+            # Near zero frequency, use DC value
+            dc = s_values < 0.001
+            complex_result[dc] = amplitude / s[dc]
+            
+            magnitude, phase = _magnitude_phase(complex_result)
             
             self.parent._resonant_frequency = -1
         elif self.function_type == "Sawtooth":
@@ -317,20 +340,14 @@ class TransformCalculatorWorker(QRunnable):
                                              f"{amplitude}/(s²·{period})·(1 - e^(-s·{period}))\n"
                                              f"Showing harmonic structure up to {int(5*omega/(2*np.pi))} Hz")
             
-            for i, s_imag in enumerate(s_values):
-                try:
-                    s = complex(0.1, s_imag)  # Small real part for stability
-                    
-                    if abs(s) < 0.001:
-                        magnitude[i] = amplitude * period / 2  # DC component
-                        phase[i] = 0
-                    else:
-                        complex_result = (amplitude / period) * (1 / s**2) * (1 - np.exp(-s * period))
-                        magnitude[i] = abs(complex_result)
-                        phase[i] = np.angle(complex_result, deg=True)
-                except Exception:
-                    magnitude[i] = 0
-                    phase[i] = 0
+            with np.errstate(all='ignore'):
+                complex_result = (amplitude / period) * (1 / s**2) * (1 - np.exp(-s * period))
+            magnitude, phase = _magnitude_phase(complex_result)
+            
+            # DC component
+            dc = np.abs(s) < 0.001
+            magnitude[dc] = amplitude * period / 2
+            phase[dc] = 0
             
             self.parent._resonant_frequency = -1
         elif self.function_type == "Damped Sine":
@@ -341,11 +358,7 @@ class TransformCalculatorWorker(QRunnable):
                                              f"where ω={omega:.1f} rad/s\n"
                                              f"Resonant peak at s=j·{omega:.1f} rad/s")
             
-            for i, s_imag in enumerate(s_values):
-                s = complex(0.1, s_imag)  # Use small real part for numerical stability
-                complex_result = self.parameter_a * omega / ((s + damping)**2 + omega**2)
-                magnitude[i] = abs(complex_result)
-                phase[i] = np.angle(complex_result, deg=True)
+            magnitude, phase = _magnitude_phase(self.parameter_a * omega / ((s + damping)**2 + omega**2))
             
             self.parent._resonant_frequency = omega
         elif self.function_type == "Impulse":
@@ -355,17 +368,9 @@ class TransformCalculatorWorker(QRunnable):
             self.parent._equation_transform = (f"L{{f(t)}} = {amplitude}·e^(-{delay}s), " 
                                              f"where delay={delay} s")
             
-            for i, s_imag in enumerate(s_values):
-                s = complex(0.1, s_imag)  # Small real part for stability
-                
-                ideal_result = amplitude * np.exp(-s * delay)
-                
-                rolloff_factor = 1.0 / (1.0 + (s_imag/50.0)**2)
-                
-                complex_result = ideal_result * rolloff_factor
-                
-                magnitude[i] = abs(complex_result)
-                phase[i] = np.angle(complex_result, deg=True)
+            ideal_result = amplitude * np.exp(-s * delay)
+            rolloff_factor = 1.0 / (1.0 + (s_values/50.0)**2)
+            magnitude, phase = _magnitude_phase(ideal_result * rolloff_factor)
             
             self.parent._resonant_frequency = -1
             
@@ -377,16 +382,8 @@ class TransformCalculatorWorker(QRunnable):
             self.parent._equation_transform = (f"L{{f(t)}} = {amplitude}/(s+{decay_rate})\n"
                                              f"For t ≥ 0, this represents a first-order system with time constant τ = {1/decay_rate:.3f} s")
             
-            for i, s_imag in enumerate(s_values):
-                try:
-                    s = complex(0.1, s_imag)
-                    
-                    complex_result = amplitude / (s + decay_rate)
-                    magnitude[i] = abs(complex_result)
-                    phase[i] = np.angle(complex_result, deg=True)
-                except Exception:
-                    magnitude[i] = 0
-                    phase[i] = 0
+            with np.errstate(all='ignore'):
+                magnitude, phase = _magnitude_phase(amplitude / (s + decay_rate))
             
             self.parent._resonant_frequency = -1
         elif self.function_type == "Gaussian":
@@ -400,70 +397,22 @@ class TransformCalculatorWorker(QRunnable):
             self.parent._equation_transform = (f"L{{f(t)}} = {amplitude}·e^(s·{center}-(s·σ)²/2)\n"
                                              f"Gaussian centered at t={center} with σ={sigma:.3f}")
             
-            # Calculate transform with numerical handling and prevent overflow
-            max_magnitude = 0
-            temp_magnitudes = np.zeros_like(s_values)
-            temp_phases = np.zeros_like(s_values)
-            
-            # First pass to calculate and find maximum
-            for i, s_imag in enumerate(s_values):
-                try:
-                    # Use complex s with small real part for stability
-                    s = complex(0.1, s_imag)
-                    
-                    # Prevent numerical overflow by limiting the exponent
-                    # Calculate the exponent first
-                    exponent = s * center - (s * sigma)**2 / 2
-                    
-                    # Limit the exponent to prevent overflow in exp function
-                    if exponent.real > 700:  # np.exp can overflow above ~709
-                        exponent = complex(700, exponent.imag)
-                    
-                    # Calculate exp(exponent) with overflow protection
-                    try:
-                        exp_value = np.exp(exponent)
-                    except:
-                        # Fallback if exp still overflows
-                        exp_value = 0 if exponent.real < 0 else float('inf')
-                    
-                    # Final complex result
-                    complex_result = amplitude * exp_value
-                    
-                    # Add a realistic decay for higher frequencies, with safety check
-                    rolloff_factor = 1.0 / (1.0 + (s_imag/100.0)**2)
-                    
-                    # Only multiply if complex_result is finite
-                    if np.isfinite(complex_result):
-                        complex_result *= rolloff_factor
-                    
-                    # Store magnitude and phase
-                    mag = abs(complex_result)
-                    phase_val = np.angle(complex_result, deg=True)
-                    
-                    # Check if result is valid before storing
-                    if np.isfinite(mag):
-                        temp_magnitudes[i] = mag
-                        temp_phases[i] = phase_val
-                        max_magnitude = max(max_magnitude, mag)
-                    else:
-                        temp_magnitudes[i] = 0
-                        temp_phases[i] = 0
-                        
-                except Exception as e:
-                    # Fallback for numerical issues
-                    temp_magnitudes[i] = 0
-                    temp_phases[i] = 0
-            
-            # Apply scaling/normalization in second pass
+            # Limit the exponent to prevent overflow in exp (np.exp overflows above ~709)
+            exponent = s * center - (s * sigma)**2 / 2
+            exponent = np.minimum(exponent.real, 700) + 1j * exponent.imag
+            
+            # Add a realistic decay for higher frequencies
+            rolloff_factor = 1.0 / (1.0 + (s_values/100.0)**2)
+            with np.errstate(all='ignore'):
+                temp_magnitudes, phase = _magnitude_phase(amplitude * np.exp(exponent) * rolloff_factor)
+            max_magnitude = temp_magnitudes.max() if len(temp_magnitudes) else 0
+            
+            # Normalize to a reasonable range if values are too large
             if max_magnitude > 5:
-                # Normalize to a reasonable range if values are too large
-                scale_factor = 3.0 / max_magnitude
-                magnitude = temp_magnitudes * scale_factor
+                magnitude = temp_magnitudes * (3.0 / max_magnitude)
             else:
                 magnitude = temp_magnitudes
             
-            phase = temp_phases
-            
             # No specific resonance for Gaussian
             self.parent._resonant_frequency = -1
             
@@ -478,25 +427,9 @@ class TransformCalculatorWorker(QRunnable):
             self.parent._equation_transform = (f"L{{u(t-{delay})}} = {amplitude}·e^(-{delay}s)/s\n"
                                              f"Step at t={delay} with height={amplitude}")
             
-            # Calculate transform with better numerical handling
-            for i, s_imag in enumerate(s_values):
-                try:
-                    # Use a more stable approach for s with small real part
-                    s = complex(0.1, s_imag)  # Small real part for stability
-                    
-                    # Calculate the transform
-                    complex_result = amplitude * np.exp(-s * delay) / s
-                    
-                    # Add a realistic roll-off at higher frequencies
-                    rolloff_factor = 1.0 / (1.0 + (s_imag/50.0)**2)
-                    complex_result *= rolloff_factor
-                    
-                    magnitude[i] = abs(complex_result)
-                    phase[i] = np.angle(complex_result, deg=True)
-                except Exception:
-                    # Fallback for numerical issues
-                    magnitude[i] = 0
-                    phase[i] = 0
+            # Add a realistic roll-off at higher frequencies
+            rolloff_factor = 1.0 / (1.0 + (s_values/50.0)**2)
+            magnitude, phase = _magnitude_phase(amplitude * np.exp(-s * delay) / s * rolloff_factor)
             
             # No specific resonance for step
             self.parent._resonant_frequency = -1
@@ -513,30 +446,21 @@ class TransformCalculatorWorker(QRunnable):
                                           f"Using base frequency: {self.frequency:.1f} Hz ({omega:.1f} rad/s)\n"
                                           f"Custom formula: {self.custom_formula}")
             
-            # Calculate transform with numerical integration and add realistic roll-off
-            for i, s_imag in enumerate(s_values):
-                try:
-                    s = complex(0.1, s_imag)  # Add small real part for stability
-                    
-                    # Perform numerical integration
-                    integrand = y * np.exp(-s * t)
-                    result = np.trapz(integrand, t)
-                    
-                    # Add realistic frequency roll-off for higher frequencies
-                    # This makes the plot more physically realistic
-                    rolloff_factor = 1.0 / (1.0 + (s_imag/100.0)**2)
-                    
-                    magnitude[i] = abs(result) * rolloff_factor
-                    phase[i] = np.angle(result, deg=True)
-                except Exception:
-                    magnitude[i] = 0
-                    phase[i] = 0
+            # Calculate transform as one chunked matrix product over the s-grid
+            result = self._numeric_laplace(t, y, s)
+            
+            # Add realistic frequency roll-off for higher frequencies
+            # This makes the plot more physically realistic
+            rolloff_factor = 1.0 / (1.0 + (s_values/100.0)**2)
+            
+            magnitude, phase = _magnitude_phase(result)
+            magnitude = magnitude * rolloff_factor
             
             # No specific resonance for general custom functions
             self.parent._resonant_frequency = -1
             
             # Use numerical integration to try to detect resonance
-            if max(magnitude) > 0:
+            if magnitude.max() > 0:
                 # Find the frequency with the maximum magnitude
                 max_idx = np.argmax(magnitude)
                 peak_freq = s_values[max_idx]
@@ -549,11 +473,9 @@ class TransformCalculatorWorker(QRunnable):
                         self.parent._equation_transform += f"\nDetected peak response at ω ≈ {peak_freq:.1f} rad/s"
         else:
             self.parent._equation_transform = "L{f(t)} = ∫₀^∞ f(t)·e^(-st)dt"
-            for i, s in enumerate(s_values):
-                integrand = y * np.exp(-s * t)
-                magnitude[i] = np.trapz(integrand, t)
-                phase[i] = 0
-                
+            magnitude = self._numeric_laplace(t, y, s_values)
+            phase = np.zeros_like(s_values)
+            
             self.parent._resonant_frequency = -1
         
-        return s_values.tolist(), magnitude.tolist(), phase.tolist()
\ No newline at end of file
+        return s_values, magnitude, phase
\ No newline at end of file
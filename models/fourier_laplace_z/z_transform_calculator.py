@@ -1,6 +1,10 @@
-from PySide6.QtCore import QObject, Signal, Slot, Property, QThreadPool
+import numpy as np
+from PySide6.QtCore import QObject, Signal, Slot, Property
+from PySide6.QtCharts import QXYSeries
 from .z_transform_worker import ZTransformCalculatorWorker
-from .transform_utils import PYWT_AVAILABLE
+from .transform_utils import PYWT_AVAILABLE, to_point_list, to_qml_list
+from services.task_scheduler import TaskScheduler, PRIORITY_HIGH
+from utils.series_helper import fill_spectrum_series, fill_time_series
 
 from services.logger_config import configure_logger
 logger = configure_logger("qmltest", component="z_transform_calculator")
@@ -18,6 +22,8 @@ class ZTransformCalculator(QObject):
     waveletTypeChanged = Signal()
     displayOptionChanged = Signal()
     show3DChanged = Signal()
+    frequencyPointsChanged = Signal()
+    frequencyBandChanged = Signal()
     resultsCalculated = Signal()
     calculatingChanged = Signal()
     exportComplete = Signal(bool, str)
@@ -35,13 +41,18 @@ class ZTransformCalculator(QObject):
         self._wavelet_type = "db1" if PYWT_AVAILABLE else "Basic"  # Changed from "Haar" to "db1"
         self._display_option = "Magnitude"    # Display option: Magnitude, Phase, Poles/Zeros
         self._show_3d = False                 # Whether to show 3D visualization for wavelets
+        self._frequency_points = 1024         # Resolution of the Z-transform frequency response
+        self._frequency_min = 0.0             # Lower edge of the response band (Hz)
+        self._frequency_max = 0.0             # Upper edge of the response band (Hz), 0 = Nyquist
         self._calculating = False             # Flag for calculations in progress
         
-        # Result storage
-        self._time_domain = []                # Time domain signal
-        self._transform_result = []           # Transform result (magnitude)
-        self._phase_result = []               # Phase information
-        self._frequencies = []                # Frequency domain range
+        # Result storage - float64 arrays, converted for QML on first read
+        self._time_values = np.empty(0)       # Time axis of the sequence
+        self._signal_values = np.empty(0)     # Time domain signal
+        self._transform_result = np.empty(0)  # Transform result (magnitude)
+        self._phase_result = np.empty(0)      # Phase information
+        self._frequencies = np.empty(0)       # Frequency domain range
+        self._qml_cache = {}                  # Converted results for the current result set
         self._pole_locations = []             # Poles of the Z-transform
         self._zero_locations = []             # Zeros of the Z-transform
         self._equation_original = ""          # Text representation of input sequence
@@ -53,8 +64,8 @@ class ZTransformCalculator(QObject):
         # Additional properties for wavelets
         self._wavelet_levels = 5              # Number of wavelet decomposition levels
         self._edge_handling = "symmetric"     # How edges are handled in wavelet transform
-        self._wavelet_magnitude_2d = []       # 2D array of wavelet magnitude data
-        self._wavelet_phase_2d = []           # 2D array of wavelet phase data
+        self._wavelet_magnitude_2d = np.empty((0, 0))  # 2D array of wavelet magnitude data
+        self._wavelet_phase_2d = np.empty((0, 0))      # 2D array of wavelet phase data
         
         # Additional properties for Hilbert
         self._min_frequency = 0.0             # Minimum instantaneous frequency
@@ -67,8 +78,8 @@ class ZTransformCalculator(QObject):
             "First-Difference", "Moving Average", "Chirp Sequence", "Random Sequence"
         ]
         
-        # Thread pool for calculations
-        self._thread_pool = QThreadPool.globalInstance()
+        # Shared scheduler for calculations
+        self._scheduler = TaskScheduler.get_instance()
         
         # Initialize calculations
         self._calculate()
@@ -196,6 +207,39 @@ class ZTransformCalculator(QObject):
             self.show3DChanged.emit()
             # No need to recalculate, just change display
     
+    @Property(int, notify=frequencyPointsChanged)
+    def frequencyPoints(self):
+        return self._frequency_points
+    
+    @frequencyPoints.setter
+    def frequencyPoints(self, value):
+        if self._frequency_points != value and 16 <= value <= 65536:
+            self._frequency_points = value
+            self.frequencyPointsChanged.emit()
+            self._calculate()
+    
+    @Property(float, notify=frequencyBandChanged)
+    def frequencyMin(self):
+        return self._frequency_min
+    
+    @frequencyMin.setter
+    def frequencyMin(self, value):
+        if self._frequency_min != value and value >= 0:
+            self._frequency_min = value
+            self.frequencyBandChanged.emit()
+            self._calculate()
+    
+    @Property(float, notify=frequencyBandChanged)
+    def frequencyMax(self):
+        return self._frequency_max
+    
+    @frequencyMax.setter
+    def frequencyMax(self, value):
+        if self._frequency_max != value and value >= 0:
+            self._frequency_max = value
+            self.frequencyBandChanged.emit()
+            self._calculate()
+    
     @Property(bool, notify=calculatingChanged)
     def calculating(self):
         return self._calculating
@@ -210,21 +254,29 @@ class ZTransformCalculator(QObject):
     def functionTypes(self):
         return self._function_types
     
+    def _qml_value(self, name, build):
+        """Convert a result for QML once per result set"""
+        value = self._qml_cache.get(name)
+        if value is None:
+            value = self._qml_cache[name] = build()
+        return value
+    
     @Property('QVariantList', notify=resultsCalculated)
     def timeDomain(self):
-        return self._time_domain
+        return self._qml_value("timeDomain", lambda: to_point_list(self._time_values, self._signal_values))
     
     @Property(list, notify=resultsCalculated)
     def transformResult(self):
-        return self._transform_result
+        # Wavelet results are 2D; the flat view keeps the traditional visualization working
+        return self._qml_value("transformResult", lambda: to_qml_list(self._transform_result.ravel()))
     
     @Property(list, notify=resultsCalculated)
     def phaseResult(self):
-        return self._phase_result
+        return self._qml_value("phaseResult", lambda: to_qml_list(self._phase_result.ravel()))
     
     @Property(list, notify=resultsCalculated)
     def frequencies(self):
-        return self._frequencies
+        return self._qml_value("frequencies", lambda: to_qml_list(self._frequencies))
     
     @Property('QVariantList', notify=resultsCalculated)
     def poleLocations(self):
@@ -268,11 +320,11 @@ class ZTransformCalculator(QObject):
     
     @Property(list, notify=resultsCalculated)
     def waveletMagnitude2D(self):
-        return self._wavelet_magnitude_2d
+        return self._qml_value("waveletMagnitude2D", lambda: to_qml_list(self._wavelet_magnitude_2d))
     
     @Property(list, notify=resultsCalculated)
     def waveletPhase2D(self):
-        return self._wavelet_phase_2d
+        return self._qml_value("waveletPhase2D", lambda: to_qml_list(self._wavelet_phase_2d))
     
     def _calculate(self):
         """Start calculation in a separate thread"""
@@ -283,22 +335,46 @@ class ZTransformCalculator(QObject):
             # Create worker
             worker = ZTransformCalculatorWorker(self)
             
-            # Start the worker in a separate thread
-            self._thread_pool.start(worker)
+            # Latest request wins - superseded runs are cancelled
+            self._scheduler.submit(worker.run, name="z_transform_calculator",
+                                   priority=PRIORITY_HIGH, key=("z_transform_calculator", id(self)))
             
         except Exception as e:
             logger.error(f"Error starting calculation: {str(e)}")
             self.calculating = False
     
-    @Slot("QVariantList", "QVariantList", "QVariantList", "QVariantList", "QVariantList", "QVariantList")
-    def updateZTransformResults(self, time_domain, frequencies, magnitude, phase, poles, zeros):
-        """Update results for Z-transform (called via invokeMethod)"""
+    @Slot(QXYSeries, int, result='QVariantMap')
+    def fillTimeDomainSeries(self, series, stride=1):
+        """Fill a chart series straight from the time domain arrays
+        
+        Returns the point count and axis extents, see fill_time_series
+        """
+        return fill_time_series(series, self._time_values, self._signal_values, stride)
+    
+    @Slot(QXYSeries, QXYSeries, int, result='QVariantMap')
+    def fillTransformSeries(self, magnitude_series, phase_series, stride=1):
+        """Fill the magnitude and phase series straight from the result arrays
+        
+        Returns the point count and axis extents, see fill_spectrum_series
+        """
+        return fill_spectrum_series(magnitude_series, phase_series, self._frequencies,
+                                    self._transform_result, self._phase_result, stride)
+    
+    def _set_signal(self, time_values, signal_values):
+        """Store the time domain arrays and drop conversions of the previous results"""
+        self._qml_cache = {}
+        self._time_values = np.asarray(time_values, dtype=float)
+        self._signal_values = np.asarray(signal_values, dtype=float)
+    
+    @Slot("QVariant", "QVariant", "QVariant", "QVariant", "QVariant", "QVariantList", "QVariantList")
+    def updateZTransformResults(self, time_values, signal_values, frequencies, magnitude, phase, poles, zeros):
+        """Update results for Z-transform (called via invokeMethod with NumPy arrays)"""
         try:
             # Update the result properties
-            self._time_domain = time_domain if time_domain else []
-            self._frequencies = frequencies if frequencies else []
-            self._transform_result = magnitude if magnitude else []
-            self._phase_result = phase if phase else []
+            self._set_signal(time_values, signal_values)
+            self._frequencies = np.asarray(frequencies, dtype=float)
+            self._transform_result = np.asarray(magnitude, dtype=float)
+            self._phase_result = np.asarray(phase, dtype=float)
             self._pole_locations = poles if poles else []
             self._zero_locations = zeros if zeros else []
             
@@ -310,21 +386,19 @@ class ZTransformCalculator(QObject):
             self.calculating = False
             self.resultsCalculated.emit()
     
-    @Slot("QVariantList", "QVariantList", "QVariantList", "QVariantList", "QVariantList")
-    def updateWaveletResults(self, time_domain, scales, coeffs, magnitude, phase):
-        """Update results for Wavelet transform (called via invokeMethod)"""
+    @Slot("QVariant", "QVariant", "QVariant", "QVariant", "QVariant", "QVariant")
+    def updateWaveletResults(self, time_values, signal_values, scales, coeffs, magnitude, phase):
+        """Update results for Wavelet transform (called via invokeMethod with NumPy arrays)"""
         try:
             # Update the result properties
-            self._time_domain = time_domain if time_domain else []
-            self._frequencies = scales if scales else []
-            self._transform_result = magnitude if magnitude else []
-            self._phase_result = phase if phase else []
+            self._set_signal(time_values, signal_values)
+            self._frequencies = np.asarray(scales, dtype=float)
             
-            # Store the 2D arrays for better visualization if they're available
-            # If they weren't set in the worker, use the flattened data
-            if not hasattr(self, '_wavelet_magnitude_2d') or len(self._wavelet_magnitude_2d) == 0:
-                self._wavelet_magnitude_2d = magnitude
-                self._wavelet_phase_2d = phase
+            # Magnitude and phase are 2D (scale x time) for the specialized visualization
+            self._wavelet_magnitude_2d = np.atleast_2d(np.asarray(magnitude, dtype=float))
+            self._wavelet_phase_2d = np.atleast_2d(np.asarray(phase, dtype=float))
+            self._transform_result = self._wavelet_magnitude_2d
+            self._phase_result = self._wavelet_phase_2d
             
         except Exception as e:
             logger.error(f"Error updating Wavelet results: {str(e)}")
@@ -334,15 +408,15 @@ class ZTransformCalculator(QObject):
             self.calculating = False
             self.resultsCalculated.emit()
     
-    @Slot("QVariantList", "QVariantList", "QVariantList", "QVariantList", "QVariantList")
-    def updateHilbertResults(self, time_domain, freq, magnitude, phase, analytic):
-        """Update results for Hilbert transform (called via invokeMethod)"""
+    @Slot("QVariant", "QVariant", "QVariant", "QVariant", "QVariant", "QVariant")
+    def updateHilbertResults(self, time_values, signal_values, freq, magnitude, phase, analytic):
+        """Update results for Hilbert transform (called via invokeMethod with NumPy arrays)"""
         try:
             # Update the result properties
-            self._time_domain = time_domain if time_domain else []
-            self._frequencies = freq if freq else []
-            self._transform_result = magnitude if magnitude else []
-            self._phase_result = phase if phase else []
+            self._set_signal(time_values, signal_values)
+            self._frequencies = np.asarray(freq, dtype=float)
+            self._transform_result = np.asarray(magnitude, dtype=float)
+            self._phase_result = np.asarray(phase, dtype=float)
             
         except Exception as e:
             logger.error(f"Error updating Hilbert results: {str(e)}")
@@ -361,15 +435,15 @@ class ZTransformCalculator(QObject):
     
     def _resetResults(self):
         """Reset all result properties to empty values"""
-        self._time_domain = []
-        self._frequencies = []
-        self._transform_result = []
-        self._phase_result = []
+        self._set_signal(np.empty(0), np.empty(0))
+        self._frequencies = np.empty(0)
+        self._transform_result = np.empty(0)
+        self._phase_result = np.empty(0)
         self._pole_locations = []
         self._zero_locations = []
         self._equation_transform = "Error in calculation"
-        self._wavelet_magnitude_2d = []
-        self._wavelet_phase_2d = []
+        self._wavelet_magnitude_2d = np.empty((0, 0))
+        self._wavelet_phase_2d = np.empty((0, 0))
     
     # QML slots
     @Slot(str)
@@ -455,10 +529,10 @@ class ZTransformCalculator(QObject):
                 'sequence_length': self._sequence_length,
                 'wavelet_type': self._wavelet_type,
                 'display_option': self._display_option,
-                'time_domain': self._time_domain,
-                'frequencies': self._frequencies,
-                'transform_result': self._transform_result,
-                'phase_result': self._phase_result,
+                'time_domain': self.timeDomain,
+                'frequencies': self.frequencies,
+                'transform_result': self.transformResult,
+                'phase_result': self.phaseResult,
                 'pole_locations': self._pole_locations,
                 'zero_locations': self._zero_locations,
                 'equation_original': self._equation_original,
@@ -468,8 +542,8 @@ class ZTransformCalculator(QObject):
                 'edge_handling': self._edge_handling,
                 'min_frequency': self._min_frequency,
                 'max_frequency': self._max_frequency,
-                'wavelet_magnitude_2d': self._wavelet_magnitude_2d,
-                'wavelet_phase_2d': self._wavelet_phase_2d,
+                'wavelet_magnitude_2d': self.waveletMagnitude2D,
+                'wavelet_phase_2d': self.waveletPhase2D,
                 'needs_decay_factor': needs_decay_factor,
                 'needs_frequency': needs_frequency
             }
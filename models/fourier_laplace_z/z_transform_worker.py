@@ -1,10 +1,10 @@
 import numpy as np
-import concurrent.futures
-import multiprocessing
-from PySide6.QtCore import QRunnable, QMetaObject, Qt, Q_ARG
+from PySide6.QtCore import QMetaObject, Qt, Q_ARG
 from scipy import signal
 from .transform_utils import PYWT_AVAILABLE
+from .kernels import cwt_rows, dtft
 
+from services.process_pool import ProcessKernelPool
 from services.logger_config import configure_logger
 
 logger = configure_logger("qmltest", component="z_transform_worker")
@@ -13,11 +13,10 @@ logger = configure_logger("qmltest", component="z_transform_worker")
 if PYWT_AVAILABLE:
     import pywt
 
-class ZTransformCalculatorWorker(QRunnable):
-    """Worker thread for performing calculations"""
+class ZTransformCalculatorWorker:
+    """Worker for performing calculations, run by the shared TaskScheduler"""
     
     def __init__(self, parent):
-        super().__init__()
         self.parent = parent
         self.transform_type = parent._transform_type
         self.function_type = parent._function_type
@@ -29,75 +28,76 @@ class ZTransformCalculatorWorker(QRunnable):
         self.wavelet_type = parent._wavelet_type
         self.display_option = parent._display_option
         self.show_3d = parent._show_3d
-        
-        # Add thread pool for parallelizing calculations
-        self.thread_pool = concurrent.futures.ThreadPoolExecutor(
-            max_workers=min(4, multiprocessing.cpu_count())
-        )
+        self.frequency_points = parent._frequency_points
+        self.frequency_min = parent._frequency_min
+        self.frequency_max = parent._frequency_max
     
-    def run(self):
+    def run(self, token=None):
         try:
             # Generate the time domain signal
-            time_domain = self._generate_time_domain()
+            t, y = self._generate_time_domain()
             
-            # Calculate the appropriate transform
+            # Results stay NumPy arrays; the calculator converts them when QML reads them
             if self.transform_type == "Z-Transform":
-                freq, magnitude, phase, poles, zeros = self._calculate_z_transform(time_domain)
+                freq, magnitude, phase, poles, zeros = self._calculate_z_transform(t, y)
+                if token is not None and token.cancelled:
+                    return
                 
                 # Use Qt's thread-safe mechanism to update the main object with Z-transform specific data
                 QMetaObject.invokeMethod(self.parent, "updateZTransformResults", 
                                         Qt.ConnectionType.QueuedConnection,
-                                        Q_ARG("QVariantList", time_domain),
-                                        Q_ARG("QVariantList", freq),
-                                        Q_ARG("QVariantList", magnitude),
-                                        Q_ARG("QVariantList", phase),
+                                        Q_ARG("QVariant", t),
+                                        Q_ARG("QVariant", y),
+                                        Q_ARG("QVariant", freq),
+                                        Q_ARG("QVariant", magnitude),
+                                        Q_ARG("QVariant", phase),
                                         Q_ARG("QVariantList", poles),
                                         Q_ARG("QVariantList", zeros))
                 
             elif self.transform_type == "Wavelet":
-                coeffs, scales, magnitude, phase = self._calculate_wavelet_transform(time_domain)
+                coeffs, scales, magnitude, phase = self._calculate_wavelet_transform(t, y)
+                if token is not None and token.cancelled:
+                    return
                 
                 # Update with wavelet-specific results
                 QMetaObject.invokeMethod(self.parent, "updateWaveletResults", 
                                         Qt.ConnectionType.QueuedConnection,
-                                        Q_ARG("QVariantList", time_domain),
-                                        Q_ARG("QVariantList", scales),
-                                        Q_ARG("QVariantList", coeffs),
-                                        Q_ARG("QVariantList", magnitude),
-                                        Q_ARG("QVariantList", phase))
+                                        Q_ARG("QVariant", t),
+                                        Q_ARG("QVariant", y),
+                                        Q_ARG("QVariant", scales),
+                                        Q_ARG("QVariant", coeffs),
+                                        Q_ARG("QVariant", magnitude),
+                                        Q_ARG("QVariant", phase))
                 
             else:  # Hilbert transform
                 try:
-                    freq, magnitude, phase, analytic = self._calculate_hilbert_transform(time_domain)
+                    freq, magnitude, phase, analytic = self._calculate_hilbert_transform(t, y)
+                    if token is not None and token.cancelled:
+                        return
                     
                     # Update with Hilbert-specific results
                     QMetaObject.invokeMethod(self.parent, "updateHilbertResults", 
                                             Qt.ConnectionType.QueuedConnection,
-                                            Q_ARG("QVariantList", time_domain),
-                                            Q_ARG("QVariantList", freq),
-                                            Q_ARG("QVariantList", magnitude),
-                                            Q_ARG("QVariantList", phase),
-                                            Q_ARG("QVariantList", analytic))
+                                            Q_ARG("QVariant", t),
+                                            Q_ARG("QVariant", y),
+                                            Q_ARG("QVariant", freq),
+                                            Q_ARG("QVariant", magnitude),
+                                            Q_ARG("QVariant", phase),
+                                            Q_ARG("QVariant", analytic))
                 except Exception as e:
                     logger.error(f"Error in Hilbert transform calculation: {str(e)}")
                     # Send a simplified result in case of error to avoid further issues
-                    t = [point["x"] for point in time_domain]
-                    y = [point["y"] for point in time_domain]
-                    zeros = [0.0] * len(t)
-                    
-                    # Create simple arrays for magnitude and phase in case of error
-                    simple_magnitude = []
-                    for val in y:
-                        simple_magnitude.append(float(abs(val)))
-                        simple_magnitude.append(float(abs(val) * 0.7))
+                    # Interleave |y| and 0.7·|y| like the envelope/original pairs
+                    simple_magnitude = np.column_stack((np.abs(y), np.abs(y) * 0.7)).ravel()
                     
                     QMetaObject.invokeMethod(self.parent, "updateHilbertResults", 
                                             Qt.ConnectionType.QueuedConnection,
-                                            Q_ARG("QVariantList", time_domain),
-                                            Q_ARG("QVariantList", t),
-                                            Q_ARG("QVariantList", simple_magnitude),
-                                            Q_ARG("QVariantList", zeros),
-                                            Q_ARG("QVariantList", y))
+                                            Q_ARG("QVariant", t),
+                                            Q_ARG("QVariant", y),
+                                            Q_ARG("QVariant", t),
+                                            Q_ARG("QVariant", simple_magnitude),
+                                            Q_ARG("QVariant", np.zeros_like(t)),
+                                            Q_ARG("QVariant", y))
                     
                     # Set error message
                     self.parent._equation_transform = "Error calculating Hilbert transform:\n" + str(e)
@@ -108,10 +108,6 @@ class ZTransformCalculatorWorker(QRunnable):
             # Ensure we always call updateResults to finish the calculation
             QMetaObject.invokeMethod(self.parent, "resetCalculation", 
                                     Qt.ConnectionType.QueuedConnection)
-                                    
-        finally:
-            # Make sure to shut down the thread pool
-            self.thread_pool.shutdown(wait=False)
     
     def _generate_time_domain(self):
         """Generate the discrete time domain sequence based on the selected function"""
@@ -278,50 +274,22 @@ class ZTransformCalculatorWorker(QRunnable):
                 
             self.parent._roc_text = "Statistical - all |z| > 0"
             
-        # Efficiently convert to list of dictionaries with proper data types for QML
-        return [{"x": float(x), "y": float(y_val)} for x, y_val in zip(t, y)]
+        return t, np.asarray(y, dtype=float)
     
-    def _calculate_z_transform(self, time_domain):
+    def _calculate_z_transform(self, t, y):
         """Calculate the Z-transform of the given sequence"""
-        # Extract the sequence values
-        y = np.array([point["y"] for point in time_domain])
-        
         # For Z-transform visualization, evaluate the Z-transform around the unit circle
-        # to get the frequency response (equivalent to DTFT)
-        N = 1024  # Number of points for frequency response
-        
-        # Frequency points from 0 to π (normalized frequency)
-        omega = np.linspace(0, np.pi, N)
+        # (z = e^(jω)) to get the frequency response, which is the DTFT of the sequence
+        nyquist = self.sampling_rate / 2
+        low = min(max(self.frequency_min, 0.0), nyquist)
+        high = nyquist if self.frequency_max <= 0 else min(self.frequency_max, nyquist)
+        if high <= low:
+            low, high = 0.0, nyquist
         
-        # Z-points on the unit circle: z = e^(jω)
-        z = np.exp(1j * omega)
-        
-        # For longer sequences, parallelize the Z-transform calculation
-        if len(y) > 100:
-            # Divide the sequence into chunks for parallel processing
-            chunk_size = max(10, len(y) // self.thread_pool._max_workers)
-            chunks = [(i, min(i + chunk_size, len(y))) for i in range(0, len(y), chunk_size)]
-            
-            # Function to process a chunk of the sequence
-            def process_z_chunk(bounds):
-                start, end = bounds
-                z_chunk = np.zeros(N, dtype=complex)
-                for n in range(start, end):
-                    z_chunk += y[n] * z**(-n)
-                return z_chunk
-            
-            # Use thread pool for parallel computation
-            futures = [self.thread_pool.submit(process_z_chunk, chunk) for chunk in chunks]
-            
-            # Collect and combine results
-            z_transform = np.zeros(N, dtype=complex)
-            for future in futures:
-                z_transform += future.result()
-        else:
-            # For shorter sequences, vectorized calculation is more efficient
-            z_transform = np.zeros(N, dtype=complex)
-            for n in range(len(y)):
-                z_transform += y[n] * z**(-n)
+        # Normalized band edges; the full band uses an FFT, a zoomed band chirp-Z
+        w_start = 0.0 if low == 0.0 else np.pi * low / nyquist
+        w_stop = np.pi if high == nyquist else np.pi * high / nyquist
+        omega, z_transform = dtft(y, self.frequency_points, w_start, w_stop)
         
         # Compute magnitude and phase
         magnitude = np.abs(z_transform)
@@ -383,13 +351,15 @@ class ZTransformCalculatorWorker(QRunnable):
         # Convert from normalized to actual frequency in Hz
         freq = omega * self.sampling_rate / (2 * np.pi)
         
-        return freq.tolist(), magnitude.tolist(), phase.tolist(), poles, zeros
+        return freq, magnitude, phase, poles, zeros
     
-    def _calculate_wavelet_transform(self, time_domain):
-        """Calculate the Wavelet transform of the given sequence"""
-        # Extract the sequence values
-        y = np.array([point["y"] for point in time_domain])
-        
+    def _calculate_wavelet_transform(self, t, y):
+        """Calculate the Wavelet transform of the given sequence
+
+        Returns:
+            tuple: (coefficients, scales, magnitude, phase) where magnitude and
+            phase are 2D arrays with one row per scale
+        """
         if PYWT_AVAILABLE:
             # Use PyWavelets if available
             # Determine appropriate decomposition level based on signal length
@@ -405,34 +375,13 @@ class ZTransformCalculatorWorker(QRunnable):
                 max_scales = min(64, len(y)//4)  # Limit scale count for better performance
                 widths = np.arange(1, max_scales)
                 
-                # For performance, we'll use standard PyWavelets call without threading
-                # for small datasets, and only use threading for larger datasets
-                if len(y) <= 256:
-                    # For small signals, threading overhead isn't worth it
-                    cwtmatr, freqs = pywt.cwt(y, widths, 'morl')
-                else:
-                    # For larger signals, use a chunked approach with threading
-                    # Divide the scales into chunks for parallel processing
-                    chunk_size = 8  # Process 8 scales at a time for better cache efficiency
-                    chunks = [widths[i:i+chunk_size] for i in range(0, len(widths), chunk_size)]
-                    
-                    # Function to process a chunk of scales
-                    def process_chunk(chunk_widths):
-                        return pywt.cwt(y, chunk_widths, 'morl')
-                    
-                    # Use thread pool to process chunks in parallel
-                    futures = [self.thread_pool.submit(process_chunk, chunk) for chunk in chunks]
-                    
-                    # Collect and combine results
-                    cwtmatr = []
-                    for future in futures:
-                        chunk_result, _ = future.result()
-                        cwtmatr.append(chunk_result)
-                    
-                    # Combine all chunks into a single array
-                    cwtmatr = np.vstack([chunk for chunk in cwtmatr])
-                    # Corresponding frequencies
-                    freqs = 1 / widths
+                # Long sequences are sharded by scale across worker processes;
+                # short ones run inline in a single PyWavelets call
+                cwtmatr = ProcessKernelPool.get_instance().run_sharded(
+                    cwt_rows, {"y": y, "widths": widths}, (len(widths), len(y)), np.float64,
+                    work_units=len(y) * len(widths) * max_scales, wavelet='morl'
+                )
+                freqs = pywt.scale2frequency('morl', widths)
                 
                 # For visualization purposes, extract magnitude and phase
                 magnitude = np.abs(cwtmatr)
@@ -461,19 +410,7 @@ class ZTransformCalculatorWorker(QRunnable):
                     self.parent._equation_transform = f"W(a,b) = <f, ψ<sub>a,b</sub>> using {self.wavelet_type} wavelet for frequency analysis\n"
                     self.parent._equation_transform += f"CWT performed with Morlet wavelet ({max_scales} scales, optimized)"
                 
-                # Save original 2D arrays for proper visualization
-                # Convert the NumPy arrays to nested Python lists for QML compatibility
-                mag_2d_list = [[float(val) for val in row] for row in magnitude]
-                phase_2d_list = [[float(val) for val in row] for row in phase]
-                
-                self.parent._wavelet_magnitude_2d = mag_2d_list
-                self.parent._wavelet_phase_2d = phase_2d_list
-                
-                # For backwards compatibility, also provide a flattened representation
-                flattened_magnitude = magnitude.flatten().tolist()
-                flattened_phase = phase.flatten().tolist()
-
-                return cwtmatr.tolist(), freqs.tolist(), flattened_magnitude, flattened_phase
+                return cwtmatr, freqs, magnitude, phase
                 
             except Exception as e:
                 logger.error(f"Error in wavelet calculation: {str(e)}")
@@ -515,18 +452,7 @@ class ZTransformCalculatorWorker(QRunnable):
                     self.parent._equation_transform = f"Discrete wavelet decomposition using {self.wavelet_type} (optimized)\n"
                     self.parent._equation_transform += "Each row shows coefficients at different scales (levels)"
                     
-                    # Also save the 2D arrays for the specialized visualization
-                    mag_2d_list = [[float(val) for val in row] for row in magnitude]
-                    phase_2d_list = [[float(val) for val in row] for row in phase]
-                    
-                    self.parent._wavelet_magnitude_2d = mag_2d_list
-                    self.parent._wavelet_phase_2d = phase_2d_list
-                    
-                    # Flatten for traditional visualization
-                    flattened_magnitude = magnitude.flatten().tolist()
-                    flattened_phase = phase.flatten().tolist()
-                    
-                    return cwtmatr.tolist(), freqs.tolist(), flattened_magnitude, flattened_phase
+                    return cwtmatr, freqs, magnitude, phase
                         
                 except Exception as e:
                     logger.error(f"Fallback wavelet calculation error: {str(e)}")
@@ -558,18 +484,7 @@ class ZTransformCalculatorWorker(QRunnable):
                     self.parent._equation_transform = "Basic multi-scale decomposition (optimized)\n"
                     self.parent._equation_transform += "Using simple smoothing filters of increasing width"
                     
-                    # Save for visualization
-                    mag_2d_list = [[float(val) for val in row] for row in magnitude]
-                    phase_2d_list = [[float(val) for val in row] for row in phase]
-                    
-                    self.parent._wavelet_magnitude_2d = mag_2d_list
-                    self.parent._wavelet_phase_2d = phase_2d_list
-                    
-                    # Flatten for traditional visualization
-                    flattened_magnitude = magnitude.flatten().tolist()
-                    flattened_phase = phase.flatten().tolist()
-                    
-                    return cwtmatr.tolist(), freqs.tolist(), flattened_magnitude, flattened_phase
+                    return cwtmatr, freqs, magnitude, phase
         
         else:
             # Simplified basic wavelet transform implementation when PyWavelets is not available
@@ -629,25 +544,10 @@ class ZTransformCalculatorWorker(QRunnable):
             self.parent._equation_transform += "Using windowed Fourier transform as wavelet alternative"
             self.parent._equation_transform += "\n(Install PyWavelets for full wavelet transform capability)"
             
-            # Save for visualization
-            mag_2d_list = [[float(val) for val in row] for row in magnitude_array]
-            phase_2d_list = [[float(val) for val in row] for row in phase_array]
-            
-            self.parent._wavelet_magnitude_2d = mag_2d_list
-            self.parent._wavelet_phase_2d = phase_2d_list
-            
-            # Flatten for traditional visualization
-            flattened_magnitude = magnitude_array.flatten().tolist()
-            flattened_phase = phase_array.flatten().tolist()
-            
-            return cwtmatr_array.tolist(), freqs.tolist(), flattened_magnitude, flattened_phase
+            return cwtmatr_array, freqs, magnitude_array, phase_array
     
-    def _calculate_hilbert_transform(self, time_domain):
+    def _calculate_hilbert_transform(self, t, y):
         """Calculate the Hilbert transform of the given sequence"""
-        # Extract the sequence values
-        y = np.array([point["y"] for point in time_domain])
-        t = np.array([point["x"] for point in time_domain])
-        
         # For better visualization, amplify the signal variation
         # This helps create more pronounced features in the Hilbert transform
         amplified_y = y.copy()
@@ -730,16 +630,10 @@ class ZTransformCalculatorWorker(QRunnable):
         self.parent._equation_transform += f"\nSampling: {self.sampling_rate} Hz | Enhanced visualization scale: {freq_scaling:.1f}x"
         
         # For better visualization, interleave the envelope and original signal
-        magnitude_combined = []
-        for env, orig in zip(amplitude_envelope, scaled_original):
-            magnitude_combined.append(float(env))
-            magnitude_combined.append(float(orig))
-        
-        # Use phase data as is
-        phase_combined = normalized_phase.tolist()
+        magnitude_combined = np.column_stack((amplitude_envelope, scaled_original)).ravel()
         
         # Return time as x-axis for frequency domain display
-        return t.tolist(), magnitude_combined, phase_combined, analytic_signal_real.tolist()
+        return t, magnitude_combined, normalized_phase, analytic_signal_real
     
     def _set_z_transform_equation(self):
         """Set the equation for the Z-transform based on the function type"""
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-import numpy as np
+
+from models.protection.idmt import operating_time, log_currents
 
 @dataclass
 class CurveCharacteristics:
@@ -26,22 +27,19 @@ class TimeCurveCalculator:
                 "Extremely Inverse": CurveCharacteristics(5.67, 2, 0.0352)
             }
         }
+
+    def calculate_trip_times(self, multiples, curve_type, standard, time_dial):
+        """Vectorized trip times for an array of current multiples (inf below pickup)"""
+        char = self.curve_characteristics.get(standard, {}).get(curve_type)
+        if char is None:
+            return None
+        # The ANSI L term is a fixed adder here, so it is not scaled by the time dial
+        return operating_time(multiples, 1.0, time_dial, char.alpha, char.beta) + char.L
     
     def calculate_trip_time(self, multiple, curve_type, standard, time_dial):
         """Calculate trip time for given current multiple"""
-        if standard not in self.curve_characteristics:
-            return None
-        if curve_type not in self.curve_characteristics[standard]:
-            return None
-            
-        char = self.curve_characteristics[standard][curve_type]
-        if multiple <= 1:
-            return float('inf')
-            
-        if standard == "IEC":
-            return (char.alpha * time_dial) / (multiple**char.beta - 1)
-        else:  # ANSI
-            return (char.alpha * time_dial / (multiple**char.beta - 1)) + char.L
+        trip_time = self.calculate_trip_times(multiple, curve_type, standard, time_dial)
+        return None if trip_time is None else float(trip_time)
 
     def generate_curve_points(self, pickup_current, curve_type, standard, time_dial, 
                             min_current=None, max_current=None):
@@ -51,15 +49,11 @@ class TimeCurveCalculator:
         if max_current is None:
             max_current = pickup_current * 20
             
-        points = np.logspace(np.log10(min_current), np.log10(max_current), 100)
-        times = []
-        
-        for current in points:
-            multiple = current / pickup_current
-            trip_time = self.calculate_trip_time(multiple, curve_type, standard, time_dial)
-            if trip_time and trip_time < 100:  # Limit to reasonable times
-                times.append(trip_time)
-            else:
-                times.append(None)
-                
-        return list(zip(points, times))
+        points = log_currents(min_current, max_current, 100)
+        times = self.calculate_trip_times(points / pickup_current, curve_type, standard, time_dial)
+        if times is None:
+            return list(zip(points, [None] * len(points)))
+
+        # Limit to reasonable times
+        reasonable = (times > 0) & (times < 100)
+        return list(zip(points, [float(t) if ok else None for t, ok in zip(times, reasonable)]))
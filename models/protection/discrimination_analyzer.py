@@ -1,20 +1,33 @@
 from PySide6.QtCore import QObject, Property, Signal, Slot, QAbstractListModel, Qt, QModelIndex
 import os
-import math
 import matplotlib
 
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import tempfile
 import gc
+import numpy as np
 from datetime import datetime
 from services.file_saver import FileSaver
 from services.logger_config import configure_logger
 from services.database_manager import DatabaseManager
+from services.fuse_curve_index import FuseCurveIndex
+from models.protection.idmt import operating_time_matrix
+from models.protection.grading import MarginSweep, grade_chain, sweep_margins
 
 
 logger = configure_logger("qmltest", component="discrimination")
 
+# Pickup multiples plotted for a definite time relay
+DEFINITE_TIME_MULTIPLES = np.array([1.01, 1.5, 2, 3, 5, 7, 10, 15, 20, 30, 50, 70, 100, 150, 200, 300, 500, 1000])
+
+# Pickup multiples plotted for inverse curves: fine steps near pickup, wider steps above
+INVERSE_CURVE_MULTIPLES = np.concatenate([
+    1.01 + np.arange(10) * 0.1,  # Close to pickup (1.01 to 2.0)
+    2.0 + np.arange(17) * 0.5,  # Medium range (2.0 to 10.0)
+    [base * step for base in (10, 100, 1000, 10000) for step in (1, 2, 5)],  # High range
+])
+
 from utils.pdf.pdf_generator_overcurrent import generate_pdf
 
 class ResultsModel(QAbstractListModel):
@@ -71,6 +84,8 @@ class DiscriminationAnalyzer(QObject):
     chartRangesChanged = Signal()
     currentLevelChanged = Signal()
     fuseCurvesChanged = Signal()
+    gradingChanged = Signal()
+    continuousSweepChanged = Signal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -80,6 +95,8 @@ class DiscriminationAnalyzer(QObject):
         self._min_margin = 0.3  # Minimum discrimination time (seconds)
         self._current_level = 10  # Default current level for analysis
         self._curve_points_cache = {}  # Add cache for curve points
+        self._grading_results = []  # Last optimizeGrading() proposal
+        self._continuous_sweep = False  # Also sweep margins between fault levels
         self._chart_ranges = {         # Add default chart ranges
             "xMin": 10,
             "xMax": 10000,
@@ -91,6 +108,7 @@ class DiscriminationAnalyzer(QObject):
         
         # Get database instance
         self.db_manager = DatabaseManager.get_instance()
+        self.fuse_index = FuseCurveIndex.get_instance()
         
         # Initialize the file saver
         self._file_saver = FileSaver()
@@ -131,6 +149,7 @@ class DiscriminationAnalyzer(QObject):
         self._fault_levels.clear()
         self._results_model.setResults([])
         self._curve_points_cache.clear()  # Clear cache on reset
+        self._grading_results = []
         self._fuse_curves.clear()  # Clear fuse curves on reset
         self.relayCountChanged.emit()
         self.chartRangesChanged.emit()  # Emit to update chart ranges
@@ -243,40 +262,11 @@ class DiscriminationAnalyzer(QObject):
             for i, relay in enumerate(self._relays):
                 color = colors[i % len(colors)]
                 name = relay["name"]
-                pickup = float(relay["pickup"])
-                constants = relay["curve_constants"]
-                
-                # Check if this is a definite time relay
-                if constants.get("type") == "definite":
-                    # For definite time relays, generate a horizontal line
-                    tds = float(relay["tds"])
-                    current_multipliers = [1.01, 1.5, 2, 3, 5, 7, 10, 15, 20, 30, 50, 70, 100, 150, 200, 300, 500, 1000]
-                    currents = [pickup * multiplier for multiplier in current_multipliers]
-                    times = [tds] * len(currents)
-                else:
-                    # Create current range (logarithmic, more points in critical areas)
-                    currents = []
-                    # Close to pickup (1.01 to 2.0)
-                    currents.extend([pickup * (1.01 + i * 0.1) for i in range(10)])
-                    # Medium range (2.0 to 10.0)
-                    currents.extend([pickup * (2.0 + i * 0.5) for i in range(17)])
-                    # High range (logarithmic steps)
-                    for j in range(1, 5):
-                        base = pickup * (10 ** j)
-                        currents.extend([base, 2 * base, 5 * base])
-                    
-                    # Calculate trip time for each current value
-                    times = []
-                    for current in currents:
-                        time = self._calculate_operating_time(relay, current)
-                        if time and time > 0 and time < 100:
-                            times.append(time)
-                        else:
-                            # Handle invalid time values - skip them
-                            continue
-                    
-                    # Ensure currents and times have the same length
-                    currents = currents[:len(times)]
+                if name not in self._curve_points_cache:
+                    self._curve_points_cache[name] = self._generate_curve_points(relay)
+                points = self._curve_points_cache[name]
+                currents = [point["current"] for point in points]
+                times = [point["time"] for point in points]
                 
                 # Plot the relay curve
                 plt.plot(currents, times, color=color, linewidth=2, label=name)
@@ -356,35 +346,24 @@ class DiscriminationAnalyzer(QObject):
         if relayIndex < 0 or relayIndex >= len(self._relays):
             return []
             
-        relay = self._relays[relayIndex]
-        points = []
-        
-        for fault_current in self._fault_levels:
-            time = self._calculate_operating_time(relay, fault_current)
-            if time and time > 0 and not math.isinf(time):
-                points.append({
-                    "current": fault_current,
-                    "time": time
-                })
-                
-        return points
+        return self._fault_points([self._relays[relayIndex]])
 
     @Property('QVariantList')
     def faultPoints(self):
         """Calculate all fault points for all relays"""
-        points = []
-        for i, relay in enumerate(self._relays):
-            relay_points = []
-            for current in self._fault_levels:
-                time = self._calculate_operating_time(relay, current)
-                if time and time > 0 and not math.isinf(time):
-                    relay_points.append({
-                        "current": current,
-                        "time": time,
-                        "relay": relay["name"]
-                    })
-            points.extend(relay_points)
-        return points
+        return [dict(point, relay=self._relays[row]["name"])
+                for row, point in self._fault_point_rows(self._relays)]
+
+    def _fault_point_rows(self, relays):
+        """(relay row, point) for every fault level at which a relay operates"""
+        currents = np.asarray(self._fault_levels, dtype=float)
+        times = self._operating_times(relays, currents)
+        rows, columns = np.nonzero(np.isfinite(times) & (times > 0))
+        return [(row, {"current": self._fault_levels[column], "time": float(times[row, column])})
+                for row, column in zip(rows.tolist(), columns.tolist())]
+
+    def _fault_points(self, relays):
+        return [point for _, point in self._fault_point_rows(relays)]
 
     @Property('QVariantList')
     def curvePoints(self):
@@ -402,39 +381,22 @@ class DiscriminationAnalyzer(QObject):
 
     def _generate_curve_points(self, relay):
         """Generate points for a single relay curve"""
-        points = []
-        pickup = float(relay["pickup"])
-        constants = relay["curve_constants"]
+        try:
+            pickup = float(relay["pickup"])
+        except (KeyError, TypeError, ValueError):
+            return []
         
-        # Check if this is a definite time relay
-        if constants.get("type") == "definite":
-            # For definite time relays, generate a horizontal line at TDS value
-            tds = float(relay["tds"])
-            # Generate points across a wider current range for better visibility
-            current_multipliers = [1.01, 1.5, 2, 3, 5, 7, 10, 15, 20, 30, 50, 70, 100, 150, 200, 300, 500, 1000]
-            for multiplier in current_multipliers:
-                current = pickup * multiplier
-                points.append({"current": current, "time": tds})
-            return points
+        # Definite time relays are a horizontal line at the TDS value across a wide current range
+        definite = relay["curve_constants"].get("type") == "definite"
+        currents = pickup * (DEFINITE_TIME_MULTIPLES if definite else INVERSE_CURVE_MULTIPLES)
+        times = self._operating_times([relay], currents)[0]
         
-        # Generate multiples with fine steps near pickup and wider steps for higher currents
-        multiples = []
-        # Close to pickup (1.01 to 2.0)
-        multiples.extend([1.01 + i * 0.1 for i in range(10)])
-        # Medium range (2.0 to 10.0)
-        multiples.extend([2.0 + i * 0.5 for i in range(17)])
-        # High range (logarithmic steps)
-        for i in range(1, 5):
-            base = 10 ** i
-            multiples.extend([base, 2 * base, 5 * base])
-
-        for multiple in multiples:
-            current = pickup * multiple
-            time = self._calculate_operating_time(relay, current)
-            if time and time > 0 and time < 100:
-                points.append({"current": current, "time": time})
-                
-        return points
+        if definite:
+            valid = np.isfinite(times)
+        else:
+            valid = (times > 0) & (times < 100)
+        return [{"current": current, "time": time}
+                for current, time in zip(currents[valid].tolist(), times[valid].tolist())]
 
     @Property('QVariantList')
     def marginPoints(self):
@@ -498,11 +460,19 @@ class DiscriminationAnalyzer(QObject):
     def _analyze_discrimination(self):
         results = []
         
-        if len(self._relays) < 2 or not self._fault_levels:
+        if len(self._relays) < 2 or not (self._fault_levels or self._continuous_sweep):
             self._results_model.setResults([])
             self.analysisComplete.emit()
             return
             
+        fault_levels = [fault for fault in self._fault_levels if fault and fault > 0]
+        times = self._operating_times(self._relays, np.asarray(fault_levels, dtype=float))
+        # Margins of every backup relay over its primary at every fault level
+        with np.errstate(invalid='ignore'):
+            margins = times[1:] - times[:-1]
+        operating = np.isfinite(times[1:]) & np.isfinite(times[:-1])
+        sweeps = self._sweep_margins(fault_levels) if self._continuous_sweep else None
+        
         # Analyze each pair of relays
         for i in range(len(self._relays) - 1):
             primary = self._relays[i]
@@ -519,20 +489,11 @@ class DiscriminationAnalyzer(QObject):
             }
             
             # Check margin at each fault level
-            for fault_current in self._fault_levels:
-                if not fault_current or fault_current <= 0:
-                    continue
-
-                primary_time = self._calculate_operating_time(primary, fault_current)
-                backup_time = self._calculate_operating_time(backup, fault_current)
-                
-                if primary_time is None or backup_time is None or math.isinf(primary_time) or math.isinf(backup_time):
-                    continue
-
-                margin = backup_time - primary_time
+            for column in np.flatnonzero(operating[i]).tolist():
+                margin = float(margins[i, column])
                 
                 result["margins"].append({
-                    "fault_current": fault_current,
+                    "fault_current": fault_levels[column],
                     "margin": margin,
                     "coordinated": margin >= self._min_margin
                 })
@@ -540,41 +501,142 @@ class DiscriminationAnalyzer(QObject):
                 if margin < self._min_margin:
                     result["coordinated"] = False
             
-            if result["margins"]:  # Only add results if there are valid margins
+            if sweeps is not None:
+                sweep = sweeps[i]
+                result["sweep"] = {
+                    "min_margin": sweep.min_margin,
+                    "min_margin_current": sweep.min_margin_current,
+                    "crossings": sweep.crossings,
+                    "violations": [
+                        {"start": start, "end": end, "worst_margin": worst, "worst_current": current}
+                        for start, end, worst, current in sweep.violations
+                    ]
+                }
+                if sweep.violations:
+                    result["coordinated"] = False
+            
+            # Only add results if there are valid margins
+            if result["margins"] or (sweeps is not None and sweeps[i].min_margin is not None):
                 results.append(result)
         
         self._results_model.setResults(results)
         self.analysisComplete.emit()
 
+    def _sweep_margins(self, fault_levels):
+        """Sweep every relay pair from the lowest pickup to the highest fault level.
+
+        Without fault levels the sweep ends at 20 times the highest pickup.
+        """
+        pickup, tds, a, p, definite = self._relay_arrays(self._relays)
+        if not (pickup > 0).any():
+            return [MarginSweep() for _ in range(len(self._relays) - 1)]
+        low = np.nanmin(np.where(pickup > 0, pickup, np.nan))
+        high = max(fault_levels) if fault_levels else 20 * np.nanmax(pickup)
+        return sweep_margins(pickup, tds, a, p, np.zeros(len(pickup)), definite,
+                             self._min_margin, low, max(high, low * 1.01))
+
     def _calculate_operating_time(self, relay, fault_current):
         """Calculate relay operating time for given fault current"""
-        try:
-            pickup = float(relay["pickup"])
-            if pickup <= 0:
-                return None
-                
-            multiple = fault_current / pickup
-            if multiple <= 1.0:
-                return float('inf')  # Current is below pickup threshold
-                
-            constants = relay["curve_constants"]
-            tds = float(relay["tds"])
-            
-            # Check if this is a definite time relay
-            if constants.get("type") == "definite":
-                # For definite time relays, operating time is constant (TDS value)
-                return tds
-            
-            # Calculation using the standard formula for inverse time curves
-            denominator = (multiple ** constants["b"]) - 1
-            if denominator <= 0:
-                return None
-                
-            time = (constants["a"] * tds) / denominator
-            return time if time >= 0 else None
-            
-        except Exception:
-            return None
+        time = self._operating_times([relay], [fault_current])[0, 0]
+        return None if np.isnan(time) else float(time)
+
+    def _operating_times(self, relays, currents):
+        """Operating times of each relay (rows) at each current (columns).
+
+        inf means the current is below pickup, nan that the relay settings are
+        invalid or give no operating time.
+        """
+        pickup, tds, a, p, definite = self._relay_arrays(relays)
+        times = operating_time_matrix(currents, pickup, tds, a, p, definite=definite)
+        return np.where(times >= 0, times, np.nan)
+
+    def _relay_arrays(self, relays):
+        """Pickup, TDS, curve constant a, exponent b and definite-time flags as arrays.
+
+        The pickup is nan for a relay whose settings cannot be read.
+        """
+        count = len(relays)
+        pickup, tds, a, p = (np.full(count, np.nan) for _ in range(4))
+        definite = np.zeros(count, dtype=bool)
+        for row, relay in enumerate(relays):
+            try:
+                constants = relay["curve_constants"]
+                definite[row] = constants.get("type") == "definite"
+                pickup[row] = float(relay["pickup"])
+                tds[row] = float(relay["tds"])
+                if not definite[row]:
+                    a[row] = float(constants["a"])
+                    p[row] = float(constants["b"])
+            except Exception:
+                pickup[row] = np.nan
+        return pickup, tds, a, p, definite
+
+    @Slot(bool, result='QVariantList')
+    def optimizeGrading(self, optimize_pickup=False):
+        """Lowest TDS (and optionally pickup) per relay that grades at every fault level.
+
+        The relay list is graded in order, each relay against the one before it,
+        as in the margin analysis. The proposal is kept in gradingResults and only
+        applied to the relays by applyGrading().
+        """
+        fault_levels = [fault for fault in self._fault_levels if fault and fault > 0]
+        if not self._relays or not fault_levels:
+            self._grading_results = []
+            self.gradingChanged.emit()
+            return self._grading_results
+
+        pickup, _, a, p, definite = self._relay_arrays(self._relays)
+        steps = grade_chain(fault_levels, pickup, a, p, np.zeros(len(pickup)), definite,
+                            self._min_margin, optimize_pickup)
+
+        results = []
+        for i, (relay, step) in enumerate(zip(self._relays, steps)):
+            results.append({
+                "name": relay["name"],
+                "pickup": step.pickup,
+                "tds": step.tds,
+                "feasible": step.feasible,
+                "clearing_time": step.clearing_time,
+                "binding_relay": self._relays[i - 1]["name"] if step.binding_fault_current is not None else None,
+                "binding_fault_current": step.binding_fault_current,
+                "binding_margin": step.binding_margin
+            })
+            if not step.feasible:
+                logger.warning(f"Relay {relay['name']} cannot reach a {self._min_margin:.2f}s margin "
+                               f"within the TDS range")
+
+        self._grading_results = results
+        self.gradingChanged.emit()
+        return results
+
+    @Slot()
+    def applyGrading(self):
+        """Apply the last optimizeGrading() proposal to the relays and re-analyze"""
+        names = [result["name"] for result in self._grading_results]
+        if not names or names != [relay["name"] for relay in self._relays]:
+            return
+        for relay, result in zip(self._relays, self._grading_results):
+            relay["pickup"] = result["pickup"]
+            relay["tds"] = result["tds"]
+        self._curve_points_cache.clear()
+        self.relayCountChanged.emit()
+        self.chartRangesChanged.emit()
+        self._analyze_discrimination()
+
+    @Property('QVariantList', notify=gradingChanged)
+    def gradingResults(self):
+        return self._grading_results
+
+    @Property(bool, notify=continuousSweepChanged)
+    def continuousSweep(self):
+        return self._continuous_sweep
+
+    @continuousSweep.setter
+    def continuousSweep(self, value):
+        if self._continuous_sweep != value:
+            self._continuous_sweep = value
+            self.continuousSweepChanged.emit()
+            self._analyze_discrimination()
 
     @Property(QObject, notify=analysisComplete)
     def results(self):
@@ -624,14 +686,7 @@ class DiscriminationAnalyzer(QObject):
     def getFuseTypes(self, manufacturer="ABB"):
         """Get available fuse types for the specified manufacturer."""
         try:
-            results = self.db_manager.fetch_all("""
-                SELECT DISTINCT fuse_type
-                FROM fuse_curves
-                WHERE manufacturer = ?
-                ORDER BY fuse_type
-            """, (manufacturer,))
-            
-            return [row['fuse_type'] for row in results] if results else []
+            return list(dict.fromkeys(fuse_type for fuse_type, _ in self.fuse_index.fuse_types(manufacturer)))
         except Exception as e:
             logger.error(f"Error getting fuse types: {e}")
             return []
@@ -640,14 +695,7 @@ class DiscriminationAnalyzer(QObject):
     def getFuseRatings(self, fuse_type, manufacturer="ABB"):
         """Get available fuse ratings for the specified type and manufacturer."""
         try:
-            results = self.db_manager.fetch_all("""
-                SELECT DISTINCT rating
-                FROM fuse_curves
-                WHERE fuse_type = ? AND manufacturer = ?
-                ORDER BY rating
-            """, (fuse_type, manufacturer))
-            
-            return [row['rating'] for row in results] if results else []
+            return self.fuse_index.ratings(manufacturer, fuse_type)
         except Exception as e:
             logger.error(f"Error getting fuse ratings: {e}")
             return []
@@ -656,24 +704,8 @@ class DiscriminationAnalyzer(QObject):
     def getFuseCurveData(self, fuse_type, rating, manufacturer="ABB"):
         """Get fuse curve data for plotting."""
         try:
-            results = self.db_manager.fetch_all("""
-                SELECT current_multiplier, melting_time, clearing_time, notes
-                FROM fuse_curves 
-                WHERE fuse_type = ? AND rating = ? AND manufacturer = ?
-                ORDER BY current_multiplier
-            """, (fuse_type, rating, manufacturer))
-            
-            curve_data = []
-            for row in results:
-                current = rating * row['current_multiplier']
-                curve_data.append({
-                    'current': current,
-                    'melting_time': row['melting_time'],
-                    'clearing_time': row['clearing_time'] if row['clearing_time'] else row['melting_time'],
-                    'notes': row['notes'] or ''
-                })
-            
-            return curve_data
+            curve = self.fuse_index.curve(manufacturer, fuse_type, rating)
+            return curve.points() if curve else []
         except Exception as e:
             logger.error(f"Error getting fuse curve data: {e}")
             return []
@@ -0,0 +1,236 @@
+"""Time grading of a radial chain of overcurrent relays.
+
+The chain is ordered from the most downstream relay to the source. Each relay
+must operate at least the grading margin after the relay below it at every
+fault level where both operate. Relays are graded in order, so each one only
+depends on the final setting of the relay below it. For each relay the lowest
+time dial meeting every constraint is found by bisection, vectorized over all
+fault levels (and over all candidate pickups when pickup is optimized too).
+Operating time rises monotonically with the time dial for every
+characteristic in models.protection.idmt, which is what makes bisection valid.
+
+sweep_margins() checks an existing chain between fault levels. It samples every
+relay pair's margin on a dense log-spaced current range, then bisects the
+exact currents where the curves cross or where the margin drops below the
+minimum.
+"""
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from models.protection.idmt import operating_time
+
+TDS_MIN = 0.025
+TDS_MAX = 10.0
+TDS_STEP = 0.005  # Settings are rounded up to the relay's setting step
+BISECTION_STEPS = 48
+
+# Pickup candidates tried per relay when pickup is optimized, as multiples of
+# the entered pickup (the entered value is the lowest the load current allows)
+PICKUP_SPAN = 2.0
+PICKUP_CANDIDATES = 21
+
+SWEEP_POINTS = 2000
+ROOT_STEPS = 40  # Bisection steps on log(current) between neighbouring samples
+
+
+@dataclass
+class GradingStep:
+    """Chosen setting of one relay and the constraint that fixed it."""
+    pickup: float
+    tds: float
+    feasible: bool
+    binding_fault_current: Optional[float] = None  # Fault level with the smallest margin
+    binding_margin: Optional[float] = None  # Margin over the downstream relay there
+    clearing_time: Optional[float] = None  # Operating time at the highest fault level
+
+
+@dataclass
+class MarginSweep:
+    """Margin of one relay over the relay below it across the swept current range."""
+    min_margin: Optional[float] = None
+    min_margin_current: Optional[float] = None
+    crossings: list = field(default_factory=list)  # Currents where the two curves cross
+    # (start current, end current, worst margin, current of worst margin) of every
+    # range where the margin is below the minimum
+    violations: list = field(default_factory=list)
+
+
+def required_tds(currents, pickup, a, p, b, definite, downstream_times, margin,
+                 tds_min=TDS_MIN, tds_max=TDS_MAX, steps=BISECTION_STEPS):
+    """Lowest time dial meeting the margin at each fault level.
+
+    All arguments broadcast; downstream_times is inf or nan where the
+    downstream relay does not operate. Returns (tds, feasible) arrays where
+    tds is tds_min for levels that impose no constraint and nan where even
+    tds_max is too fast.
+    """
+    def meets(tds):
+        times = operating_time(currents, pickup, tds, a, p, b, definite)
+        with np.errstate(invalid='ignore'):
+            return times - downstream_times >= margin
+
+    shape = np.broadcast_shapes(np.shape(currents), np.shape(pickup), np.shape(downstream_times))
+    upstream = operating_time(currents, pickup, tds_max, a, p, b, definite)
+    # Only levels where both relays operate are graded, as in the margin analysis
+    constrained = np.broadcast_to(np.isfinite(upstream) & np.isfinite(downstream_times), shape)
+    feasible = ~constrained | np.broadcast_to(meets(tds_max), shape)
+
+    low = np.full(shape, float(tds_min))
+    high = np.full(shape, float(tds_max))
+    pending = constrained & feasible & ~np.broadcast_to(meets(tds_min), shape)
+    for _ in range(steps):
+        middle = (low + high) / 2
+        ok = np.broadcast_to(meets(middle), shape)
+        high = np.where(pending & ok, middle, high)
+        low = np.where(pending & ~ok, middle, low)
+
+    tds = np.where(pending, high, tds_min)
+    return np.where(feasible, tds, np.nan), feasible
+
+
+def grade_chain(currents, pickups, a, p, b, definite, margin, optimize_pickup=False,
+                tds_min=TDS_MIN, tds_max=TDS_MAX, tds_step=TDS_STEP):
+    """Lowest time dial (and optionally pickup) for every relay of a chain.
+
+    Args:
+        currents: Fault levels to grade at
+        pickups, a, p, b, definite: Per-relay arrays, downstream relay first
+        margin: Minimum grading margin in seconds
+        optimize_pickup: Also choose each pickup between the entered value and
+            PICKUP_SPAN times it, never below the downstream relay's pickup and
+            never so high that a fault level drops below pickup, minimizing
+            the operating time at the highest fault level
+
+    Returns:
+        List of GradingStep, one per relay
+    """
+    currents = np.asarray(currents, dtype=float)
+    top_current = currents.max() if currents.size else np.nan
+    steps = []
+    downstream_times = np.full(currents.shape, np.nan)
+    previous_pickup = 0.0
+
+    for row in range(len(pickups)):
+        curve = (a[row], p[row], b[row], definite[row])
+        if optimize_pickup:
+            candidates = pickups[row] * np.linspace(1.0, PICKUP_SPAN, PICKUP_CANDIDATES)
+            candidates = np.unique(np.maximum(candidates, previous_pickup))
+            # A higher pickup must not stop the relay from seeing any fault it saw before
+            sees = np.isfinite(operating_time(currents[None, :], candidates[:, None], tds_max, *curve))
+            candidates = candidates[(sees >= sees[0]).all(axis=1)]
+        else:
+            candidates = np.array([pickups[row]], dtype=float)
+
+        # Rows are candidate pickups, columns fault levels
+        tds, feasible = required_tds(currents[None, :], candidates[:, None], *curve,
+                                     downstream_times[None, :], margin, tds_min, tds_max)
+        candidate_ok = feasible.all(axis=1)
+        candidate_tds = np.where(feasible, tds, tds_max).max(axis=1, initial=tds_min)
+        candidate_tds = np.clip(np.ceil(candidate_tds / tds_step - 1e-9) * tds_step, tds_min, tds_max)
+        candidate_tds = np.round(candidate_tds, 6)
+
+        clearing = operating_time(top_current, candidates, candidate_tds, *curve)
+        # Prefer feasible candidates, then the fastest clearing, then the lowest pickup
+        order = np.lexsort((candidates, np.nan_to_num(clearing, nan=np.inf), ~candidate_ok))
+        best = order[0]
+
+        chosen_pickup = float(candidates[best])
+        chosen_tds = float(candidate_tds[best])
+        times = operating_time(currents, chosen_pickup, chosen_tds, *curve)
+        step = GradingStep(chosen_pickup, chosen_tds, bool(candidate_ok[best]))
+        if np.isfinite(clearing[best]):
+            step.clearing_time = float(clearing[best])
+
+        with np.errstate(invalid='ignore'):
+            margins = times - downstream_times
+        graded = np.isfinite(margins)
+        if graded.any():
+            column = int(np.argmin(np.where(graded, margins, np.inf)))
+            step.binding_fault_current = float(currents[column])
+            step.binding_margin = float(margins[column])
+
+        steps.append(step)
+        downstream_times = times
+        previous_pickup = chosen_pickup
+
+    return steps
+
+
+def _pair_margins(rows, currents, settings):
+    """Time of relay rows + 1 minus time of relay rows, broadcast with currents."""
+    pickups, tms, a, p, b, definite = settings
+    upper = rows + 1
+    backup = operating_time(currents, pickups[upper], tms[upper], a[upper], p[upper], b[upper], definite[upper])
+    primary = operating_time(currents, pickups[rows], tms[rows], a[rows], p[rows], b[rows], definite[rows])
+    with np.errstate(invalid='ignore'):
+        return backup - primary
+
+
+def _refine_roots(rows, low, high, level, settings, steps=ROOT_STEPS):
+    """Currents between low and high where the margin of each pair crosses level."""
+    low, high = np.log(low), np.log(high)
+    below_at_low = np.signbit(_pair_margins(rows, np.exp(low), settings) - level)
+    for _ in range(steps):
+        middle = (low + high) / 2
+        same = np.signbit(_pair_margins(rows, np.exp(middle), settings) - level) == below_at_low
+        low = np.where(same, middle, low)
+        high = np.where(same, high, middle)
+    return np.exp((low + high) / 2)
+
+
+def sweep_margins(pickups, tms, a, p, b, definite, margin, low, high, points=SWEEP_POINTS):
+    """Margin of every relay over the one below it between two fault currents.
+
+    Args:
+        pickups, tms, a, p, b, definite: Per-relay arrays, downstream relay first
+        margin: Minimum grading margin in seconds
+        low, high: Current range to sweep in A
+        points: Log-spaced samples per pair
+
+    Returns:
+        List of MarginSweep, one per consecutive relay pair. As in the fault
+        level analysis, only currents where both relays operate are graded.
+    """
+    settings = tuple(np.asarray(values, dtype=float) for values in (pickups, tms, a, p, b))
+    settings += (np.asarray(definite, dtype=bool),)
+    pairs = np.arange(len(settings[0]) - 1)
+    currents = np.geomspace(low, high, points)
+    # Rows are relay pairs, columns sampled currents
+    margins = _pair_margins(pairs[:, None], currents[None, :], settings)
+    valid = np.isfinite(margins)
+
+    def roots(level):
+        """(pair, sample) of every bracket where the margin crosses level, and the root"""
+        above = ~np.signbit(margins - level)
+        rows, columns = np.nonzero(valid[:, :-1] & valid[:, 1:] & (above[:, :-1] != above[:, 1:]))
+        found = _refine_roots(rows, currents[columns], currents[columns + 1], level, settings)
+        return rows, columns, found
+
+    crossing_rows, _, crossing_currents = roots(0.0)
+    edge_rows, edge_columns, edge_currents = roots(margin)
+    edges = dict(zip(zip(edge_rows.tolist(), edge_columns.tolist()), edge_currents.tolist()))
+
+    sweeps = []
+    for row in pairs.tolist():
+        sweep = MarginSweep(crossings=crossing_currents[crossing_rows == row].tolist())
+        if valid[row].any():
+            worst = int(np.argmin(np.where(valid[row], margins[row], np.inf)))
+            sweep.min_margin = float(margins[row, worst])
+            sweep.min_margin_current = float(currents[worst])
+
+        # Runs of samples below the margin; ends come from the refined roots where
+        # the run starts or stops inside the swept range, else from the samples
+        below = np.concatenate(([False], valid[row] & (margins[row] < margin), [False]))
+        changes = np.flatnonzero(below[1:] != below[:-1])
+        for start, stop in zip(changes[::2].tolist(), changes[1::2].tolist()):
+            worst = start + int(np.argmin(margins[row, start:stop]))
+            sweep.violations.append((
+                edges.get((row, start - 1), float(currents[start])),
+                edges.get((row, stop - 1), float(currents[stop - 1])),
+                float(margins[row, worst]),
+                float(currents[worst])
+            ))
+        sweeps.append(sweep)
+    return sweeps
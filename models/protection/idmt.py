@@ -0,0 +1,100 @@
+"""Vectorized inverse-time (IDMT) and definite-time relay characteristics.
+
+Every characteristic is evaluated as
+
+    t = TMS * (A / (M**p - 1) + B)        with M = I / I_pickup
+
+which covers IEC 60255-151 (B = 0) and IEEE C37.112 / ANSI curves. Definite
+time relays operate after TMS seconds once M > 1. All functions broadcast
+over their arguments with NumPy, so one call can evaluate thousands of fault
+currents against many relays at once.
+
+Results use inf where the current is at or below pickup (the relay never
+operates) and nan where the settings are invalid (e.g. pickup <= 0).
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+
+class IdmtCurve(NamedTuple):
+    """Constants of one characteristic: t = TMS * (a / (M**p - 1) + b)."""
+    a: float
+    p: float
+    b: float = 0.0
+    definite: bool = False
+
+
+DEFINITE_TIME = IdmtCurve(0.0, 0.0, 0.0, True)
+
+IEC_CURVES = {
+    "Standard Inverse": IdmtCurve(0.14, 0.02),
+    "Very Inverse": IdmtCurve(13.5, 1.0),
+    "Extremely Inverse": IdmtCurve(80.0, 2.0),
+    "Long Time Inverse": IdmtCurve(120.0, 1.0),
+}
+
+IEEE_CURVES = {
+    "Moderately Inverse": IdmtCurve(0.0515, 0.02, 0.114),
+    "Very Inverse": IdmtCurve(19.61, 2.0, 0.491),
+    "Extremely Inverse": IdmtCurve(28.2, 2.0, 0.1217),
+}
+
+# Standard characteristics by display name
+CURVES = {
+    "Definite Time": DEFINITE_TIME,
+    **{f"IEC {name}": curve for name, curve in IEC_CURVES.items()},
+    **{f"IEEE {name}": curve for name, curve in IEEE_CURVES.items()},
+}
+
+
+def operating_time(current, pickup, tms, a, p, b=0.0, definite=False):
+    """Operating time for any broadcastable combination of currents and settings.
+
+    Args:
+        current: Fault current(s) in A
+        pickup: Pickup current(s) in A
+        tms: Time multiplier / time dial setting(s); the delay for definite time
+        a, p, b: Curve constants (see IdmtCurve)
+        definite: True where the relay is definite time
+
+    Returns:
+        numpy.ndarray of times in seconds (a 0-d result is returned as a NumPy
+        scalar), inf below pickup and nan for invalid settings
+    """
+    current = np.asarray(current, dtype=float)
+    pickup = np.asarray(pickup, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        multiple = current / pickup
+        denominator = np.power(multiple, p) - 1.0
+        inverse = tms * (a / denominator + b)
+        inverse = np.where(denominator > 0, inverse, np.nan)
+        times = np.where(definite, tms, inverse)
+        times = np.where(multiple > 1.0, times, np.inf)
+        times = np.where((pickup > 0) & np.isfinite(multiple), times, np.nan)
+    return times[()]
+
+
+def curve_time(curve, current, pickup, tms):
+    """Operating time of one characteristic over an array of currents."""
+    return operating_time(current, pickup, tms, curve.a, curve.p, curve.b, curve.definite)
+
+
+def operating_time_matrix(currents, pickups, tms, a, p, b=0.0, definite=False):
+    """Times for every relay (rows) at every current (columns).
+
+    Relay settings are 1-D arrays of equal length (or scalars shared by all
+    relays); currents is a 1-D array. Returns an array of shape
+    (relays, currents).
+    """
+    def column(values, dtype=float):
+        return np.asarray(values, dtype=dtype).reshape(-1, 1)
+
+    currents = np.asarray(currents, dtype=float).reshape(1, -1)
+    return operating_time(currents, column(pickups), column(tms), column(a), column(p),
+                          column(b), column(definite, bool))
+
+
+def log_currents(minimum, maximum, count=100):
+    """Logarithmically spaced currents for plotting a characteristic."""
+    return np.logspace(np.log10(minimum), np.log10(maximum), count)
@@ -1,6 +1,8 @@
 from PySide6.QtCore import QObject, Signal, Property, Slot
 from .time_curve_calculator import TimeCurveCalculator
+from .idmt import CURVES, curve_time
 import math
+import numpy as np
 import tempfile
 import os
 import matplotlib
@@ -204,42 +206,32 @@ class OvercurrentProtectionCalculator(QObject):
             self._curve_standard
         )
 
+    def _required_time_dials(self, points, margin):
+        """Time dials putting the 51 curve at each point's time plus margin"""
+        currents, times = points
+        currents = np.asarray(currents, dtype=float)
+        times = np.array([np.nan if t is None else t for t in times], dtype=float)
+        base_times = self._time_curve_calculator.calculate_operating_times(
+            self._curve_type_51,
+            self._curve_standard,
+            currents / self._i_pickup_51,
+            1.0  # Base time dial
+        )
+        if base_times is None:
+            return np.empty(0)
+        required = (times + margin) / base_times
+        return required[np.isfinite(required)]
+
     def _calculate_minimum_time_dial(self, upstream_points):
         """Calculate minimum time dial to maintain grading margin with upstream device"""
-        currents, times = upstream_points
-        min_dial = 0.1
-        
-        # Find minimum time dial that maintains grading margin
-        for i in range(len(currents)):
-            if times[i] is not None:
-                required_dial = (times[i] - self._grading_margin) / \
-                              self._time_curve_calculator.calculate_operating_time(
-                                  self._curve_type_51,
-                                  self._curve_standard,
-                                  currents[i] / self._i_pickup_51,
-                                  1.0  # Base time dial
-                              )
-                min_dial = max(min_dial, required_dial)
-        
-        return min_dial
+        required = self._required_time_dials(upstream_points, -self._grading_margin)
+        return max(0.1, float(required.max())) if required.size else 0.1
 
     def _calculate_maximum_time_dial(self, downstream_points):
         """Calculate maximum time dial to maintain grading margin with downstream device"""
-        currents, times = downstream_points
-        max_dial = 10.0  # Maximum reasonable time dial setting
-        
-        for i in range(len(currents)):
-            if times[i] is not None:
-                required_dial = (times[i] + self._grading_margin) / \
-                              self._time_curve_calculator.calculate_operating_time(
-                                  self._curve_type_51,
-                                  self._curve_standard,
-                                  currents[i] / self._i_pickup_51,
-                                  1.0  # Base time dial
-                              )
-                max_dial = min(max_dial, required_dial)
-        
-        return max_dial
+        required = self._required_time_dials(downstream_points, self._grading_margin)
+        # 10.0 is the maximum reasonable time dial setting
+        return min(10.0, float(required.min())) if required.size else 10.0
 
     def _calculate_fault_currents(self):
         """Calculate fault currents with transformer characteristics"""
@@ -853,21 +845,10 @@ class OvercurrentProtectionCalculator(QObject):
                 # Add earth fault settings if they exist
                 if self._i_pickup_51n > 0:
                     # Generate earth fault curve using similar timepoints but different pickup
-                    ef_currents = []
-                    ef_times = []
-                    # Use 20 points for a smooth curve
-                    for current_multiple in range(11, 210, 10):
-                        current = self._i_pickup_51n * current_multiple / 10
-                        # Use formula from TimeCurveCalculator based on curve type and time dial
-                        if self._curve_type_51n == "IEC Very Inverse":
-                            time = 13.5 * self._time_dial_51n / ((current / self._i_pickup_51n) - 1)
-                        elif self._curve_type_51n == "IEC Extremely Inverse":
-                            time = 80 * self._time_dial_51n / ((current / self._i_pickup_51n)**2 - 1)
-                        else:  # Standard/Normal Inverse as default
-                            time = 0.14 * self._time_dial_51n / ((current / self._i_pickup_51n)**0.02 - 1)
-                        
-                        ef_currents.append(current)
-                        ef_times.append(time)
+                    # Use 20 points for a smooth curve, standard inverse unless another curve is chosen
+                    ef_currents = self._i_pickup_51n * np.arange(11, 210, 10) / 10
+                    ef_curve = CURVES.get(self._curve_type_51n, CURVES["IEC Standard Inverse"])
+                    ef_times = curve_time(ef_curve, ef_currents, self._i_pickup_51n, self._time_dial_51n)
                     
                     plt.plot(ef_currents, ef_times, 'g-', linewidth=2, label=f'51N: {self._curve_type_51n}')
                     
@@ -2,6 +2,7 @@ from PySide6.QtCore import QObject, Property, Signal, Slot
 import os
 import sqlite3
 import math
+import numpy as np
 import sys
 import uuid
 import gc
@@ -14,8 +15,10 @@ import matplotlib.pyplot as plt
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from services.database_manager import DatabaseManager
 from services.data_store import DataStore
+from services.fuse_curve_index import FuseCurveIndex
 from services.logger_config import configure_logger
 from services.file_saver import FileSaver
+from models.protection.idmt import IEC_CURVES, curve_time, log_currents
 
 logger = configure_logger("qmltest", component="protection_relay")
 
@@ -48,12 +51,7 @@ class ProtectionRelayCalculator(QObject):
         self._curve_types = []
         
         # IEC Curve constants
-        self._curve_constants = {
-            "IEC Standard Inverse": {"a": 0.14, "b": 0.02},
-            "IEC Very Inverse": {"a": 13.5, "b": 1.0},
-            "IEC Extremely Inverse": {"a": 80.0, "b": 2.0},
-            "IEC Long Time Inverse": {"a": 120, "b": 1.0}
-        }
+        self._curve_constants = {f"IEC {name}": curve for name, curve in IEC_CURVES.items()}
         
         self._curve_points = []
         self._curve_type_names = list(self._curve_constants.keys())
@@ -63,6 +61,7 @@ class ProtectionRelayCalculator(QObject):
         
         # Get database instance instead of path
         self.db_manager = DatabaseManager.get_instance()
+        self.fuse_index = FuseCurveIndex.get_instance()
         
         # Create DataStore instance for persistent storage
         self.data_store = DataStore(parent)
@@ -147,19 +146,15 @@ class ProtectionRelayCalculator(QObject):
     def _load_device_data(self):
         """Load device data from SQLite database."""
         try:
-            conn = self.db_manager.connection
-            cursor = conn.cursor()
-            
             # Modified query to get only one entry per type with max breaking capacity
             try:
-                cursor.execute("""
+                self._device_types = self.db_manager.fetch_all("""
                     SELECT type, MAX(breaking_capacity) as breaking_capacity, 
                            curve_type, manufacturer
                     FROM circuit_breakers
                     GROUP BY type
                     ORDER BY type
-                """)
-                self._device_types = cursor.fetchall() or []
+                """) or []
                 logger.debug(f"Loaded {len(self._device_types)} device types")
             except sqlite3.Error as e:
                 self._device_types = []
@@ -167,12 +162,11 @@ class ProtectionRelayCalculator(QObject):
             
             # Load curve types with safe default
             try:
-                cursor.execute("""
+                db_curves = [row[0] for row in self.db_manager.fetch_all("""
                     SELECT DISTINCT curve_type 
                     FROM protection_curves 
                     WHERE curve_type IS NOT NULL
-                """)
-                db_curves = [row[0] for row in cursor.fetchall()]
+                """)]
                 self._curve_types = db_curves if db_curves else list(self._curve_constants.keys())
                 logger.debug(f"Loaded {len(self._curve_types)} curve types")
             except sqlite3.Error as e:
@@ -196,39 +190,26 @@ class ProtectionRelayCalculator(QObject):
         if self._pickup_current <= 0:
             return
             
-        # Get curve constants
-        constants = self._curve_constants.get(self._curve_type, 
-                                           self._curve_constants["IEC Standard Inverse"])
-        
-        # Calculate operating time for fault current
-        M = self._fault_current / self._pickup_current
-        
-        # Improved handling of edge cases
-        if M <= 1:
-            self._operating_time = float('inf')  # No trip for M <= 1
-        else:
-            self._operating_time = (constants["a"] * self._time_dial) / ((M ** constants["b"]) - 1)
-            
-        # Generate curve points with improved logarithmic resolution
-        self._curve_points = []
-        
-        # Use logarithmic scale for better curve representation
-        start = math.log10(1.1)  # Start at 1.1x pickup
-        end = math.log10(50)     # End at 50x pickup
-        
-        # Generate 20 points distributed logarithmically
-        for i in range(20):
-            log_current = start + (end - start) * i / 19
-            current = 10 ** log_current * self._pickup_current
-            
-            m = current / self._pickup_current
-            if m > 1:
-                t = (constants["a"] * self._time_dial) / ((m ** constants["b"]) - 1)
-                if t < 100:  # Limit to reasonable time values
-                    self._curve_points.append({"current": current, "time": t})
+        curve = self._curve_constants.get(self._curve_type,
+                                          self._curve_constants["IEC Standard Inverse"])
+
+        # Operating time for the fault current (inf at or below pickup)
+        self._operating_time = float(curve_time(curve, self._fault_current,
+                                                self._pickup_current, self._time_dial))
+        self._curve_points = self._curve_points_for(curve, self._pickup_current, self._time_dial)
         
         self.calculationsComplete.emit()
 
+    @staticmethod
+    def _curve_points_for(curve, pickup, time_dial):
+        """Chart points of a characteristic from 1.1x to 50x pickup, log spaced."""
+        currents = log_currents(1.1 * pickup, 50 * pickup, 20)
+        times = curve_time(curve, currents, pickup, time_dial)
+        # Limit to reasonable time values
+        keep = times < 100
+        return [{"current": float(current), "time": float(time)}
+                for current, time in zip(currents[keep], times[keep])]
+
     def _load_saved_settings(self):
         """Load saved settings from database table."""
         try:
@@ -403,27 +384,9 @@ class ProtectionRelayCalculator(QObject):
                 
                 curve_type = settings.get('curveType', "IEC Standard Inverse")
                 
-                # Get curve constants
-                constants = self._curve_constants.get(curve_type, 
-                                              self._curve_constants["IEC Standard Inverse"])
-                
-                # Generate curve points with improved resolution
-                curve_points = []
-                
-                # Use logarithmic scale for better curve representation
-                start = math.log10(1.1)  # Start at 1.1x pickup
-                end = math.log10(50)    # End at 50x pickup
-                
-                # Generate 20 points distributed logarithmically
-                for i in range(20):
-                    log_current = start + (end - start) * i / 19
-                    current = 10 ** log_current * pickup
-                    
-                    m = current / pickup
-                    if m > 1:
-                        t = (constants["a"] * td) / ((m ** constants["b"]) - 1)
-                        if t < 100:  # Limit to reasonable time values
-                            curve_points.append({"current": current, "time": t})
+                curve = self._curve_constants.get(curve_type,
+                                                  self._curve_constants["IEC Standard Inverse"])
+                curve_points = self._curve_points_for(curve, pickup, td)
                 
                 # Emit signal with the curve points
                 self.savedCurveReady.emit(curve_points)
@@ -437,9 +400,7 @@ class ProtectionRelayCalculator(QObject):
     def getDeviceRatings(self, device_type):
         """Get available ratings for device type."""
         try:
-            conn = self.db_manager.connection
-            cursor = conn.cursor()
-            cursor.execute("""
+            rows = self.db_manager.fetch_all("""
                 SELECT rating, model, description
                 FROM circuit_breakers
                 WHERE type = ?
@@ -450,7 +411,7 @@ class ProtectionRelayCalculator(QObject):
                 'rating': row[0],
                 'model': row[1],
                 'description': row[2]
-            } for row in cursor.fetchall()]
+            } for row in rows]
         except Exception as e:
             logger.error(f"Error getting device ratings: {e}")
             return []
@@ -459,9 +420,7 @@ class ProtectionRelayCalculator(QObject):
     def getUniqueDeviceRatings(self, device_type):
         """Get available ratings for device type without duplicates."""
         try:
-            conn = self.db_manager.connection
-            cursor = conn.cursor()
-            cursor.execute("""
+            rows = self.db_manager.fetch_all("""
                 SELECT DISTINCT rating, MIN(model) as model, MIN(description) as description
                 FROM circuit_breakers
                 WHERE type = ?
@@ -473,7 +432,7 @@ class ProtectionRelayCalculator(QObject):
                 'rating': row[0],
                 'model': row[1],
                 'description': row[2]
-            } for row in cursor.fetchall()]
+            } for row in rows]
         except Exception as e:
             logger.error(f"Error getting unique device ratings: {e}")
             return []
@@ -482,17 +441,13 @@ class ProtectionRelayCalculator(QObject):
     def getCurvePoints(self, device_type: str, rating: float) -> list:
         """Get protection curve points for device type and rating."""
         try:
-            conn = self.db_manager.connection
-            cursor = conn.cursor()
-            cursor.execute("""
+            points = self.db_manager.fetch_all("""
                 SELECT current_multiplier, tripping_time
                 FROM protection_curves 
                 WHERE device_type = ? AND rating = ? AND curve_type = ?
                 ORDER BY current_multiplier
             """, (device_type, rating, self._curve_type))
             
-            points = cursor.fetchall()
-            
             # Transform the points to actual current values based on the rating
             return [{
                 'current': row[0] * rating,  # Convert multiplier to actual current
@@ -520,30 +475,27 @@ class ProtectionRelayCalculator(QObject):
                               f"({min_capacity}-{max_capacity}A) for {device_type}")
                     return False
 
-            conn = self.db_manager.connection
-            cursor = conn.cursor()
-            
             logger.info(f"Updating breaking capacity for {device_type} to {breaking_capacity}A")
             
-            # First update breaking capacity
-            cursor.execute("""
-                UPDATE circuit_breakers 
-                SET breaking_capacity = ?
-                WHERE type = ?
-            """, (breaking_capacity, device_type))
+            # Both updates commit together, and the reference replica sees them
+            with self.db_manager.transaction():
+                # First update breaking capacity
+                self.db_manager.execute_query("""
+                    UPDATE circuit_breakers 
+                    SET breaking_capacity = ?
+                    WHERE type = ?
+                """, (breaking_capacity, device_type))
 
-            # Then update curve types in separate query
-            cursor.execute("""
-                UPDATE circuit_breakers 
-                SET curve_type = 
-                    CASE 
-                        WHEN breaking_capacity > 10000 THEN 'IEC Extremely Inverse'
-                        ELSE 'IEC Standard Inverse'
-                    END
-                WHERE type = ?
-            """, (device_type,))
-            
-            conn.commit()
+                # Then update curve types in separate query
+                self.db_manager.execute_query("""
+                    UPDATE circuit_breakers 
+                    SET curve_type = 
+                        CASE 
+                            WHEN breaking_capacity > 10000 THEN 'IEC Extremely Inverse'
+                            ELSE 'IEC Standard Inverse'
+                        END
+                    WHERE type = ?
+                """, (device_type,))
             
             # Force reload of data to refresh UI
             self._load_device_data()
@@ -851,22 +803,10 @@ class ProtectionRelayCalculator(QObject):
     def getFuseTypes(self, manufacturer="ABB"):
         """Get available fuse types for the specified manufacturer."""
         try:
-            query = """
-                SELECT DISTINCT fuse_type, series 
-                FROM fuse_curves 
-                WHERE manufacturer = ? 
-                ORDER BY fuse_type, series
-            """
-            results = self.db_manager.fetch_all(query, (manufacturer,))
-            
-            fuse_types = []
-            for row in results:
-                fuse_types.append({
-                    'type': row['fuse_type'],
-                    'series': row['series']
-                })
-            
-            return fuse_types
+            return [
+                {'type': fuse_type, 'series': series}
+                for fuse_type, series in self.fuse_index.fuse_types(manufacturer)
+            ]
         except Exception as e:
             logger.error(f"Error getting fuse types: {e}")
             return []
@@ -875,16 +815,7 @@ class ProtectionRelayCalculator(QObject):
     def getFuseRatings(self, fuse_type, manufacturer="ABB"):
         """Get available fuse ratings for the specified type and manufacturer."""
         try:
-            query = """
-                SELECT DISTINCT rating 
-                FROM fuse_curves 
-                WHERE fuse_type = ? AND manufacturer = ?
-                ORDER BY rating
-            """
-            results = self.db_manager.fetch_all(query, (fuse_type, manufacturer))
-            
-            ratings = [row['rating'] for row in results]
-            return ratings
+            return self.fuse_index.ratings(manufacturer, fuse_type)
         except Exception as e:
             logger.error(f"Error getting fuse ratings: {e}")
             return []
@@ -893,93 +824,36 @@ class ProtectionRelayCalculator(QObject):
     def getFuseCurveData(self, fuse_type, rating, manufacturer="ABB"):
         """Get fuse curve data for plotting."""
         try:
-            query = """
-                SELECT current_multiplier, melting_time, clearing_time, notes
-                FROM fuse_curves 
-                WHERE fuse_type = ? AND rating = ? AND manufacturer = ?
-                ORDER BY current_multiplier
-            """
-            results = self.db_manager.fetch_all(query, (fuse_type, rating, manufacturer))
-            
-            curve_data = []
-            for row in results:
-                current = rating * row['current_multiplier']
-                curve_data.append({
-                    'current': current,
-                    'melting_time': row['melting_time'],
-                    'clearing_time': row['clearing_time'] if row['clearing_time'] else row['melting_time'],
-                    'notes': row['notes'] or ''
-                })
-            
-            return curve_data
+            curve = self.fuse_index.curve(manufacturer, fuse_type, rating)
+            return curve.points() if curve else []
         except Exception as e:
             logger.error(f"Error getting fuse curve data: {e}")
             return []
     
-    @Slot(str, float, str, result=float)
+    @Slot(str, float, float, str, result=float)
     def getFuseMeltingTime(self, fuse_type, rating, current, manufacturer="ABB"):
-        """Calculate fuse melting time for a given current using interpolation."""
+        """Calculate fuse melting time for a given current by log-log interpolation."""
         try:
-            curve_data = self.getFuseCurveData(fuse_type, rating, manufacturer)
-            
-            if not curve_data:
+            time = self.fuse_index.melting_times(manufacturer, fuse_type, rating, current)
+            if time is None or not math.isfinite(time):
                 return 0.0
-            
-            # Find the appropriate curve points for interpolation
-            current_multiplier = current / rating
-            
-            # Sort by current multiplier
-            sorted_data = sorted(curve_data, key=lambda x: x['current'] / rating)
-            
-            # Find the bounding points
-            lower_point = None
-            upper_point = None
-            
-            for point in sorted_data:
-                point_multiplier = point['current'] / rating
-                if point_multiplier <= current_multiplier:
-                    lower_point = point
-                elif point_multiplier > current_multiplier and upper_point is None:
-                    upper_point = point
-                    break
-            
-            if lower_point is None and upper_point is None:
-                return 0.0
-            elif lower_point is None:
-                return upper_point['melting_time']
-            elif upper_point is None:
-                return lower_point['melting_time']
-            else:
-                # Linear interpolation in log-log space
-                x1 = lower_point['current'] / rating
-                y1 = lower_point['melting_time']
-                x2 = upper_point['current'] / rating
-                y2 = upper_point['melting_time']
-                
-                # Avoid log(0) by ensuring positive values
-                if x1 > 0 and x2 > 0 and y1 > 0 and y2 > 0:
-                    log_x1 = math.log10(x1)
-                    log_y1 = math.log10(y1)
-                    log_x2 = math.log10(x2)
-                    log_y2 = math.log10(y2)
-                    log_x = math.log10(current_multiplier)
-                    
-                    # Linear interpolation in log space
-                    if log_x2 != log_x1:
-                        log_y = log_y1 + (log_y - log_x1) * (log_y2 - log_y1) / (log_x2 - log_x1)
-                        return 10 ** log_y
-                    else:
-                        return y1
-                else:
-                    # Fall back to linear interpolation
-                    if x2 != x1:
-                        return y1 + (current_multiplier - x1) * (y2 - y1) / (x2 - x1)
-                    else:
-                        return y1
+            return float(time)
         except Exception as e:
             logger.error(f"Error calculating fuse melting time: {e}")
             return 0.0
     
+    @Slot(str, float, 'QVariantList', str, result='QVariantList')
+    def getFuseMeltingTimes(self, fuse_type, rating, currents, manufacturer="ABB"):
+        """Fuse melting times for a list of currents in one call (0.0 where unknown)."""
+        try:
+            times = self.fuse_index.melting_times(manufacturer, fuse_type, rating, np.asarray(currents, dtype=float))
+            if times is None:
+                return [0.0] * len(currents)
+            return np.where(np.isfinite(times), times, 0.0).tolist()
+        except Exception as e:
+            logger.error(f"Error calculating fuse melting times: {e}")
+            return []
+    
     @Slot(str, float, str, result=bool)
     def addFuseCurveToPlot(self, fuse_type, rating, manufacturer="ABB"):
         """Add a fuse curve to the current plot data."""
@@ -1,48 +1,55 @@
+import numpy as np
 from PySide6.QtCore import QObject
 
+from models.protection.idmt import IdmtCurve, curve_time, log_currents
+
 class TimeCurveCalculator(QObject):
+    MIN_OPERATING_TIME = 0.01  # Minimum time of 10ms
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._curve_coefficients = {
             "IEC": {
-                "Standard Inverse": {"a": 0.14, "b": 0.02},
-                "Very Inverse": {"a": 13.5, "b": 1.0},
-                "Extremely Inverse": {"a": 80.0, "b": 2.0},
-                "Long Time Inverse": {"a": 120.0, "b": 1.0}
+                "Standard Inverse": IdmtCurve(0.14, 0.02),
+                "Very Inverse": IdmtCurve(13.5, 1.0),
+                "Extremely Inverse": IdmtCurve(80.0, 2.0),
+                "Long Time Inverse": IdmtCurve(120.0, 1.0)
             },
             "ANSI": {
-                "Moderate Inverse": {"a": 0.0104, "b": 0.02},
-                "Inverse": {"a": 5.95, "b": 2.0},
-                "Very Inverse": {"a": 3.88, "b": 2.0},
-                "Extremely Inverse": {"a": 5.67, "b": 2.0}
+                "Moderate Inverse": IdmtCurve(0.0104, 0.02, 1.0),
+                "Inverse": IdmtCurve(5.95, 2.0, 1.0),
+                "Very Inverse": IdmtCurve(3.88, 2.0, 1.0),
+                "Extremely Inverse": IdmtCurve(5.67, 2.0, 1.0)
             }
         }
 
+    def get_curve(self, curve_type, standard):
+        """Curve constants for a standard and curve name, or None."""
+        if not curve_type or not standard:
+            return None
+        return self._curve_coefficients.get(standard, {}).get(curve_type)
+
+    def calculate_operating_times(self, curve_type, standard, current_multiples, time_dial):
+        """Vectorized operating times for an array of pickup multiples.
+
+        Returns a float array with nan where the relay does not operate, or
+        None for an unknown curve or a non-positive time dial.
+        """
+        curve = self.get_curve(curve_type, standard)
+        if curve is None or time_dial <= 0:
+            return None
+        times = curve_time(curve, current_multiples, 1.0, time_dial)
+        return np.where(np.isfinite(times), np.maximum(times, self.MIN_OPERATING_TIME), np.nan)
+
     def calculate_operating_time(self, curve_type, standard, current_multiple, time_dial):
         """Calculate relay operating time for given multiple of pickup"""
         try:
-            if not curve_type or not standard:
-                return None
-                
-            if standard not in self._curve_coefficients:
-                return None
-                
-            if curve_type not in self._curve_coefficients[standard]:
-                return None
-                
-            if current_multiple <= 1.0 or time_dial <= 0:
+            times = self.calculate_operating_times(curve_type, standard, current_multiple, time_dial)
+            if times is None or np.isnan(times):
                 return None
-                
-            coeff = self._curve_coefficients[standard][curve_type]
-            
-            if standard == "IEC":
-                time = time_dial * (coeff["a"] / ((current_multiple**coeff["b"]) - 1))
-            else:  # ANSI
-                time = time_dial * (coeff["a"] / ((current_multiple**coeff["b"]) - 1) + 1)
-            
-            return max(0.01, time)  # Minimum time of 10ms
-            
-        except (TypeError, ValueError, ZeroDivisionError):
+            return float(times)
+
+        except (TypeError, ValueError):
             return None
 
     def generate_curve_points(self, pickup_current, time_dial, curve_type, standard, 
@@ -57,24 +64,14 @@ class TimeCurveCalculator(QObject):
             if max_current is None or max_current <= min_current:
                 max_current = pickup_current * 20
             
-            current_points = []
-            time_points = []
-            
-            # Generate 100 points on logarithmic scale
-            ratio = (max_current/min_current)**(1/99)  # 100 points
-            current = min_current
-            
-            for _ in range(100):
-                multiple = current / pickup_current
-                time = self.calculate_operating_time(curve_type, standard, multiple, time_dial)
-                
-                if time is not None:
-                    current_points.append(float(current))
-                    time_points.append(float(time))
-                    
-                current *= ratio
-            
-            return current_points, time_points
+            # 100 points on logarithmic scale
+            currents = log_currents(min_current, max_current, 100)
+            times = self.calculate_operating_times(curve_type, standard, currents / pickup_current, time_dial)
+            if times is None:
+                return [], []
+
+            valid = ~np.isnan(times)
+            return currents[valid].tolist(), times[valid].tolist()
             
-        except (TypeError, ValueError, ZeroDivisionError):
+        except (TypeError, ValueError):
             return [], []
@@ -1,15 +1,19 @@
 from PySide6.QtCore import QObject, Property, Signal, Slot
 import math
 import cmath
+import numpy as np
 from datetime import datetime
 
 from utils.pdf.pdf_generator_grid_wind import PDFGenerator
 from services.logger_config import configure_logger
 from services.file_saver import FileSaver
+from models.protection.idmt import operating_time
 
 
 logger = configure_logger("qmltest", component="transformer_line")
 
+MIN_TRIP_TIME = 0.025  # Minimum 25ms operating time
+
 class TransformerLineCalculator(QObject):
     """Calculator for transformer-line system analysis including protection parameters"""
 
@@ -306,25 +310,22 @@ class TransformerLineCalculator(QObject):
     def _calculate_trip_time(self, current_multiple):
         """Calculate relay trip time based on curve type"""
         try:
-            if current_multiple <= 1.0:
-                return float('inf')  # Won't trip below pickup
-                
             curve = self._iec_curves.get(self._relay_curve_type)
             if not curve:
-                return 0.0
+                return 0.0 if current_multiple > 1.0 else float('inf')
             
-            # IEC standard formula implementation
-            numerator = curve["a"] * self._relay_time_dial
-            denominator = (current_multiple**curve["b"]) - 1
-            
-            # Add minimum operating time check
-            trip_time = numerator / denominator if denominator > 0 else float('inf')
-            return max(trip_time, 0.025)  # Minimum 25ms operating time
+            return float(self._trip_times(current_multiple, self._relay_time_dial, curve))
             
         except Exception as e:
             logger.error(f"Error calculating trip time: {e}")
             return 0.0
 
+    @staticmethod
+    def _trip_times(current_multiples, time_dial, curve):
+        """IEC trip times for one or many pickup multiples (inf below pickup)"""
+        times = operating_time(current_multiples, 1.0, time_dial, curve["a"], curve["b"])
+        return np.maximum(np.where(np.isnan(times), np.inf, times), MIN_TRIP_TIME)
+
     @Slot(float, result=float)
     def calculateTripTime(self, current_multiple):
         """Public method to calculate relay trip time"""
@@ -681,13 +682,8 @@ class TransformerLineCalculator(QObject):
             # Get curve parameters
             curve_params = self._iec_curves.get(self._relay_curve_type, {"a": 13.5, "b": 1.0})
             
-            # Calculate trip time based on curve formula
-            if multiple > 1.0:
-                numerator = curve_params["a"] * self._relay_time_dial
-                denominator = (multiple ** curve_params["b"]) - 1
-                self._trip_time_max_fault = max(numerator / max(denominator, 0.0001), 0.025)
-            else:
-                self._trip_time_max_fault = float('inf')  # No trip below pickup
+            # Calculate trip time based on curve formula (inf, no trip, below pickup)
+            self._trip_time_max_fault = float(self._trip_times(multiple, self._relay_time_dial, curve_params))
             
             # Calculate breaker duty factor (1.0 for 50Hz systems)
             self._breaker_duty_factor = 1.0
@@ -1224,17 +1220,10 @@ class TransformerLineCalculator(QObject):
     def calculateTripTimeWithParams(self, current_multiple, time_dial, curve_type):
         """Calculate trip time based on provided parameters"""
         try:
-            if current_multiple <= 1.0:
-                return float('inf')  # Won't trip below pickup
-                
             curve_params = self._iec_curves.get(curve_type, {"a": 13.5, "b": 1.0})
             
             # Formula: t = TD * A / ((I/Ip)^B - 1)
-            numerator = curve_params["a"] * time_dial
-            denominator = (current_multiple**curve_params["b"]) - 1
-            
-            trip_time = numerator / denominator if denominator > 0 else float('inf')
-            return max(trip_time, 0.025)  # Minimum 25ms operating time
+            return float(self._trip_times(current_multiple, time_dial, curve_params))
             
         except Exception as e:
             logger.error(f"Error calculating trip time with params: {e}")
@@ -28,6 +28,7 @@ from PySide6.QtQml import QmlElement
 
 try:
     from services.database_manager import DatabaseManager
+    from services.fuse_curve_index import FuseCurveIndex
 except ImportError:
     # Fallback if database manager is not available
     class DatabaseManager:
@@ -190,22 +191,13 @@ class WindTurbineProtectionTemplate(QObject):
                 # Return simulated data if database not available
                 return self._get_simulated_fuse_data(rating)
             
-            cursor = self.db_manager.connection.cursor()
-            cursor.execute("""
-                SELECT current_multiplier, melting_time 
-                FROM fuse_curves 
-                WHERE fuse_type = 'CEF' AND manufacturer = 'ABB' AND rating = ?
-                ORDER BY current_multiplier
-            """, (rating,))
-            
-            rows = cursor.fetchall()
-            
-            if not rows:
+            curve = FuseCurveIndex.get_instance().curve('ABB', 'CEF', rating)
+            if curve is None:
                 return self._get_simulated_fuse_data(rating)
             
             # Convert to list of dictionaries for QML consumption
             curve_points = []
-            for multiplier, time in rows:
+            for multiplier, time in zip(curve.multipliers.tolist(), curve.melting.tolist()):
                 curve_points.append({
                     "current_multiplier": multiplier,
                     "melting_time": time,
@@ -246,6 +238,18 @@ class WindTurbineProtectionTemplate(QObject):
     def interpolateTripTime(self, rating: float, current: float) -> float:
         """Interpolate trip time for given current and fuse rating."""
         try:
+            curve = None
+            if self.db_manager and self.db_manager.connection:
+                curve = FuseCurveIndex.get_instance().curve('ABB', 'CEF', rating)
+            if curve is not None:
+                multiplier = current / rating
+                # Extrapolation beyond the datasheet points, as for the simulated curve below
+                if multiplier < curve.multipliers[0]:
+                    return float(curve.melting[0]) * 10
+                if multiplier > curve.multipliers[-1]:
+                    return float(curve.melting[-1]) / 10
+                return float(curve.melting_time(current))
+            
             # Get curve data
             curve_json = self.getFuseCurveData(rating)
             curve_data = json.loads(curve_json)
@@ -654,15 +658,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         """Get list of available fuse ratings."""
         try:
             if self.db_manager and self.db_manager.connection:
-                cursor = self.db_manager.connection.cursor()
-                cursor.execute("""
-                    SELECT DISTINCT rating 
-                    FROM fuse_curves 
-                    WHERE fuse_type = 'CEF' AND manufacturer = 'ABB'
-                    ORDER BY rating
-                """)
-                
-                ratings = [row[0] for row in cursor.fetchall()]
+                ratings = FuseCurveIndex.get_instance().ratings('ABB', 'CEF')
                 return ratings if ratings else [16.0, 25.0, 40.0, 63.0, 100.0, 125.0, 160.0]
             else:
                 # Return standard ratings if database not available
@@ -1,5 +1,6 @@
-from PySide6.QtCore import QObject, Property, Signal, Slot, QPointF, QTimer, QThread, QMetaObject, Qt, Q_ARG
+from PySide6.QtCore import QObject, Property, Signal, Slot, QTimer, QThread, QMetaObject, Qt, Q_ARG
 from PySide6.QtWidgets import QApplication
+from PySide6.QtCharts import QXYSeries
 
 import numpy as np
 import math
@@ -11,29 +12,33 @@ import tempfile
 from services.logger_config import configure_logger
 from services.file_saver import FileSaver
 from services.calculation_cache import CalculationCache, generate_cache_key
-from services.worker_pool_manager import WorkerPoolManager, ManagedWorker
+from services.task_scheduler import TaskScheduler, PRIORITY_HIGH
+from utils.series_helper import replace_series_points
 
 
 logger = configure_logger("qmltest", component="harmonic_analysis")
 
-class CalculationWorker(ManagedWorker):
+class CalculationWorker:
     """Worker class to run calculations in a separate thread"""
     
     def __init__(self, calculator, params=None):
-        super().__init__(self._do_calculation)
         self.calculator = calculator
         self.params = params or {}
         
-    def _do_calculation(self):
+    def run(self, token=None):
         """Execute the calculation in a separate thread"""
         try:
+            # A newer request superseded this one before it started
+            if token is not None and token.cancelled:
+                return
+            
             # Check which calculation to run based on parameters
             if 'resolution' in self.params:
                 # Resolution calculation
                 points = self.params['resolution']
                 
                 # Check cache first
-                cache_key = generate_cache_key({"type": "resolution", "points": points})
+                cache_key = self.calculator._get_cache_key("harmonic_waveform", points)
                 cached_result = CalculationCache.get_instance().get(cache_key)
                 
                 if cached_result:
@@ -65,7 +70,7 @@ class CalculationWorker(ManagedWorker):
                         self.calculator._emit_pending = True
             else:
                 # Full calculation based on current harmonics
-                cache_key = self.calculator._get_cache_key()
+                cache_key = self.calculator._get_cache_key("harmonic_analysis")
                 
                 # Check cache to avoid duplicate work
                 cached_result = CalculationCache.get_instance().get(cache_key)
@@ -173,9 +178,9 @@ class HarmonicAnalysisCalculator(QObject):
         self._calculation_progress = 0.0
         self._cancel_requested = False
         
-        # Add thread pool for background calculations
-        self._thread_pool = WorkerPoolManager.get_instance()
-        logger.info(f"Using {self._thread_pool.maxThreadCount()} threads for calculations")
+        # Shared scheduler for background calculations
+        self._scheduler = TaskScheduler.get_instance()
+        logger.info(f"Using {self._scheduler.maxThreadCount()} threads for calculations")
         
         # Flag to track if updates are needed
         self._emit_pending = False
@@ -282,21 +287,28 @@ class HarmonicAnalysisCalculator(QObject):
         
         logger.info("Starting harmonic analysis calculation")
         
-        # Create a worker and start it in the thread pool
+        # Submit through the scheduler; a newer request supersedes a pending one
         worker = CalculationWorker(self)
-        self._thread_pool.start(worker)
+        self._scheduler.submit(worker.run, name="harmonic_analysis",
+                               priority=PRIORITY_HIGH, key=("harmonic_analysis", id(self)))
         return True
     
-    def _get_cache_key(self):
+    def _get_cache_key(self, kind, resolution=None):
         """Generate a unique key for the current harmonics configuration
         
+        Args:
+            kind: Payload type, so results of different shapes never share a key
+            resolution: Number of points; the stored resolution if None
+        
         Returns a string that uniquely identifies the current calculation state
         """
         # Use a tuple of sorted items for consistent key generation
         sorted_harmonics = sorted(self._harmonics_dict.items())
         return generate_cache_key({
+            'type': kind,
             'harmonics': [(order, float(magnitude), float(phase)) for order, (magnitude, phase) in sorted_harmonics],
-            'fundamental': float(self._fundamental)
+            'fundamental': float(self._fundamental),
+            'resolution': int(self._resolution if resolution is None else resolution)
         })
     
     def _calculate_full(self):
@@ -312,8 +324,7 @@ class HarmonicAnalysisCalculator(QObject):
                 return
             
             # Try memory cache first (faster than disk cache)
-            sorted_harmonics = sorted(self._harmonics_dict.items())
-            memory_key = str(sorted_harmonics) + str(self._fundamental)
+            memory_key = self._get_cache_key("harmonic_analysis")
             if memory_key in self._memory_cache:
                 logger.debug("Memory cache hit for harmonic calculation")
                 self._memory_cache_hits += 1
@@ -342,7 +353,7 @@ class HarmonicAnalysisCalculator(QObject):
                 return
             
             # Check disk cache
-            cache_key = self._get_cache_key()
+            cache_key = memory_key
             self._cache_lookups += 1
             cached_result = self._calculation_cache.get(cache_key)
             if cached_result:
@@ -439,17 +450,7 @@ class HarmonicAnalysisCalculator(QObject):
 
             numpoints = self._resolution  # Use stored resolution
             
-            # Cache key for resolution calculations
-            resolution_cache_key = generate_cache_key({"type": "resolution", "points": numpoints})
-            cached_resolution = self._calculation_cache.get(resolution_cache_key)
-            
-            if cached_resolution:
-                # Use cached time values
-                t = np.array(cached_resolution.get('time_values', []))
-            else:
-                # Generate new time values and cache them
-                t = np.linspace(0, 2*np.pi, numpoints)
-                self._calculation_cache.put(resolution_cache_key, {'time_values': t.tolist()})
+            t = np.linspace(0, 2*np.pi, numpoints)
             
             wave = np.zeros_like(t)  # Pre-allocate array
             
@@ -572,7 +573,8 @@ class HarmonicAnalysisCalculator(QObject):
             
             # Start a calculation with the new resolution
             worker = CalculationWorker(self, {'resolution': points})
-            self._thread_pool.start(worker)
+            self._scheduler.submit(worker.run, name="harmonic_resolution",
+                                   priority=PRIORITY_HIGH, key=("harmonic_resolution", id(self)))
             return True
         return False
     
@@ -636,10 +638,8 @@ class HarmonicAnalysisCalculator(QObject):
         return default
     
     def _generate_points_array(self, x_values, y_values):
-        """Convert numpy arrays to a list of QPointF for efficient plotting"""
-        # Optimize creation of points by avoiding unnecessary array conversion
-        if isinstance(y_values, list):
-            y_values = np.array(y_values)
+        """Convert numpy arrays to an (N, 2) array of x, y pairs for plotting"""
+        y_values = np.asarray(y_values, dtype=float)
         
         # Avoid recalculating if x_values are already in degrees
         if np.max(x_values) > 10:  # If already in degrees (larger than ~6.28)
@@ -648,8 +648,13 @@ class HarmonicAnalysisCalculator(QObject):
             # Map x values from radians to degrees for display
             x_degrees = np.degrees(x_values)
         
-        # Create list of QPointF objects efficiently using list comprehension
-        return [QPointF(float(x), float(y)) for x, y in zip(x_degrees, y_values)]
+        # Interleaved pairs are written straight into chart series by replace_series
+        return np.column_stack((x_degrees, y_values)).astype(float)
+
+    @staticmethod
+    def _as_points(points):
+        """Normalise stored points (array or cached list of pairs) to an (N, 2) array"""
+        return np.asarray(points, dtype=float).reshape(-1, 2)
     
     def batchUpdate(self):
         """Emit all signals at once to reduce update frequency with a small delay"""
@@ -777,8 +782,8 @@ class HarmonicAnalysisCalculator(QObject):
             
             # Prepare data for waveform chart
             waveform_data = {
-                'waveform_points': self._waveform_points,
-                'fundamental_points': self._fundamental_points,
+                'waveform_points': self._as_points(self._waveform_points).tolist(),
+                'fundamental_points': self._as_points(self._fundamental_points).tolist(),
                 'show_fundamental': show_fundamental,
                 'thd': self._thd,
                 'crest_factor': self._cf,
@@ -945,10 +950,6 @@ class HarmonicAnalysisCalculator(QObject):
         """Get phase angles for display harmonics."""
         return self._harmonic_phases
     
-    @Property(list, notify=calculationsComplete)
-    def waveformPoints(self):
-        return self._waveform_points
-    
     @Property(list)
     def waveform(self):
         """Get time-domain waveform points."""
@@ -964,7 +965,17 @@ class HarmonicAnalysisCalculator(QObject):
         """Get frequency spectrum points."""
         return self._spectrum
     
-    @Property(list)
-    def fundamentalPoints(self):
-        """Get fundamental waveform points as QPointF objects for efficient plotting"""
-        return self._fundamental_points
\ No newline at end of file
+    @Slot(QXYSeries, QXYSeries, result=float)
+    def fillWaveformSeries(self, waveform_series, fundamental_series):
+        """Fill the waveform and fundamental series directly from the point arrays
+        
+        Returns the largest magnitude of either waveform, for scaling the chart
+        """
+        waveform = self._as_points(self._waveform_points)
+        fundamental = self._as_points(self._fundamental_points)
+        replace_series_points(waveform_series, waveform)
+        replace_series_points(fundamental_series, fundamental)
+        
+        values = np.abs(np.concatenate((waveform[:, 1], fundamental[:, 1])))
+        values = values[np.isfinite(values)]
+        return float(values.max()) if values.size else 0.0
\ No newline at end of file
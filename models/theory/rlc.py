@@ -1,4 +1,4 @@
-from PySide6.QtCore import QObject, Slot, QPointF, Signal, Property, QUrl
+from PySide6.QtCore import QObject, Slot, Signal, Property, QUrl
 from PySide6.QtCharts import QXYSeries
 import numpy as np
 import tempfile
@@ -6,6 +6,7 @@ import os
 from datetime import datetime
 from services.file_saver import FileSaver
 from services.logger_config import configure_logger
+from utils.series_helper import replace_series
 
 
 logger = configure_logger("qmltest", component="rlc")
@@ -39,6 +40,8 @@ class RLCChart(QObject):
         self._axis_y_min = 0
         self._axis_y_max = None  # Change to None for initial state check
         self._formatted_points = []
+        self._gain_x = np.empty(0)  # Valid frequencies/gains, used to fill chart series
+        self._gain_y = np.empty(0)
         self._circuit_mode = self.SERIES_MODE  # Default to series mode
         self._quality_factor = 0.0  # Add Q factor
         self.generateChartData()
@@ -118,11 +121,8 @@ class RLCChart(QObject):
 
     @Slot(QXYSeries)
     def fill_series(self, series):
-        """Fill series with points using QPointF and replace"""
-        points = []
-        for point in self._formatted_points:
-            points.append(QPointF(point['x'], point['y']))
-        series.replace(points)
+        """Fill series straight from the gain arrays"""
+        replace_series(series, self._gain_x, self._gain_y)
 
     def generateChartData(self):
         if self._resistance > 0 and self._inductance > 0 and self._capacitance > 0:
@@ -177,15 +177,16 @@ class RLCChart(QObject):
                     self._quality_factor = self._resistance * np.sqrt(self._capacitance / self._inductance)
                 
                 # Create data points
-                valid_points = []
-                for f, g in zip(frequencies, gain):
-                    if not (np.isnan(g) or np.isinf(g)):
-                        valid_points.append([float(f), float(g)])
+                valid = np.isfinite(gain)
+                gain_x = frequencies[valid]
+                gain_y = gain[valid]
 
-                if valid_points:
-                    self._chart_data = valid_points
-                    self._formatted_points = [{"x": p[0], "y": p[1]} for p in valid_points]
-                    max_gain = max(p[1] for p in valid_points)
+                if len(gain_y) > 0:
+                    self._gain_x = gain_x
+                    self._gain_y = gain_y
+                    self._chart_data = np.column_stack((gain_x, gain_y)).tolist()
+                    self._formatted_points = [{"x": x, "y": y} for x, y in self._chart_data]
+                    max_gain = float(gain_y.max())
                     
                     # Always update Y axis scale
                     self._axis_y_max = max_gain * 1.1
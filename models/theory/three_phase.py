@@ -1,4 +1,4 @@
-from PySide6.QtCore import Slot, Signal, Property, QObject, QPointF
+from PySide6.QtCore import Slot, Signal, Property, QObject
 from PySide6.QtCharts import QXYSeries
 import numpy as np
 import matplotlib
@@ -10,6 +10,7 @@ import tempfile
 from datetime import datetime
 from services.file_saver import FileSaver
 from services.logger_config import configure_logger
+from utils.series_helper import replace_series
 
 logger = configure_logger("qmltest", component="three_phase")
 
@@ -86,24 +87,12 @@ class ThreePhaseSineWaveModel(QObject):
             seriesB: Series for phase B
             seriesC: Series for phase C
         """
-        seriesA.clear();seriesB.clear();seriesC.clear()
-
-        pointsA,pointsB,pointsC = [],[],[]
-        
         # Scale x-axis to milliseconds
         time_points = np.linspace(0, 1000, len(self._y_values_a))  # 0 to 1000ms
-        
-        for i in range(len(self._y_values_a)):
-            yA,yB,yC = self._y_values_a[i],self._y_values_b[i],self._y_values_c[i]
-            x = time_points[i]  # Use time in milliseconds for x-axis
-
-            pointsA.append(QPointF(x, yA))
-            pointsB.append(QPointF(x, yB))
-            pointsC.append(QPointF(x, yC))
 
-        seriesA.replace(pointsA)
-        seriesB.replace(pointsB)
-        seriesC.replace(pointsC)
+        replace_series(seriesA, time_points, self._y_values_a)
+        replace_series(seriesB, time_points, self._y_values_b)
+        replace_series(seriesC, time_points, self._y_values_c)
     
     def _get_cache_key(self) -> tuple:
         """Generate a unique cache key based on current wave parameters.
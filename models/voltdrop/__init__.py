@@ -1,14 +1,21 @@
-from .voltage_drop_orion import VoltageDropCalculator
-from .table_model import VoltageDropTableModel
-from utils.pdf.pdf_generator_volt_drop import PDFGenerator
-from services.data_store import DataStore
-from services.voltage_drop_service import VoltageDropService
+# The main window registers ResultsManager from this package at startup, so
+# the calculator, PDF generator and services are imported on first access
+# rather than with the package
+_EXPORTS = {
+    'VoltageDropCalculator': ('.voltage_drop_orion', 'VoltageDropCalculator'),
+    'VoltageDropTableModel': ('.table_model', 'VoltageDropTableModel'),
+    'PDFGenerator': ('utils.pdf.pdf_generator_volt_drop', 'PDFGenerator'),
+    'DataStore': ('services.data_store', 'DataStore'),
+    'VoltageDropService': ('services.voltage_drop_service', 'VoltageDropService'),
+}
 
 # Define what should be exposed when using `from voltdrop import *`
-__all__ = [
-    'VoltageDropCalculator',
-    'VoltageDropTableModel',
-    'PDFGenerator',
-    'DataStore',
-    'VoltageDropService'
-]
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        import importlib
+        module, attribute = _EXPORTS[name]
+        return getattr(importlib.import_module(module, __name__), attribute)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
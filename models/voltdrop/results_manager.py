@@ -1,5 +1,4 @@
-from PySide6.QtCore import QObject, Signal, Property, Slot, QAbstractTableModel, Qt
-import pandas as pd
+from PySide6.QtCore import QObject, Signal, Property, Slot, QAbstractTableModel, QModelIndex, Qt
 from dataclasses import dataclass
 from typing import Dict, Any
 from services.logger_config import configure_logger
@@ -13,9 +12,28 @@ class CalculationResult:
     timestamp: str
 
 class ResultsTableModel(QAbstractTableModel):
-    def __init__(self, parent=None):
+    """Calculation history, newest first, fetched a page at a time.
+
+    Views call canFetchMore/fetchMore as they scroll towards the end, and each
+    page is requested with keyset pagination from the page loader. Cell text
+    is formatted once per fetched page, so data() is a plain lookup.
+    """
+
+    PAGE_SIZE = 200
+
+    def __init__(self, page_loader=None, parent=None):
+        """
+        Args:
+            page_loader: Callable(after, limit) returning history rows newest
+                first, where after is the (timestamp, id) of the last row
+                already loaded or None
+        """
         super().__init__(parent)
-        self._data = pd.DataFrame()
+        self._page_loader = page_loader
+        self._rows = []
+        self._row_ids = []
+        self._last_key = None
+        self._exhausted = True
         self._headers = [
             'Date/Time',
             'System',
@@ -28,21 +46,18 @@ class ResultsTableModel(QAbstractTableModel):
             'Drop %'
         ]
 
-    def rowCount(self, parent=None):
-        return len(self._data)
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
 
-    def columnCount(self, parent=None):
-        return len(self._headers)
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
 
     def data(self, index, role=Qt.DisplayRole):
         if not index.isValid():
             return None
 
         if role == Qt.DisplayRole:
-            value = self._data.iloc[index.row(), index.column()]
-            if isinstance(value, float):
-                return f"{value:.1f}"
-            return str(value)
+            return self._rows[index.row()][index.column()]
 
         if role == Qt.TextAlignmentRole:
             return Qt.AlignCenter
@@ -52,11 +67,90 @@ class ResultsTableModel(QAbstractTableModel):
             return self._headers[section]
         return None
 
-    def update_data(self, df):
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        page = self._load_page()
+        if not page:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._append_page(page)
+        self.endInsertRows()
+
+    def reload(self):
+        """Drop loaded rows and fetch the first page again."""
         self.beginResetModel()
-        self._data = df
+        self._rows = []
+        self._row_ids = []
+        self._last_key = None
+        self._exhausted = self._page_loader is None
+        if not self._exhausted:
+            self._append_page(self._load_page())
         self.endResetModel()
 
+    def clear(self):
+        """Show an empty history."""
+        self.beginResetModel()
+        self._rows = []
+        self._row_ids = []
+        self._last_key = None
+        self._exhausted = True
+        self.endResetModel()
+
+    def row_id(self, row):
+        """Database id of a loaded row, or None if out of range."""
+        if 0 <= row < len(self._row_ids):
+            return self._row_ids[row]
+        return None
+
+    def remove_row(self, row):
+        """Remove a loaded row without refetching."""
+        if not 0 <= row < len(self._rows):
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        del self._row_ids[row]
+        self.endRemoveRows()
+
+    def _load_page(self):
+        page = self._page_loader(self._last_key, self.PAGE_SIZE)
+        if len(page) < self.PAGE_SIZE:
+            self._exhausted = True
+        return page
+
+    def _append_page(self, page):
+        if not page:
+            return
+        self._rows.extend(self._format_row(row) for row in page)
+        self._row_ids.extend(row['id'] for row in page)
+        self._last_key = (page[-1]['timestamp'], page[-1]['id'])
+
+    @staticmethod
+    def _format_row(row):
+        """Display strings for one calculation_history row."""
+        def text(value):
+            if value is None:
+                return ""
+            if isinstance(value, float):
+                return f"{value:.1f}"
+            return str(value)
+
+        return (
+            text(row['timestamp']),
+            text(row['voltage_system']),
+            text(row['total_kva']),
+            text(row['num_houses']),
+            f"{text(row['cable_size'])}mm² {text(row['conductor'])} {text(row['core_type'])}",
+            text(row['length']),
+            text(row['current']),
+            text(row['voltage_drop']),
+            text(row['drop_percent']),
+        )
+
 class ResultsManager(QObject):
     """Manages calculation results for the application."""
     
@@ -67,8 +161,6 @@ class ResultsManager(QObject):
         super().__init__(parent)
         self._results = {}
         self._voltage_drop_threshold = 5.0  # Default 5%
-        self._results_df = pd.DataFrame()
-        self._table_model = ResultsTableModel(self)
         self._storage_columns = [
             'timestamp',
             'voltage_system',
@@ -89,6 +181,7 @@ class ResultsManager(QObject):
         # Initialize DataStore for SQL storage
         from services.data_store import DataStore
         self._data_store = DataStore(parent)
+        self._table_model = ResultsTableModel(self._data_store.get_calculation_page, self)
         
         # Load initial data from SQL storage
         self._load_saved_results()
@@ -97,37 +190,15 @@ class ResultsManager(QObject):
         self._calculation_history = []
 
     def _load_saved_results(self):
-        """Load existing results from SQL storage."""
+        """Load the first page of results from SQL storage."""
         try:
-            # Get data from DataStore
-            df = self._data_store.get_calculation_history()
-            
-            if not df.empty:
-                # Format data for display
-                display_df = pd.DataFrame({
-                    'Date/Time': df['timestamp'],
-                    'System': df['voltage_system'],
-                    'Load (kVA)': df['total_kva'],
-                    'Houses': df['num_houses'],
-                    'Cable': df['cable_size'].astype(str) + 'mm² ' + df['conductor'] + ' ' + df['core_type'],
-                    'Length (m)': df['length'],
-                    'Current (A)': df['current'],
-                    'V-Drop (V)': df['voltage_drop'],
-                    'Drop %': df['drop_percent']
-                })
-            else:
-                display_df = pd.DataFrame(columns=self._table_model._headers)
-            
-            self._results_df = display_df
-            self._table_model.update_data(display_df)
+            self._table_model.reload()
             self.resultsChanged.emit()
-            logger.info(f"Loaded {len(display_df)} results from SQL storage")
+            logger.info(f"Loaded {self._table_model.rowCount()} results from SQL storage")
             
         except Exception as e:
             logger.error(f"Error loading results from SQL: {str(e)}")
-            display_df = pd.DataFrame(columns=self._table_model._headers)
-            self._results_df = display_df
-            self._table_model.update_data(display_df)
+            self._table_model.clear()
 
     @Slot()
     def refresh_results(self):
@@ -143,17 +214,14 @@ class ResultsManager(QObject):
     def removeResult(self, index):
         """Remove a result by index from SQL storage."""
         try:
-            if 0 <= index < len(self._results_df):
-                # Get timestamp of record to delete
-                timestamp = self._results_df.iloc[index]['Date/Time']
-                
+            calculation_id = self._table_model.row_id(index)
+            if calculation_id is not None:
                 # Delete from SQL storage
-                cursor = self._data_store._connection.cursor()
-                cursor.execute("DELETE FROM calculation_history WHERE timestamp = ?", (timestamp,))
-                self._data_store._connection.commit()
+                self._data_store.delete_calculation(calculation_id)
                 
-                # Refresh display
-                self._load_saved_results()
+                # Update display without refetching
+                self._table_model.remove_row(index)
+                self.resultsChanged.emit()
                 logger.info(f"Removed result at index {index} from SQL storage")
             else:
                 logger.warning(f"Index {index} out of range")
@@ -170,9 +238,7 @@ class ResultsManager(QObject):
             
             if success:
                 # Update display
-                display_df = pd.DataFrame(columns=self._table_model._headers)
-                self._results_df = display_df
-                self._table_model.update_data(display_df)
+                self._table_model.clear()
                 self.resultsChanged.emit()
                 logger.info("Cleared all calculation history")
                 return True
@@ -333,6 +399,7 @@ class ResultsManager(QObject):
                     return False
             
             # Convert to DataFrame
+            import pandas as pd
             df = pd.DataFrame(self._calculation_history)
             
             # Save to CSV
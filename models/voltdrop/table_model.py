@@ -12,6 +12,7 @@ class VoltageDropTableModel(QAbstractTableModel):
             'Cores', 
             'mV/A/m', 
             'Rating', 
+            'Derated', 
             'V-Drop', 
             'Drop %', 
             'Status'
@@ -30,13 +31,13 @@ class VoltageDropTableModel(QAbstractTableModel):
         if role == Qt.DisplayRole:
             value = self._data[index.row()][index.column()]
             if isinstance(value, float):
-                if index.column() == 6:  # Drop % column
+                if index.column() == 7:  # Drop % column
                     return f"{value:.1f}%"
                 return f"{value:.1f}"
             return str(value)
             
-        if role == Qt.BackgroundRole and index.column() == 7:
-            status = self._data[index.row()][6]  # Drop %
+        if role == Qt.BackgroundRole and index.column() == 8:
+            status = self._data[index.row()][7]  # Drop %
             if status > 5:
                 return Qt.red
             return Qt.green
@@ -471,7 +471,7 @@ class VoltageDropCalculator(QObject):
             
             # Create data structure for FileSaver
             headers = ['Size (mm²)', 'Material', 'Cores', 'mV/A/m', 'Rating (A)', 
-                      'Voltage Drop (V)', 'Drop (%)', 'Status']
+                      'Derated (A)', 'Voltage Drop (V)', 'Drop (%)', 'Status']
             data = {
                 'data': rows,
                 'headers': headers
@@ -599,7 +599,7 @@ class VoltageDropCalculator(QObject):
             table_data = {
                 'data': self._table_model._data,
                 'headers': ['Size (mm²)', 'Material', 'Cores', 'mV/A/m', 'Rating (A)', 
-                          'Voltage Drop (V)', 'Drop (%)', 'Status']
+                          'Derated (A)', 'Voltage Drop (V)', 'Drop (%)', 'Status']
             }
             
             # Create metadata for PDF
@@ -634,80 +634,68 @@ class VoltageDropCalculator(QObject):
     def _calculate_voltage_drop(self):
         """Calculate voltage drop using mV/A/m method."""
         try:
-            
-            logger.info("\n=== Starting Voltage Drop Calculations ===")
-            logger.info(f"Input Parameters:")
-            logger.info(f"• Current: {self._current:.2f} A")
-            logger.info(f"• Length: {self._length:.2f} m")
-            logger.info(f"• Installation Method: {self._installation_method}")
-            logger.info(f"• Temperature: {self._temperature:.1f}°C")
-            logger.info(f"• Grouping Factor: {self._grouping_factor:.2f}")
+            logger.debug(
+                f"Voltage drop inputs: current={self._current:.2f} A, length={self._length:.2f} m, "
+                f"method={self._installation_method}, temp={self._temperature:.1f}°C, "
+                f"grouping={self._grouping_factor:.2f}"
+            )
 
             if self._current <= 0 or self._length <= 0 or self._selected_cable is None:
-                logger.info("Invalid input parameters, skipping calculation")
+                logger.debug("Invalid input parameters, skipping calculation")
                 return
 
-            # Get cable data and calculate for all sizes
+            # Get cable data and calculate for all sizes in a single array pass
             cable_data = self._data_manager.get_cable_data(
                 self._conductor_material, self._core_type
             )
-            
-            table_data = []
-            for _, cable in cable_data.iterrows():
-                v_drop = self._data_manager.calculate_voltage_drop(
-                    self._current, self._length, cable,
-                    self._temperature, self._installation_method,
-                    self._grouping_factor, self._admd_enabled,
-                    self._admd_factor, self._voltage
+
+            results = self._data_manager.calculate_voltage_drop_table(
+                self._current, self._length, cable_data,
+                self._temperature, self._installation_method,
+                self._grouping_factor, self._admd_enabled,
+                self._admd_factor, self._voltage
+            )
+            if results is None:
+                return
+
+            table_data = [
+                [size, self._conductor_material, self._core_type, mv_per_am,
+                 max_current, derated, v_drop, drop_percent, status]
+                for size, mv_per_am, max_current, derated, v_drop, drop_percent, status in zip(
+                    results['size'].tolist(),
+                    results['mv_per_am'].tolist(),
+                    results['max_current'].tolist(),
+                    results['derated_rating'].tolist(),
+                    results['voltage_drop'].tolist(),
+                    results['drop_percent'].tolist(),
+                    results['status'].tolist()
                 )
-                
-                drop_percent = (v_drop / self._voltage) * 100
-                status = "OK"
-                if drop_percent > 7.0:
-                    status = "SEVERE"
-                elif drop_percent > 5.0:
-                    status = "WARNING"
-                elif drop_percent > 2.0:
-                    status = "SUBMAIN"
-                    
-                logger.info(f"\nCable Size {float(cable['size'])} mm²:")
-                logger.info(f"• mV/A/m: {cable['mv_per_am']}")
-                logger.info(f"• Rating: {cable['max_current']} A")
-                logger.info(f"• Voltage Drop: {v_drop:.2f} V ({drop_percent:.2f}%)")
-                logger.info(f"• Status: {status}")
-                
-                table_data.append([
-                    float(cable['size']),
-                    self._conductor_material,
-                    self._core_type,
-                    cable['mv_per_am'],
-                    cable['max_current'],
-                    v_drop,
-                    drop_percent,
-                    status
-                ])
+            ]
 
             self._table_model.update_data(table_data)
             self.tableDataChanged.emit()
-            
-            # Calculate selected cable voltage drop
-            if self._selected_cable is not None:
-                v_drop = self._data_manager.calculate_voltage_drop(
+
+            # Selected cable result comes from the same pass - no extra lookups
+            selected_size = self._selected_cable['size']
+            if isinstance(selected_size, pd.Series):
+                selected_size = selected_size.iloc[0]
+            matches = (results['size'] == float(selected_size)).nonzero()[0]
+            if len(matches):
+                self._voltage_drop = float(results['voltage_drop'][matches[0]])
+            else:
+                self._voltage_drop = self._data_manager.calculate_voltage_drop(
                     self._current, self._length, self._selected_cable,
                     self._temperature, self._installation_method,
                     self._grouping_factor, self._admd_enabled,
                     self._admd_factor, self._voltage
                 )
-                self._voltage_drop = v_drop
-                self.voltageDropCalculated.emit(self._voltage_drop)
-                
-                logger.info(f"\nSelected Cable Results:")
-                logger.info(f"• Size: {float(self._selected_cable['size'])} mm²")
-                logger.info(f"• Final Voltage Drop: {v_drop:.2f} V")
-                logger.info(f"• Drop Percentage: {(v_drop / self._voltage * 100):.2f}%")
-            
-            logger.info("\n=== Voltage Drop Calculations Complete ===\n")
-            
+            self.voltageDropCalculated.emit(self._voltage_drop)
+
+            logger.debug(
+                f"Selected cable {float(selected_size)} mm²: {self._voltage_drop:.2f} V "
+                f"({(self._voltage_drop / self._voltage * 100):.2f}%)"
+            )
+
         except Exception as e:
             logger.error(f"Error calculating voltage drops: {e}")
             logger.exception(e)
@@ -360,6 +360,74 @@ Item {
                                     }
                                 }
 
+                                Label {
+                                    text: "Auto Grading: "
+                                    visible: safeCalculatorProperty("relayCount", 0) >= 2
+                                }
+
+                                StyledButton {
+                                    text: "Optimize TDS"
+                                    visible: safeCalculatorProperty("relayCount", 0) >= 2
+
+                                    ToolTip.text: "Set the lowest TDS on each relay that keeps the margin at every fault level"
+                                    ToolTip.visible: hovered
+                                    ToolTip.delay: 500
+
+                                    onClicked: {
+                                        if (isDestructing || !calculator) return
+                                        calculator.optimizeGrading(gradePickups.checked)
+                                        calculator.applyGrading()
+                                    }
+                                }
+
+                                CheckBox {
+                                    id: gradePickups
+                                    text: "Pickups"
+                                    checked: false
+                                    visible: safeCalculatorProperty("relayCount", 0) >= 2
+
+                                    ToolTip.text: "Also raise pickups where that clears the highest fault faster"
+                                    ToolTip.visible: hovered
+                                    ToolTip.delay: 500
+                                }
+
+                                Label {
+                                    Layout.columnSpan: 3
+                                    Layout.fillWidth: true
+                                    wrapMode: Text.WordWrap
+                                    visible: text !== ""
+                                    text: {
+                                        let results = safeCalculatorProperty("gradingResults", []) || []
+                                        return results.filter(r => r.binding_relay).map(r =>
+                                            r.name + ": TDS " + r.tds.toFixed(3) +
+                                            ", binding at " + r.binding_fault_current.toFixed(0) + " A (" +
+                                            r.binding_margin.toFixed(2) + "s over " + r.binding_relay + ")" +
+                                            (r.feasible ? "" : " - margin not reachable")
+                                        ).join("\n")
+                                    }
+                                }
+
+                                Label {
+                                    text: "Continuous Sweep: "
+                                    visible: safeCalculatorProperty("relayCount", 0) >= 2
+                                }
+
+                                CheckBox {
+                                    Layout.columnSpan: 2
+                                    checked: safeCalculatorProperty("continuousSweep", false)
+                                    visible: safeCalculatorProperty("relayCount", 0) >= 2
+
+                                    ToolTip.text: "Also check margins between fault levels and find where curves cross"
+                                    ToolTip.visible: hovered
+                                    ToolTip.delay: 500
+
+                                    onToggled: {
+                                        if (!isDestructing && calculator) {
+                                            calculator.continuousSweep = checked
+                                        }
+                                    }
+                                }
+
                                 Label {
                                     text: "Export Data: "
                                     visible: safeCalculatorProperty("relayCount", 0) >= 2
@@ -759,6 +827,24 @@ Item {
                                                     Universal.theme === Universal.Dark ? "#ff8080" : "red"
                                             }
                                         }
+
+                                        Repeater {
+                                            model: (resultData && resultData.sweep) ? resultData.sweep.violations : []
+                                            delegate: Text {
+                                                required property var modelData
+                                                text: "  " + modelData.start.toFixed(1) + "-" + modelData.end.toFixed(1) + "A: " +
+                                                      "worst " + modelData.worst_margin.toFixed(2) + "s at " +
+                                                      modelData.worst_current.toFixed(1) + "A ✗"
+                                                color: Universal.theme === Universal.Dark ? "#ff8080" : "red"
+                                            }
+                                        }
+
+                                        Text {
+                                            visible: !!(resultData && resultData.sweep && resultData.sweep.crossings.length > 0)
+                                            text: visible ? "  Curves cross at " +
+                                                  resultData.sweep.crossings.map(c => c.toFixed(1) + "A").join(", ") : ""
+                                            color: Universal.foreground
+                                        }
                                     }
                                 }
                             }
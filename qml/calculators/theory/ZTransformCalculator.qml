@@ -628,6 +628,8 @@ Item {
                                 waveletType: displayOptionsCombo.currentText
                                 darkMode: Universal.theme === Universal.Dark
                                 textColor: zTransformCard.textColor
+
+                                calculator: z_calculator
                             }
                         }
                     }
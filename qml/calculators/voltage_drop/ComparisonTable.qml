@@ -15,6 +15,7 @@ Item {
         "Cores", 
         "mV/A/m", 
         "Rating (A)", 
+        "Derated (A)", 
         "V-Drop (V)", 
         "Drop %", 
         "Status"
@@ -29,9 +30,10 @@ Item {
             case 2: return 100  // Cores
             case 3: return 100  // mV/A/m
             case 4: return 120  // Rating
-            case 5: return 120  // V-Drop
-            case 6: return 100  // Drop %
-            case 7: return 100  // Status
+            case 5: return 120  // Derated rating
+            case 6: return 120  // V-Drop
+            case 7: return 100  // Drop %
+            case 8: return 100  // Status
             default: return 100
         }
     }
@@ -156,7 +158,7 @@ Item {
                     implicitWidth: root.getColumnWidth(column)
                     implicitHeight: 40
                     color: {
-                        if (column === 7) {  // Status column
+                        if (column === 8) {  // Status column
                             switch(model.display) {
                                 case "SEVERE": return "#ffebee"  // Red background
                                 case "WARNING": return "#fff3e0"  // Orange background
@@ -174,7 +176,7 @@ Item {
                         anchors.margins: 8
                         text: model.display
                         color: {
-                            if (column === 7) {  // Status column
+                            if (column === 8) {  // Status column
                                 switch(model.display) {
                                     case "SEVERE": return "#c62828"  // Dark red
                                     case "WARNING": return "#ef6c00"  // Dark orange
@@ -185,7 +187,7 @@ Item {
                             }
                             return darkMode ? "#ffffff" : "#000000"
                         }
-                        font.bold: column === 7  // Status column
+                        font.bold: column === 8  // Status column
                         verticalAlignment: Text.AlignVCenter
                     }
                 }
@@ -389,17 +389,10 @@ Item {
     }
 
     function updateTimeDomainChart() {
-        let timePoints = [];
-
-        if (!timeDomain || timeDomain.length === 0) {
+        if (!calculator || !timeDomain || timeDomain.length === 0) {
             return;
         }
 
-        let minY = Number.MAX_VALUE;
-        let maxY = -Number.MAX_VALUE;
-        let maxX = 0;
-        let pointsAdded = 0;
-        
         try {
             let stride = 1;
             if (highPerformanceMode) {
@@ -411,125 +404,37 @@ Item {
                     stride = Math.max(1, Math.floor(timeDomain.length / 500));
                 }
             }
-            
-            if (timeDomain.length > 0) {
-                if (typeof timeDomain[0] === 'object' && 'x' in timeDomain[0] && 'y' in timeDomain[0]) {
-                    for (let i = 0; i < timeDomain.length; i += stride) {
-                        let point = timeDomain[i];
-                        
-                        if (point && isFinite(point.x) && isFinite(point.y)) {
-                            timePoints.push({ x: point.x, y: point.y });
-                            minY = Math.min(minY, point.y);
-                            maxY = Math.max(maxY, point.y);
-                            maxX = Math.max(maxX, point.x);
-                            pointsAdded++;
-                        }
-                    }
-                } 
-                else if (Array.isArray(timeDomain[0])) {
-                    for (let i = 0; i < timeDomain.length; i += stride) {
-                        let point = timeDomain[i];
-                        
-                        if (point && point.length >= 2 && 
-                            isFinite(point[0]) && isFinite(point[1])) {
-                            
-                            timePoints.push({ x: point[0], y: point[1] });
-                            
-                            minY = Math.min(minY, point[1]);
-                            maxY = Math.max(maxY, point[1]);
-                            maxX = Math.max(maxX, point[0]);
-                            pointsAdded++;
-                        }
-                    }
-                }
-                else if (typeof timeDomain[0] === 'number') {
-                    for (let i = 0; i < timeDomain.length; i += stride) {
-                        let y = timeDomain[i];
-                        
-                        if (isFinite(y)) {
-                            timePoints.push({ x: i / 20, y: y });
-                            
-                            minY = Math.min(minY, y);
-                            maxY = Math.max(maxY, y);
-                            pointsAdded++;
-                        }
-                    }
-                    
-                    maxX = (timeDomain.length - 1) / 20;
-                }
-            }
 
-            if (isFinite(minY) && isFinite(maxY) && minY !== Number.MAX_VALUE && pointsAdded > 0) {
+            // The series is filled in Python straight from the signal arrays
+            let signal = calculator.fillTimeDomainSeries(timeSeries, stride);
+
+            if (signal.count > 0) {
                 timeAxisX.min = 0;
-                timeAxisX.max = maxX > 0 ? maxX : 5;
+                timeAxisX.max = signal.maxX > 0 ? signal.maxX : 5;
 
-                const yRange = Math.max(Math.abs(minY), Math.abs(maxY)) * 1.2;
+                const yRange = signal.maxAbsY * 1.2;
                 timeAxisY.min = -yRange || -2;
                 timeAxisY.max = yRange || 2;
-
-                timeSeries.clear();
-
-                for (let i = 0; i < timePoints.length; i++) {
-                    timeSeries.append(timePoints[i].x, timePoints[i].y);
-                }
             }
         } catch (e) {
         }
     }
     
     function updateTransformChart() {
-        let magnitudePoints = [];
-        let phasePoints = [];
-        let resonancePoints = [];
-
-        if (!transformResult || transformResult.length === 0) return;
-
-        let maxMagnitude = 0;
-        let maxFreq = 0;
+        if (!calculator || !transformResult || transformResult.length === 0) return;
 
         let stride = highPerformanceMode && transformResult.length > 1000 ? Math.floor(transformResult.length / 500) : 1;
 
-        for (let i = 0; i < transformResult.length; i += stride) {
-            if (i < frequencies.length) {
-                let freq = frequencies[i];
-                let magnitude = transformResult[i];
-
-                if (isFinite(freq) && isFinite(magnitude)) {
-                    magnitudePoints.push({ x: freq, y: magnitude });
-                    maxMagnitude = Math.max(maxMagnitude, magnitude);
-                    maxFreq = Math.max(maxFreq, freq);
-                }
-
-                if (phaseResult && i < phaseResult.length) {
-                    let phase = phaseResult[i];
-                    if (isFinite(freq) && isFinite(phase)) {
-                        phasePoints.push({ x: freq, y: phase });
-                    }
-                }
-            }
-        }
+        // Magnitude and phase are filled in Python straight from the result arrays
+        let spectrum = calculator.fillTransformSeries(magnitudeSeries, phaseSeries, stride);
+        let maxMagnitude = spectrum.maxMagnitude;
+        let maxFreq = spectrum.maxFrequency;
 
         if (isFinite(maxMagnitude) && isFinite(maxFreq)) {
             freqAxisX.min = 0;
 
             if (transformType === "Fourier") {
-                let expectedFrequency = -1;
-
-                if (frequencies && frequencies.length > 0) {
-                    let maxMagIndex = 0;
-                    let maxMagValue = 0;
-                    
-                    for (let i = 0; i < transformResult.length && i < frequencies.length; i++) {
-                        if (transformResult[i] > maxMagValue) {
-                            maxMagValue = transformResult[i];
-                            maxMagIndex = i;
-                        }
-                    }
-                    
-                    if (maxMagIndex > 0) {
-                        expectedFrequency = frequencies[maxMagIndex];
-                    }
-                }
+                let expectedFrequency = spectrum.peakFrequency;
 
                 if (expectedFrequency > 0) {
                     if (isCustomWaveform && harmonicFrequencies.length > 0) {
@@ -544,27 +449,13 @@ Item {
                 
                 freqAxisX.labelFormat = "%.1f";
             } else {
-                let significantFreq = maxFreq;
-                let threshold = maxMagnitude * 0.1;
-                let foundCutoff = false;
-
-                for (let i = magnitudePoints.length - 1; i > 0; i--) {
-                    if (magnitudePoints[i].y > threshold) {
-                        significantFreq = magnitudePoints[i].x;
-                        foundCutoff = true;
-                        break;
-                    }
-                }
-
-                if (!foundCutoff) {
-                    significantFreq = maxFreq;
-                }
+                let significantFreq = spectrum.cutoffFrequency;
 
                 freqAxisX.max = Math.max(significantFreq * 1.2, 100);
 
                 if ((resonantFrequency > 0) || 
                     (transformResult.length > 200 && maxFreq > 50)) {
-                    let significantFreq = findSignificantFrequency(magnitudePoints, maxMagnitude);
+                    let significantFreq = spectrum.halfFrequency;
                     if (significantFreq > 0) {
                         freqAxisX.max = Math.max(freqAxisX.max, significantFreq * 3);
                     }
@@ -585,16 +476,6 @@ Item {
                 }
             }
             
-            magnitudeSeries.clear();
-            for (let i = 0; i < magnitudePoints.length; i++) {
-                magnitudeSeries.append(magnitudePoints[i].x, magnitudePoints[i].y);
-            }
-            
-            phaseSeries.clear();
-            for (let i = 0; i < phasePoints.length; i++) {
-                phaseSeries.append(phasePoints[i].x, phasePoints[i].y);
-            }
-            
             if (isCustomWaveform && harmonicFrequencies.length > 0 && transformType === "Fourier") {
                 harmonicsSeries.clear();
                 
@@ -632,37 +513,17 @@ Item {
         }
     }
     
-    function findSignificantFrequency(points, maxMagnitude) {
-        if (!points || points.length === 0) return 0;
-        
-        let threshold = maxMagnitude * 0.5;
-        
-        for (let i = 0; i < points.length; i++) {
-            if (points[i].y < threshold) {
-                return points[i].x;
-            }
-        }
-        
-        return points[points.length - 1].x;
-    }
-    
     function updatePoleZeroPlot() {
         poleZeroPlot.pzCanvas.requestPaint();
     }
     
     function updateTransformSeries() {
-        magnitudeSeries.clear();
-        phaseSeries.clear();
-        
-        if (frequencies.length > 0 && transformResult.length > 0) {
-            for (let i = 0; i < Math.min(frequencies.length, transformResult.length); i++) {
-                magnitudeSeries.append(frequencies[i], transformResult[i]);
-                
-                if (phaseResult.length > i && (showPhaseCheckbox.checked)) {
-                    phaseSeries.append(frequencies[i], phaseResult[i]);
-                }
-            }
+        if (calculator && frequencies.length > 0 && transformResult.length > 0) {
+            calculator.fillTransformSeries(magnitudeSeries, phaseSeries, 1);
         } else {
+            magnitudeSeries.clear();
+            phaseSeries.clear();
+
             magnitudeSeries.append(0, 0);
             magnitudeSeries.append(10, 0);
             
@@ -45,30 +45,15 @@ ChartView {
         var isWindows = Qt.platform.os === "windows";
         
         // Force full update on Windows to fix rendering issues
-        var forceUpdate = isWindows || !waveformSeries.count;
-        
-        var points = calculator.waveform;
-        var fundamentalData = calculator.fundamentalWaveform;
-        
-        // Skip update if data hasn't changed
-        if (!points || points.length === 0) {
-            return;
+        if (isWindows) {
+            waveformSeries.clear();
+            fundamentalSeries.clear();
         }
         
-        var maxY = 0;
-        
-        // Find maximum magnitude for scaling with validation
-        if (points && points.length > 0) {
-            for (var i = 0; i < points.length; i++) {
-                // Check for valid numeric values
-                if (isFinite(points[i])) {
-                    maxY = Math.max(maxY, Math.abs(points[i]));
-                }
-                
-                if (fundamentalData && i < fundamentalData.length && isFinite(fundamentalData[i])) {
-                    maxY = Math.max(maxY, Math.abs(fundamentalData[i]));
-                }
-            }
+        // Both series are filled in Python straight from the point arrays
+        var maxY = calculator.fillWaveformSeries(waveformSeries, fundamentalSeries);
+        if (!waveformSeries.count) {
+            return;
         }
 
         if (!isFinite(maxY) || maxY <= 0) {
@@ -79,48 +64,8 @@ ChartView {
         axisY.min = -paddedMax;
         axisY.max = paddedMax;
 
-        var chartWidth = width;
-
-        chartWidth = Math.max(100, chartWidth);
-
-        var maxPoints = isWindows ? 
-            Math.min(Math.floor(chartWidth / 4), 80) :
-            Math.min(Math.floor(chartWidth / 3), 100);
-            
-        var pointSpacing = Math.max(1, Math.floor(points.length / maxPoints));
-
-        var xValues = [];
-        var yValues = [];
-        var fundValues = [];
-        
-        if (points && points.length > 0) {
-            for (var i = 0; i < points.length; i += pointSpacing) {
-                if (isFinite(points[i])) {
-                    xValues.push(i * (360/points.length));
-                    yValues.push(points[i]);
-                }
-                
-                if (fundamentalData && i < fundamentalData.length && isFinite(fundamentalData[i])) {
-                    fundValues.push(fundamentalData[i]);
-                }
-            }
-
-            if (isWindows && forceUpdate) {
-                waveformSeries.clear();
-                fundamentalSeries.clear();
-            }
-
-            if (xValues.length > 0 && yValues.length > 0) {
-                seriesHelper.fillSeriesFromArrays(waveformSeries, xValues, yValues);
-                
-                if (fundValues.length === xValues.length) {
-                    seriesHelper.fillSeriesFromArrays(fundamentalSeries, xValues, fundValues);
-                }
-
-                if (isWindows) {
-                    update();
-                }
-            }
+        if (isWindows) {
+            update();
         }
 
         if (lowQualityMode) {
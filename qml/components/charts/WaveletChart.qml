@@ -7,6 +7,7 @@ import Qt.labs.platform
 Item {
     id: root
     
+    property var calculator: null
     property var timeDomain: []
     property var scaleData: []
     property var magnitudeData: []
@@ -474,32 +475,18 @@ Item {
     }
 
     function updateTimeDomainChart() {
-        if (!timeDomain || timeDomain.length === 0) {
+        if (!calculator || !timeDomain || timeDomain.length === 0) {
             return;
         }
 
-        timeSeries.clear();
+        // The series is filled in Python straight from the signal arrays
+        var signal = calculator.fillTimeDomainSeries(timeSeries, 1);
 
-        var minY = Number.MAX_VALUE;
-        var maxY = -Number.MAX_VALUE;
-        var maxX = 0;
-
-        for (var i = 0; i < timeDomain.length; i++) {
-            var point = timeDomain[i];
-            if (point && isFinite(point.x) && isFinite(point.y)) {
-                timeSeries.append(point.x, point.y);
-
-                minY = Math.min(minY, point.y);
-                maxY = Math.max(maxY, point.y);
-                maxX = Math.max(maxX, point.x);
-            }
-        }
-
-        if (isFinite(minY) && isFinite(maxY) && minY !== Number.MAX_VALUE) {
+        if (signal.count > 0) {
             timeAxisX.min = 0;
-            timeAxisX.max = maxX > 0 ? maxX : 5;
+            timeAxisX.max = signal.maxX > 0 ? signal.maxX : 5;
 
-            var yRange = Math.max(Math.abs(minY), Math.abs(maxY)) * 1.2;
+            var yRange = signal.maxAbsY * 1.2;
             timeAxisY.min = -yRange || -2;
             timeAxisY.max = yRange || 2;
         }
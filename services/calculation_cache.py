@@ -1,13 +1,84 @@
 """Efficient caching system for expensive calculations."""
+import sys
 import time
 import hashlib
 import threading
 import json
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+from services.calculation_disk_cache import DiskCacheTier, default_disk_cache_path
+
+DEFAULT_NAMESPACE = "default"
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the memory footprint of a cached value in bytes.
+
+    Walks dicts, lists and tuples so that large result payloads (waveform
+    point lists, spectra) are charged for their contents, not just the
+    container. NumPy arrays report their buffer size directly.
+    """
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if hasattr(obj, "nbytes") and hasattr(obj, "shape"):
+            total += int(obj.nbytes)
+            continue
+        total += sys.getsizeof(obj, 0)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+
+class _CacheNamespace:
+    """LRU store for one namespace with a byte budget and optional TTL."""
+
+    __slots__ = ("entries", "bytes_used", "max_bytes", "max_entries", "ttl", "evictions", "expirations")
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: Optional[float]):
+        # key -> (value, size_bytes, expires_at or None); order is LRU -> MRU
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.bytes_used = 0
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self.expirations = 0
+
+    def pop(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes_used -= entry[1]
+
+    def evict_to_fit(self, incoming: int = 0) -> None:
+        """Drop least recently used entries until the limits are satisfied."""
+        while self.entries and (
+            len(self.entries) > self.max_entries
+            or self.bytes_used + incoming > self.max_bytes
+        ):
+            _, (_, size, _) = self.entries.popitem(last=False)
+            self.bytes_used -= size
+            self.evictions += 1
+
+
 class CalculationCache:
-    """Thread-safe LRU cache for calculation results."""
+    """Thread-safe LRU cache for calculation results.
+
+    Entries live in per-namespace ``OrderedDict`` stores so lookup, insert
+    and eviction are all O(1). Each namespace has an entry limit, a byte
+    budget and an optional TTL. A bounded admission filter decides when a
+    key has been requested often enough to be worth caching.
+    """
     
     _instance = None
     _lock = threading.RLock()
@@ -20,16 +91,32 @@ class CalculationCache:
                 cls._instance = cls()
             return cls._instance
     
-    def __init__(self):
-        """Initialize the cache with configuration parameters."""
-        self._cache: Dict[str, Dict] = {}
-        self._access_times: Dict[str, float] = {}
+    def __init__(self, max_size: int = 100, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: Optional[float] = None, admission_window: int = 1024):
+        """Initialize the cache with configuration parameters.
+
+        Args:
+            max_size: Maximum number of entries per namespace
+            max_bytes: Memory budget in bytes per namespace
+            ttl: Default time-to-live in seconds, or None for no expiry
+            admission_window: Number of keys tracked by the admission filter
+        """
+        self._namespaces: Dict[str, _CacheNamespace] = {}
         self._hits = 0
         self._misses = 0
-        self._max_size = 100  # Maximum number of cache entries
+        self._max_size = max_size  # Maximum number of cache entries
+        self._max_bytes = max_bytes
+        self._default_ttl = ttl
         self._enabled = True
         self._hit_threshold = 3  # Number of identical requests before caching
-        self._request_counts: Dict[str, int] = {}
+        
+        # Bounded admission filter: key -> request count, oldest dropped first
+        self._admission_window = admission_window
+        self._request_counts: "OrderedDict[str, int]" = OrderedDict()
+        
+        # Optional persistent second tier
+        self._disk: Optional[DiskCacheTier] = None
+        self._disk_hits = 0
         
         # Add performance tracking
         self._perf_log = []
@@ -38,6 +125,84 @@ class CalculationCache:
         self._log_file = None
         self._max_log_entries = 1000
         
+    def _namespace(self, name: str) -> _CacheNamespace:
+        """Get or create the store for a namespace."""
+        ns = self._namespaces.get(name)
+        if ns is None:
+            ns = _CacheNamespace(self._max_size, self._max_bytes, self._default_ttl)
+            self._namespaces[name] = ns
+        return ns
+
+    def configure_namespace(self, namespace: str, max_size: Optional[int] = None,
+                            max_bytes: Optional[int] = None, ttl: Optional[float] = None) -> None:
+        """Set the limits for a namespace, evicting entries that no longer fit."""
+        with self._lock:
+            ns = self._namespace(namespace)
+            if max_size is not None:
+                if max_size < 1:
+                    raise ValueError("Cache size must be positive")
+                ns.max_entries = max_size
+            if max_bytes is not None:
+                if max_bytes < 1:
+                    raise ValueError("Cache byte budget must be positive")
+                ns.max_bytes = max_bytes
+            if ttl is not None:
+                ns.ttl = ttl if ttl > 0 else None
+            ns.evict_to_fit()
+
+    def enable_disk_tier(self, path: Optional[str] = None,
+                         max_bytes: int = 256 * 1024 * 1024) -> bool:
+        """Back the cache with a persistent file so results survive restarts.
+
+        Stale and over-budget entries are compacted when the tier is opened.
+        """
+        try:
+            tier = DiskCacheTier(path or default_disk_cache_path(), max_bytes=max_bytes)
+            tier.compact(vacuum=False)
+        except Exception as e:
+            print(f"Error opening calculation disk cache: {e}")
+            return False
+
+        with self._lock:
+            if self._disk is not None:
+                self._disk.close()
+            self._disk = tier
+        return True
+
+    def disable_disk_tier(self, compact: bool = True) -> None:
+        """Detach the persistent tier, optionally compacting it first."""
+        with self._lock:
+            tier, self._disk = self._disk, None
+        if tier is not None:
+            if compact:
+                tier.compact()
+            tier.close()
+
+    def _store(self, ns: _CacheNamespace, key: str, value: Any,
+               ttl: Optional[float]) -> Optional[float]:
+        """Insert into a namespace store and return the effective TTL."""
+        size = estimate_size(value)
+        ns.pop(key)
+        
+        # Values larger than the whole budget are never cached
+        if size > ns.max_bytes:
+            return None
+        ttl = ttl if ttl is not None else ns.ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        ns.evict_to_fit(size)
+        ns.entries[key] = (value, size, expires_at)
+        ns.bytes_used += size
+        ns.evict_to_fit()
+        return ttl
+
+    def _admit(self, key: str) -> bool:
+        """Record a store request for key and report whether it should be cached."""
+        count = self._request_counts.pop(key, 0) + 1
+        self._request_counts[key] = count
+        if len(self._request_counts) > self._admission_window:
+            self._request_counts.popitem(last=False)
+        return count >= self._hit_threshold
+
     def start_timing(self, key: str, operation: str) -> None:
         """Start timing an operation for a specific key."""
         if not self._log_enabled:
@@ -85,56 +250,118 @@ class CalculationCache:
                 # Clean up
                 del self._timing_data[key][operation]
     
-    def get(self, key: str) -> Optional[Dict]:
+    def get(self, key: str, namespace: str = DEFAULT_NAMESPACE) -> Optional[Dict]:
         """Get a value from the cache if it exists."""
         if not self._enabled:
             return None
         
         self.start_timing(key, "lookup")
         with self._lock:
-            if key in self._cache:
-                self._hits += 1
-                self._access_times[key] = time.time()
-                result = self._cache[key]
+            ns = self._namespaces.get(namespace)
+            entry = ns.entries.get(key) if ns is not None else None
+            if entry is not None:
+                value, _, expires_at = entry
+                if expires_at is not None and expires_at <= time.monotonic():
+                    ns.pop(key)
+                    ns.expirations += 1
+                else:
+                    self._hits += 1
+                    ns.entries.move_to_end(key)
+                    self.end_timing(key, "hit", True)
+                    return value
+            disk = self._disk
+        
+        # Fall back to the persistent tier outside the lock
+        if disk is not None:
+            value = disk.get(key, namespace)
+            if value is not None:
+                with self._lock:
+                    self._hits += 1
+                    self._disk_hits += 1
+                    self._store(self._namespace(namespace), key, value, None)
                 self.end_timing(key, "hit", True)
-                return result
+                return value
+        
+        with self._lock:
             self._misses += 1
-            self.end_timing(key, "miss", False)
-            return None
+        self.end_timing(key, "miss", False)
+        return None
     
-    def put(self, key: str, value: Dict) -> None:
-        """Put a value in the cache, evicting old entries if needed."""
+    def put(self, key: str, value: Dict, namespace: str = DEFAULT_NAMESPACE,
+            ttl: Optional[float] = None) -> None:
+        """Put a value in the cache, evicting old entries if needed.
+
+        Args:
+            key: Cache key
+            value: Result to store
+            namespace: Namespace whose budget the entry is charged to
+            ttl: Time-to-live in seconds, overriding the namespace default
+        """
         if not self._enabled:
             return
         
         self.start_timing(key, "store")    
         with self._lock:
-            # Increment request count for this key
-            self._request_counts[key] = self._request_counts.get(key, 0) + 1
+            ns = self._namespace(namespace)
             
             # Only cache if this calculation has been requested multiple times
-            if self._request_counts[key] >= self._hit_threshold:
-                # Ensure we don't exceed maximum size
-                if len(self._cache) >= self._max_size and key not in self._cache:
-                    # Evict least recently used item
-                    lru_key = min(self._access_times.items(), key=lambda x: x[1])[0]
-                    self._cache.pop(lru_key, None)
-                    self._access_times.pop(lru_key, None)
-                
-                # Store in cache
-                self._cache[key] = value
-                self._access_times[key] = time.time()
+            admitted = key in ns.entries or self._admit(key)
+            if admitted:
+                ttl = self._store(ns, key, value, ttl)
+            disk = self._disk
+        
+        # Write through so the result is available after a restart
+        if admitted and disk is not None:
+            disk.put(key, value, namespace, ttl)
         
         self.end_timing(key, "store", True)
     
-    def clear(self) -> None:
-        """Clear the cache."""
+    def invalidate(self, key: str, namespace: str = DEFAULT_NAMESPACE) -> None:
+        """Remove a single entry from the cache."""
+        with self._lock:
+            ns = self._namespaces.get(namespace)
+            if ns is not None:
+                ns.pop(key)
+            disk = self._disk
+        if disk is not None:
+            disk.invalidate(key, namespace)
+
+    def purge_expired(self) -> int:
+        """Drop all expired entries and return how many were removed."""
+        now = time.monotonic()
+        removed = 0
+        with self._lock:
+            for ns in self._namespaces.values():
+                expired = [k for k, (_, _, exp) in ns.entries.items() if exp is not None and exp <= now]
+                for key in expired:
+                    ns.pop(key)
+                ns.expirations += len(expired)
+                removed += len(expired)
+        return removed
+
+    def trim(self, max_size: int, namespace: Optional[str] = None) -> None:
+        """Keep only the max_size most recently used entries per namespace."""
+        with self._lock:
+            targets = [self._namespaces[namespace]] if namespace in self._namespaces else (
+                [] if namespace is not None else list(self._namespaces.values())
+            )
+            for ns in targets:
+                while len(ns.entries) > max_size:
+                    _, (_, size, _) = ns.entries.popitem(last=False)
+                    ns.bytes_used -= size
+                    ns.evictions += 1
+
+    def clear(self, include_disk: bool = False) -> None:
+        """Clear the cache, and the persistent tier if include_disk is set."""
         with self._lock:
-            self._cache.clear()
-            self._access_times.clear()
+            self._namespaces.clear()
             self._request_counts.clear()
             self._hits = 0
             self._misses = 0
+            self._disk_hits = 0
+            disk = self._disk
+        if include_disk and disk is not None:
+            disk.clear()
     
     def enable(self, enabled: bool = True) -> None:
         """Enable or disable the cache."""
@@ -162,8 +389,25 @@ class CalculationCache:
                 "hits": self._hits,
                 "misses": self._misses,
                 "hit_ratio": self._hits / (self._hits + self._misses) if (self._hits + self._misses) > 0 else 0,
-                "size": len(self._cache),
+                "size": sum(len(ns.entries) for ns in self._namespaces.values()),
                 "max_size": self._max_size,
+                "bytes": sum(ns.bytes_used for ns in self._namespaces.values()),
+                "max_bytes": self._max_bytes,
+                "evictions": sum(ns.evictions for ns in self._namespaces.values()),
+                "expirations": sum(ns.expirations for ns in self._namespaces.values()),
+                "admission_tracked": len(self._request_counts),
+                "disk_hits": self._disk_hits,
+                "disk": self._disk.get_stats() if self._disk is not None else None,
+                "namespaces": {
+                    name: {
+                        "size": len(ns.entries),
+                        "bytes": ns.bytes_used,
+                        "max_size": ns.max_entries,
+                        "max_bytes": ns.max_bytes,
+                        "ttl": ns.ttl
+                    }
+                    for name, ns in self._namespaces.items()
+                },
                 "enabled": self._enabled
             }
     
@@ -217,10 +461,20 @@ class CalculationCache:
             self._max_size = size
             
             # If current cache is too large, trim it
-            while len(self._cache) > self._max_size:
-                lru_key = min(self._access_times.items(), key=lambda x: x[1])[0]
-                self._cache.pop(lru_key, None)
-                self._access_times.pop(lru_key, None)
+            for ns in self._namespaces.values():
+                ns.max_entries = size
+                ns.evict_to_fit()
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        """Set the default memory budget in bytes for every namespace."""
+        if max_bytes < 1:
+            raise ValueError("Cache byte budget must be positive")
+
+        with self._lock:
+            self._max_bytes = max_bytes
+            for ns in self._namespaces.values():
+                ns.max_bytes = max_bytes
+                ns.evict_to_fit()
 
 def generate_cache_key(params: Dict[str, Any]) -> str:
     """Generate a deterministic cache key from calculation parameters."""
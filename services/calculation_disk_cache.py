@@ -0,0 +1,238 @@
+"""Persistent SQLite tier for CalculationCache.
+
+Results are stored as zlib-compressed JSON blobs keyed by namespace, key
+and a format version, so recurring configurations survive restarts while
+results written by an older layout are ignored and compacted away.
+"""
+import os
+import sys
+import json
+import time
+import zlib
+import sqlite3
+import tempfile
+import threading
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("qmltest.calculation_cache")
+
+# Bump when the shape of cached results changes so stale entries are skipped
+CACHE_FORMAT_VERSION = 2
+
+
+def default_disk_cache_path(app_name: str = "QmlTableView") -> str:
+    """Get the cache file location, matching the QML cache directory layout."""
+    if hasattr(sys, 'frozen'):  # Running as packaged executable
+        cache_dir = os.path.join(tempfile.gettempdir(), app_name, "CalculationCache")
+    else:
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        cache_dir = os.path.join(base_dir, "cache")
+    return os.path.join(cache_dir, "calculation_cache.db")
+
+
+def _encode_special(obj: Any) -> Any:
+    """JSON fallback for chart points and NumPy values found in results."""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if type(obj).__name__ == 'QPointF':
+        return {'__qpointf__': [obj.x(), obj.y()]}
+    raise TypeError(f"Object of type {type(obj).__name__} is not cacheable")
+
+
+def _decode_special(obj: Dict) -> Any:
+    """Rebuild chart points encoded by _encode_special."""
+    point = obj.get('__qpointf__') if len(obj) == 1 else None
+    if point is not None:
+        from PySide6.QtCore import QPointF
+        return QPointF(point[0], point[1])
+    return obj
+
+
+class DiskCacheTier:
+    """SQLite-backed second tier with versioned keys and a size cap."""
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024,
+                 version: int = CACHE_FORMAT_VERSION):
+        """Open (or create) the cache file.
+
+        Args:
+            path: Location of the SQLite cache file
+            max_bytes: Cap on the total stored payload size
+            version: Format version; entries with another version are ignored
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = version
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute('''
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            value BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            created REAL NOT NULL,
+            accessed REAL NOT NULL,
+            expires REAL,
+            PRIMARY KEY (namespace, key)
+        )''')
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed ON cache_entries (accessed)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        return zlib.compress(
+            json.dumps(value, separators=(',', ':'), default=_encode_special).encode('utf-8'), 1
+        )
+
+    @staticmethod
+    def _decode(blob: bytes) -> Any:
+        return json.loads(zlib.decompress(blob).decode('utf-8'), object_hook=_decode_special)
+
+    def get(self, key: str, namespace: str) -> Optional[Any]:
+        """Load a stored value, or None if missing, stale or expired."""
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value, version, expires FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (namespace, key)
+                ).fetchone()
+                if row is None or row[1] != self.version or (row[2] is not None and row[2] <= time.time()):
+                    self._misses += 1
+                    return None
+
+                self._conn.execute(
+                    "UPDATE cache_entries SET accessed = ? WHERE namespace = ? AND key = ?",
+                    (time.time(), namespace, key)
+                )
+                self._hits += 1
+                return self._decode(row[0])
+            except (sqlite3.Error, ValueError, zlib.error) as e:
+                logger.warning(f"Disk cache read failed for {key}: {e}")
+                self._misses += 1
+                return None
+
+    def put(self, key: str, value: Any, namespace: str, ttl: Optional[float] = None) -> bool:
+        """Store a value; values that cannot be serialized are skipped."""
+        try:
+            blob = self._encode(value)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Value for {key} is not cacheable on disk: {e}")
+            return False
+
+        if len(blob) > self.max_bytes:
+            return False
+
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries "
+                    "(namespace, key, version, value, size, created, accessed, expires) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (namespace, key, self.version, blob, len(blob), now, now,
+                     now + ttl if ttl else None)
+                )
+                self._conn.commit()
+                self._writes += 1
+                return True
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache write failed for {key}: {e}")
+                return False
+
+    def invalidate(self, key: str, namespace: str) -> None:
+        """Remove a single stored entry."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all stored entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+            self._conn.commit()
+
+    def total_bytes(self) -> int:
+        """Get the total stored payload size."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()[0]
+
+    def compact(self, vacuum: bool = True) -> int:
+        """Drop stale and expired entries, then evict LRU rows down to the size cap.
+
+        Returns the number of entries removed.
+        """
+        with self._lock:
+            try:
+                cursor = self._conn.execute(
+                    "DELETE FROM cache_entries WHERE version != ? OR (expires IS NOT NULL AND expires <= ?)",
+                    (self.version, time.time())
+                )
+                removed = cursor.rowcount
+
+                total = self._conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM cache_entries"
+                ).fetchone()[0]
+                if total > self.max_bytes:
+                    # Walk oldest-first and cut once the remainder fits
+                    excess = total - self.max_bytes
+                    cutoff = None
+                    freed = 0
+                    for accessed, size in self._conn.execute(
+                        "SELECT accessed, size FROM cache_entries ORDER BY accessed ASC"
+                    ):
+                        freed += size
+                        cutoff = accessed
+                        if freed >= excess:
+                            break
+                    if cutoff is not None:
+                        removed += self._conn.execute(
+                            "DELETE FROM cache_entries WHERE accessed <= ?", (cutoff,)
+                        ).rowcount
+                self._conn.commit()
+
+                if vacuum and removed:
+                    self._conn.execute("VACUUM")
+                return removed
+            except sqlite3.Error as e:
+                logger.warning(f"Disk cache compaction failed: {e}")
+                return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get disk tier statistics."""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()
+        lookups = self._hits + self._misses
+        return {
+            "path": self.path,
+            "entries": count,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": self._hits / lookups if lookups else 0,
+            "writes": self._writes,
+            "version": self.version
+        }
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
@@ -64,7 +64,8 @@ class AppConfig:
         parser.add_argument('--clear-cache', action='store_true',
                             help='Clear the QML cache before starting')
         
-        # Parse known args and ignore unknown ones
+        # Parse known args and ignore unknown ones; --profile-startup is read
+        # before the imports by services.startup_profiler.trace_path_from_argv
         args, _ = parser.parse_known_args()
         return args
         
@@ -0,0 +1,190 @@
+"""Bounded pool of tuned SQLite connections.
+
+Every connection is opened with WAL journaling, ``synchronous=NORMAL``, a
+memory-mapped read window, a larger page cache and a busy timeout, so readers
+on other threads no longer block writers. Connections are reused rather than
+reopened, which also keeps sqlite3's per-connection prepared statement cache
+warm for repeated lookups.
+
+Connections are TrackedConnection instances, which report every commit that
+changed rows to the pool's on_commit callback, so writers that commit on a
+pooled connection directly can still be noticed by the owner of the pool.
+"""
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("qmltest.database.pool")
+
+# Upper bound on open connections to one database file
+DEFAULT_MAX_CONNECTIONS = 8
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# How long a connection waits on a locked database before raising
+BUSY_TIMEOUT_MS = 5000
+
+# How long acquire() waits for a free connection when the pool is exhausted
+ACQUIRE_TIMEOUT = 30.0
+
+# Applied to every new connection, in order
+CONNECTION_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("mmap_size", 256 * 1024 * 1024),
+    ("cache_size", -16384),  # Negative values are KiB: 16 MiB
+    ("temp_store", "MEMORY"),
+)
+
+
+class TrackedConnection(sqlite3.Connection):
+    """sqlite3 connection that reports commits which changed rows."""
+
+    on_commit = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._changes_seen = 0
+
+    def commit(self):
+        super().commit()
+        changes = self.total_changes
+        if changes != self._changes_seen:
+            self._changes_seen = changes
+            if self.on_commit is not None:
+                self.on_commit(self)
+
+    def rollback(self):
+        super().rollback()
+        # Rolled back changes still count towards total_changes
+        self._changes_seen = self.total_changes
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # The built-in context manager commits without going through commit()
+        if exc_type is not None:
+            self.rollback()
+            return False
+        try:
+            self.commit()
+        except BaseException:
+            self.rollback()
+            raise
+        return False
+
+
+class ConnectionPool:
+    """Thread-safe bounded pool of sqlite3 connections to one database."""
+
+    def __init__(self, db_path, max_connections=DEFAULT_MAX_CONNECTIONS,
+                 busy_timeout_ms=BUSY_TIMEOUT_MS, cached_statements=STATEMENT_CACHE_SIZE,
+                 on_commit=None):
+        """
+        Args:
+            on_commit: Called with the connection after any commit that changed rows
+        """
+        self.db_path = db_path
+        self.max_connections = max(1, max_connections)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+        self.on_commit = on_commit
+        self._idle = []
+        self._open = 0
+        self._condition = threading.Condition(threading.Lock())
+
+    def _connect(self):
+        """Open and configure a new connection."""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,  # Connections move between threads via the pool
+            cached_statements=self.cached_statements,
+            factory=TrackedConnection
+        )
+        conn.on_commit = self.on_commit
+        conn.row_factory = sqlite3.Row
+        for name, value in CONNECTION_PRAGMAS + (("busy_timeout", self.busy_timeout_ms),):
+            try:
+                conn.execute(f"PRAGMA {name}={value}")
+            except sqlite3.Error as e:
+                # e.g. WAL is unavailable on read-only media; keep the default
+                logger.warning(f"Could not set PRAGMA {name}={value}: {e}")
+        return conn
+
+    def acquire(self, timeout=ACQUIRE_TIMEOUT):
+        """Take an idle connection, opening one if the pool is not yet full.
+
+        Raises:
+            sqlite3.OperationalError: If no connection frees up within timeout
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._open < self.max_connections:
+                    self._open += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._condition.wait(remaining):
+                    if not self._idle:
+                        raise sqlite3.OperationalError(
+                            f"Connection pool exhausted ({self.max_connections} connections in use)")
+
+        try:
+            return self._connect()
+        except Exception:
+            with self._condition:
+                self._open -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, conn):
+        """Return a connection to the pool, rolling back any open transaction."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error as e:
+            logger.warning(f"Discarding connection after failed rollback: {e}")
+            self._discard(conn)
+            return
+        with self._condition:
+            self._idle.append(conn)
+            self._condition.notify()
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with block."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_idle(self):
+        """Close connections nobody is using; busy ones stay open."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._condition.notify_all()
+        for conn in idle:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing pooled connection: {e}")
+
+    def stats(self):
+        """Open and idle connection counts."""
+        with self._condition:
+            return {"open": self._open, "idle": len(self._idle), "max": self.max_connections}
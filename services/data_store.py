@@ -1,16 +1,25 @@
-import pandas as pd
 import os
 import json
 import threading
+from collections import deque
 from PySide6.QtCore import QObject, Signal, QThread
 import logging
 
 # Import the database manager
 from .database_manager import DatabaseManager
 
+# pandas is imported by the methods that build DataFrames, so the DataStore
+# the main window creates at startup does not load it
+
 # Set up logger
 logger = logging.getLogger("qmltest.database.data_store")
 
+# Recent calculations kept in memory as a fallback when SQLite is unavailable
+MEMORY_HISTORY_LIMIT = 500
+
+# Default rows per calculation history page
+HISTORY_PAGE_SIZE = 200
+
 class DataStore(QObject):
     """
     Centralized data storage for the application.
@@ -33,7 +42,7 @@ class DataStore(QObject):
             'cable_data': {},
             'diversity_factors': [],
             'fuse_sizes': [],
-            'calculation_history': [],
+            'calculation_history': deque(maxlen=MEMORY_HISTORY_LIMIT),
             'settings': {}
         }
         
@@ -86,6 +95,7 @@ class DataStore(QObject):
     
     def get_cable_data(self, material, core_type):
         """Get cable data for specified material and core type."""
+        import pandas as pd
         key = f"{material.lower()}_{'1c' if core_type == '1C+E' else '3c'}"
         data = self._memory_store['cable_data'].get(key)
         if data:
@@ -94,25 +104,44 @@ class DataStore(QObject):
     
     def get_diversity_factors(self):
         """Get diversity factors as DataFrame."""
+        import pandas as pd
         return pd.DataFrame(self._memory_store['diversity_factors'])
     
     def get_fuse_sizes(self):
         """Get fuse sizes as DataFrame."""
+        import pandas as pd
         return pd.DataFrame(self._memory_store['fuse_sizes'])
     
     def add_calculation(self, data):
         """Add calculation to history in both memory and SQLite."""
+        return self.add_calculations([data])
+    
+    def add_calculations(self, records):
+        """Add many calculations to history in one transaction.
+        
+        Records with the same columns share one INSERT statement executed
+        with executemany, so importing a large history costs a single commit.
+        """
+        records = list(records)
+        if not records:
+            return True
+        
         # Add to in-memory store
-        self._memory_store['calculation_history'].append(data)
+        self._memory_store['calculation_history'].extend(records)
         
         # Add to SQLite database
         try:
-            columns = ','.join(data.keys())
-            placeholders = ','.join(['?'] * len(data))
-            query = f"INSERT INTO calculation_history ({columns}) VALUES ({placeholders})"
-            self.db_manager.execute_query(query, list(data.values()))
+            batches = {}
+            for data in records:
+                batches.setdefault(tuple(data.keys()), []).append(tuple(data.values()))
+            
+            with self.db_manager.transaction():
+                for columns, rows in batches.items():
+                    placeholders = ','.join(['?'] * len(columns))
+                    query = f"INSERT INTO calculation_history ({','.join(columns)}) VALUES ({placeholders})"
+                    self.db_manager.execute_many(query, rows)
         except Exception as e:
-            logger.error(f"Error adding calculation: {e}")
+            logger.error(f"Error adding calculations: {e}")
             # Continue with in-memory storage even if SQLite fails
         
         # Notify listeners (using the thread-safe Qt signal system)
@@ -121,6 +150,7 @@ class DataStore(QObject):
     
     def get_calculation_history(self):
         """Get calculation history as DataFrame."""
+        import pandas as pd
         try:
             # Get from SQLite for persistence
             results = self.db_manager.fetch_all(
@@ -136,7 +166,7 @@ class DataStore(QObject):
             
             # Fall back to in-memory data if no results
             if self._memory_store['calculation_history']:
-                return pd.DataFrame(self._memory_store['calculation_history'])
+                return pd.DataFrame(list(self._memory_store['calculation_history']))
             
             return pd.DataFrame()
             
@@ -144,9 +174,45 @@ class DataStore(QObject):
             logger.error(f"Error getting calculation history: {e}")
             # Fall back to in-memory data if SQLite fails
             if self._memory_store['calculation_history']:
-                return pd.DataFrame(self._memory_store['calculation_history'])
+                return pd.DataFrame(list(self._memory_store['calculation_history']))
             return pd.DataFrame()
     
+    def get_calculation_page(self, after=None, limit=HISTORY_PAGE_SIZE):
+        """Get one page of calculation history as rows, newest first.
+        
+        Uses keyset pagination on (timestamp, id), so every page is a range
+        scan of the timestamp index however far the user has scrolled.
+        
+        Args:
+            after: (timestamp, id) of the last row of the previous page, or
+                None for the first page
+            limit: Maximum number of rows to return
+        """
+        try:
+            if after is None:
+                return self.db_manager.fetch_all(
+                    "SELECT * FROM calculation_history ORDER BY timestamp DESC, id DESC LIMIT ?",
+                    (limit,)
+                )
+            return self.db_manager.fetch_all(
+                """
+                SELECT * FROM calculation_history
+                WHERE (timestamp, id) < (?, ?)
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
+                """,
+                (after[0], after[1], limit)
+            )
+        except Exception as e:
+            logger.error(f"Error getting calculation history page: {e}")
+            return []
+    
+    def delete_calculation(self, calculation_id):
+        """Delete one calculation from history by its row id."""
+        self.db_manager.execute_query("DELETE FROM calculation_history WHERE id = ?", (calculation_id,))
+        self.dataChanged.emit('calculation_history')
+        return True
+    
     def clear_calculation_history(self):
         """Clear calculation history from both memory and SQLite."""
         # Clear in-memory store
@@ -197,6 +263,7 @@ class DataStore(QObject):
     
     def export_data(self, data_type, filepath=None):
         """Export data to a file."""
+        import pandas as pd
         if data_type not in self._memory_store:
             return False
         
@@ -212,13 +279,14 @@ class DataStore(QObject):
                 json.dump(data, f, indent=2)
         else:
             # Export as CSV for lists
-            df = pd.DataFrame(data)
+            df = pd.DataFrame(list(data))
             df.to_csv(filepath, index=False)
         
         return True
     
     def import_data(self, data_type, filepath):
         """Import data from a file."""
+        import pandas as pd
         if not os.path.exists(filepath):
             return False
         
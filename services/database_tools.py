@@ -98,20 +98,17 @@ class DatabaseTools:
                 logger.error(f"Table {table_name} not found in database")
                 return False
                 
-            # Clear existing data
-            self.db_manager.execute_query(f"DELETE FROM {table_name}")
-            
             # Convert DataFrame to list of tuples for insertion
             columns = df.columns.tolist()
             placeholders = ', '.join(['?'] * len(columns))
             insert_query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+            rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
             
-            # Insert data row by row
-            cursor = self.db_manager.connection.cursor()
-            for _, row in df.iterrows():
-                cursor.execute(insert_query, tuple(row))
+            # Replace the table contents in a single transaction
+            with self.db_manager.transaction():
+                self.db_manager.execute_query(f"DELETE FROM {table_name}")
+                self.db_manager.execute_many(insert_query, rows)
                 
-            self.db_manager.connection.commit()
             logger.info(f"Imported data into {table_name} from {filepath}")
             return True
         except Exception as e:
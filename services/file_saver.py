@@ -1,6 +1,5 @@
 import os
 import json
-import pandas as pd
 from pathlib import Path
 from PySide6.QtCore import QObject, Signal, Slot, Property, QThread, QCoreApplication
 
@@ -254,6 +253,7 @@ class FileSaver(QObject):
         Save data to a CSV file. Data can be a DataFrame or a dictionary-like structure.
         Optional metadata will be included as header comments.
         """
+        import pandas as pd
         try:
             # If no filepath provided, ask for one
             if not filepath:
@@ -0,0 +1,153 @@
+"""In-memory index of fuse time-current curves.
+
+Every row of ``fuse_characteristics`` is one curve whose points are stored as
+packed arrays (see services.fuse_curve_store), so the whole index is read in
+one query with one row per curve. Each curve keeps its points as NumPy arrays
+and monotone piecewise-cubic (PCHIP) interpolants of log(time) over
+log(current multiple), so melting and clearing times for any number of
+currents are one vectorized call. Between two points the interpolant never
+overshoots the data, and a falling curve stays falling. Currents beyond the
+first or last point take that point's time.
+
+The index is shared by every protection calculator and rebuilt the next time
+it is used after DatabaseManager records a write to ``fuse_characteristics``.
+"""
+import logging
+import threading
+
+import numpy as np
+from scipy.interpolate import PchipInterpolator
+
+from services.database_manager import DatabaseManager
+from services.fuse_curve_store import unpack, unpack_notes
+
+logger = logging.getLogger("qmltest.database.fuse_curves")
+
+
+class FuseCurve:
+    """Melting and clearing characteristic of one fuse."""
+
+    __slots__ = ('manufacturer', 'fuse_type', 'rating', 'series', 'multipliers',
+                 'melting', 'clearing', 'notes', '_log_range', '_log_melting', '_log_clearing')
+
+    def __init__(self, manufacturer, fuse_type, rating, series, multipliers, melting, clearing, notes):
+        self.manufacturer = manufacturer
+        self.fuse_type = fuse_type
+        self.rating = rating
+        self.series = series
+        self.multipliers = multipliers
+        self.melting = melting
+        self.clearing = clearing
+        self.notes = notes
+
+        log_multipliers = np.log10(multipliers)
+        self._log_range = (log_multipliers[0], log_multipliers[-1])
+        self._log_melting = self._interpolant(log_multipliers, np.log10(melting))
+        self._log_clearing = self._interpolant(log_multipliers, np.log10(clearing))
+
+    @staticmethod
+    def _interpolant(x, y):
+        if len(x) < 2:
+            return lambda values: np.full(np.shape(values), y[0])
+        return PchipInterpolator(x, y, extrapolate=False)
+
+    def _evaluate(self, interpolant, currents):
+        currents = np.asarray(currents, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_multiples = np.log10(currents / self.rating)
+        times = 10 ** interpolant(np.clip(log_multiples, *self._log_range))
+        return np.where(currents > 0, times, np.nan)[()]
+
+    def melting_time(self, currents):
+        """Melting (pre-arcing) time in s for a current or an array of currents in A."""
+        return self._evaluate(self._log_melting, currents)
+
+    def clearing_time(self, currents):
+        """Total clearing time in s for a current or an array of currents in A."""
+        return self._evaluate(self._log_clearing, currents)
+
+    def points(self):
+        """Curve points as dicts with current, melting_time, clearing_time and notes."""
+        return [
+            {'current': current, 'melting_time': melting, 'clearing_time': clearing, 'notes': notes}
+            for current, melting, clearing, notes in zip(
+                (self.multipliers * self.rating).tolist(), self.melting.tolist(),
+                self.clearing.tolist(), self.notes)
+        ]
+
+
+class FuseCurveIndex:
+    """Fuse curves keyed by (manufacturer, fuse type, rating), built once from the database."""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        """Get the shared index."""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls(DatabaseManager.get_instance())
+            return cls._instance
+
+    def __init__(self, db_manager):
+        self._db = db_manager
+        self._curves = {}
+        self._version = None
+        self._build_lock = threading.Lock()
+
+    def _ensure_current(self):
+        version = self._db.table_version('fuse_characteristics')
+        if version == self._version:
+            return
+        with self._build_lock:
+            if version != self._version:
+                self._curves = self._build()
+                self._version = version
+
+    def _build(self):
+        rows = self._db.fetch_all("""
+            SELECT manufacturer, fuse_type, rating, series, point_count,
+                   multipliers, melting_times, clearing_times, notes
+            FROM fuse_characteristics
+        """)
+        curves = {}
+        for row in rows:
+            rating = float(row['rating'])
+            curves[(row['manufacturer'], row['fuse_type'], rating)] = FuseCurve(
+                row['manufacturer'], row['fuse_type'], rating, row['series'],
+                unpack(row['multipliers']), unpack(row['melting_times']),
+                unpack(row['clearing_times']), unpack_notes(row['notes'], row['point_count']))
+        logger.debug(f"Fuse curve index built ({len(curves)} curves)")
+        return curves
+
+    def invalidate(self):
+        """Rebuild on next use, e.g. after writing fuse_characteristics outside DatabaseManager."""
+        self._version = None
+
+    def curve(self, manufacturer, fuse_type, rating):
+        """The curve for a fuse, or None if there is none."""
+        self._ensure_current()
+        return self._curves.get((manufacturer, fuse_type, float(rating)))
+
+    def fuse_types(self, manufacturer):
+        """(fuse type, series) pairs available from a manufacturer, sorted."""
+        self._ensure_current()
+        types = {(curve.fuse_type, curve.series) for key, curve in self._curves.items() if key[0] == manufacturer}
+        return sorted(types, key=lambda pair: (pair[0], pair[1] or ''))
+
+    def ratings(self, manufacturer, fuse_type):
+        """Ratings available for a fuse type, ascending."""
+        self._ensure_current()
+        return sorted(rating for curve_manufacturer, curve_type, rating in self._curves
+                      if curve_manufacturer == manufacturer and curve_type == fuse_type)
+
+    def melting_times(self, manufacturer, fuse_type, rating, currents):
+        """Melting times for currents, or None if the fuse is unknown."""
+        curve = self.curve(manufacturer, fuse_type, rating)
+        return None if curve is None else curve.melting_time(currents)
+
+    def clearing_times(self, manufacturer, fuse_type, rating, currents):
+        """Clearing times for currents, or None if the fuse is unknown."""
+        curve = self.curve(manufacturer, fuse_type, rating)
+        return None if curve is None else curve.clearing_time(currents)
@@ -0,0 +1,199 @@
+"""Compact storage and bulk import of fuse time-current curves.
+
+Each characteristic is one row of ``fuse_characteristics``. The row holds the
+metadata once and the current multiples, melting times and clearing times as
+packed little-endian float64 arrays, so reading every curve is one row per
+curve. A SHA-256 content hash of the row lets an import skip curves that have
+not changed.
+
+Manufacturer datasets are imported from CSV files with one row per curve
+point. Required columns are manufacturer, fuse_type, rating, melting_time and
+either current_multiplier or current (in A, divided by the rating). Optional
+columns are series, voltage_rating, breaking_capacity, temperature,
+clearing_time (the melting time where missing) and notes. pandas is only
+imported to read datasets, as reading stored curves runs at startup.
+"""
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger("qmltest.database.fuse_curves")
+
+POINT_DTYPE = np.dtype('<f8')
+KEY_COLUMNS = ['manufacturer', 'fuse_type', 'rating']
+METADATA_COLUMNS = ['series', 'voltage_rating', 'breaking_capacity', 'temperature']
+DEFAULT_TEMPERATURE = '25°C'
+
+
+@dataclass
+class CurveRecord:
+    """One fuse characteristic, ready to be stored."""
+    manufacturer: str
+    fuse_type: str
+    rating: float
+    multipliers: np.ndarray
+    melting: np.ndarray
+    clearing: np.ndarray
+    notes: list = field(default_factory=list)  # One per point, '' where there is none
+    series: Optional[str] = None
+    voltage_rating: Optional[float] = None
+    breaking_capacity: Optional[float] = None
+    temperature: Optional[str] = DEFAULT_TEMPERATURE
+
+    @property
+    def key(self):
+        return (self.manufacturer, self.fuse_type, float(self.rating))
+
+    def notes_json(self):
+        """Notes as stored: a JSON list, or None when no point has one."""
+        return json.dumps(self.notes) if any(self.notes) else None
+
+    def content_hash(self):
+        """SHA-256 of the points, notes and metadata."""
+        digest = hashlib.sha256()
+        for values in (self.multipliers, self.melting, self.clearing):
+            digest.update(pack(values))
+        metadata = [self.series, self.voltage_rating, self.breaking_capacity, self.temperature]
+        digest.update(json.dumps([metadata, self.notes]).encode())
+        return digest.hexdigest()
+
+
+def pack(values):
+    """Bytes of a float array as stored in the BLOB columns."""
+    return np.ascontiguousarray(values, dtype=POINT_DTYPE).tobytes()
+
+
+def unpack(blob):
+    """Read-only float array from a BLOB column."""
+    return np.frombuffer(blob, dtype=POINT_DTYPE)
+
+
+def unpack_notes(notes, count):
+    """Per-point notes from the notes column."""
+    return json.loads(notes) if notes else [''] * count
+
+
+def _optional(value, convert):
+    import pandas as pd
+    return None if pd.isna(value) else convert(value)
+
+
+def curves_from_frame(frame):
+    """Group point rows into one CurveRecord per (manufacturer, fuse type, rating).
+
+    Points with a non-positive multiple or melting time are dropped, the rest
+    are sorted by multiple and the first of several points at one multiple is
+    kept, so every stored curve is ready to interpolate.
+    """
+    frame = frame.copy()
+    missing = [column for column in KEY_COLUMNS + ['melting_time'] if column not in frame]
+    if missing:
+        raise ValueError(f"Fuse curve data is missing columns: {', '.join(missing)}")
+    frame['rating'] = frame['rating'].astype(float)
+    if 'current_multiplier' not in frame:
+        if 'current' not in frame:
+            raise ValueError("Fuse curve data needs a current_multiplier or current column")
+        frame['current_multiplier'] = frame['current'].astype(float) / frame['rating']
+    for column in METADATA_COLUMNS + ['clearing_time', 'notes']:
+        if column not in frame:
+            frame[column] = None
+    frame['temperature'] = frame['temperature'].fillna(DEFAULT_TEMPERATURE)
+    clearing = frame['clearing_time'].astype(float)
+    frame['clearing_time'] = clearing.where(clearing > 0, frame['melting_time'])
+    frame['notes'] = frame['notes'].fillna('').astype(str)
+
+    records = []
+    for (manufacturer, fuse_type, rating), group in frame.groupby(KEY_COLUMNS, sort=False):
+        group = group[(group['current_multiplier'] > 0) & (group['melting_time'] > 0)]
+        group = group.sort_values('current_multiplier', kind='stable')
+        group = group.drop_duplicates('current_multiplier')
+        if group.empty:
+            logger.warning(f"Skipping {manufacturer} {fuse_type} {rating}A: no valid points")
+            continue
+        first = group.iloc[0]
+        records.append(CurveRecord(
+            str(manufacturer), str(fuse_type), float(rating),
+            group['current_multiplier'].to_numpy(dtype=float),
+            group['melting_time'].to_numpy(dtype=float),
+            group['clearing_time'].to_numpy(dtype=float),
+            group['notes'].tolist(),
+            _optional(first['series'], str),
+            _optional(first['voltage_rating'], float),
+            _optional(first['breaking_capacity'], float),
+            _optional(first['temperature'], str)
+        ))
+    return records
+
+
+def read_csv(path):
+    """CurveRecords from a CSV file of curve points."""
+    import pandas as pd
+    return curves_from_frame(pd.read_csv(path))
+
+
+def import_curves(db_manager, records, prune=False):
+    """Store curves, rewriting only those whose content hash changed.
+
+    Args:
+        db_manager: DatabaseManager to write through
+        records: CurveRecords to store
+        prune: Also delete stored curves of the imported manufacturers that
+            are not in records, so a dataset replaces its whole catalogue
+
+    Returns:
+        dict: Number of curves added, updated, unchanged and removed
+    """
+    records = {record.key: record for record in records}
+    counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+
+    with db_manager.transaction():
+        stored = {
+            (row['manufacturer'], row['fuse_type'], float(row['rating'])): (row['id'], row['content_hash'])
+            for row in db_manager.fetch_all(
+                "SELECT id, manufacturer, fuse_type, rating, content_hash FROM fuse_characteristics")
+        }
+
+        rows = []
+        for key, record in records.items():
+            digest = record.content_hash()
+            if key not in stored:
+                counts['added'] += 1
+            elif stored[key][1] != digest:
+                counts['updated'] += 1
+            else:
+                counts['unchanged'] += 1
+                continue
+            rows.append((
+                record.manufacturer, record.fuse_type, record.rating, record.series,
+                record.voltage_rating, record.breaking_capacity, record.temperature,
+                len(record.multipliers), pack(record.multipliers), pack(record.melting),
+                pack(record.clearing), record.notes_json(), digest
+            ))
+        if rows:
+            db_manager.execute_many("""
+                INSERT OR REPLACE INTO fuse_characteristics
+                (manufacturer, fuse_type, rating, series, voltage_rating, breaking_capacity, temperature,
+                 point_count, multipliers, melting_times, clearing_times, notes, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+
+        if prune:
+            manufacturers = {key[0] for key in records}
+            removed = [(curve_id,) for key, (curve_id, _) in stored.items()
+                       if key[0] in manufacturers and key not in records]
+            if removed:
+                db_manager.execute_many("DELETE FROM fuse_characteristics WHERE id = ?", removed)
+            counts['removed'] = len(removed)
+
+    logger.info("Fuse curves imported: {added} added, {updated} updated, "
+                "{unchanged} unchanged, {removed} removed".format(**counts))
+    return counts
+
+
+def import_csv(db_manager, path, prune=False):
+    """Import a manufacturer CSV dataset; see import_curves."""
+    return import_curves(db_manager, read_csv(path), prune)
@@ -1,211 +1,361 @@
 import os
-from PySide6.QtCore import QObject, Signal, Slot, Property, QTimer, QUrl
-from PySide6.QtQml import QQmlComponent
+import re
+import json
+import time
+from pathlib import Path
+from PySide6.QtCore import QObject, Signal, Slot, Property, QTimer, QUrl, QEvent, QSettings, QCoreApplication
+from PySide6.QtQml import QQmlComponent, QQmlEngine
+from PySide6.QtQuick import QQuickItem
+
+from services.logger_config import configure_logger
+from services.startup_profiler import StartupProfiler
+
+logger = configure_logger("qmltest", component="preload_manager")
+
+DEFAULT_QML_ROOT = Path(__file__).resolve().parent.parent / "qml"
+
+# Per-user page usage counts (JSON object of qml-relative path -> count)
+USAGE_SETTINGS_KEY = "preload/usage_counts"
+
+# Most-used pages preloaded regardless of the visible page
+MAX_USAGE_PRELOADS = 12
+
+# Preloading waits until there has been no user input for this long
+IDLE_DELAY_MS = 300
+IDLE_CHECK_INTERVAL_MS = 50
+
+# Score bonus that puts pages linked from the visible page first
+LINKED_PAGE_BONUS = 1_000_000
+
+_QML_LITERAL_PATTERN = re.compile(r'"([^"\n]+\.qml)"')
+_MENU_REFERENCE_PATTERN = re.compile(r'MenuItems\.(\w+)')
+_MENU_CATEGORY_PATTERN = re.compile(r'property\s+var\s+(\w+)\s*:\s*\[(.*?)\n\s*\]', re.DOTALL)
+_MENU_SOURCE_PATTERN = re.compile(r'source:\s*"([^"]+\.qml)"')
+
+
+class _InputActivityFilter(QObject):
+    """Application event filter recording when the user last interacted."""
+
+    INPUT_EVENTS = {
+        QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease, QEvent.Type.MouseMove,
+        QEvent.Type.KeyPress, QEvent.Type.KeyRelease, QEvent.Type.Wheel,
+        QEvent.Type.TouchBegin, QEvent.Type.TouchUpdate,
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.last_input = 0.0
+
+    def eventFilter(self, obj, event):
+        if event.type() in self.INPUT_EVENTS:
+            self.last_input = time.perf_counter()
+        return False
+
 
 class PreloadManager(QObject):
-    """Manages preloading of QML components during application startup
-    
-    This class efficiently preloads QML components during application startup,
-    reducing delays when components are first used during normal operation.
-    It handles errors gracefully and provides status updates to the UI.
+    """Manages background compilation of QML pages the user is likely to open
+
+    Components are compiled with QQmlComponent.Asynchronous, one at a time,
+    and only while the user is idle. Candidates are ordered by how often the
+    user has opened them (persisted per user in QSettings) and by whether they
+    are linked from the currently visible page; pages that are neither are
+    never compiled ahead of time.
     """
-    
+
     # Signals
     loadingProgressChanged = Signal(float)
     statusMessageChanged = Signal(str)
     loadingFinished = Signal()
-    
-    def __init__(self, parent=None):
+
+    def __init__(self, parent=None, qml_root=None):
         super().__init__(parent)
         self._progress = 0.0
         self._status_message = "Initializing..."
         self._components_to_load = []
+        self._components_by_key = {}
         self._loading_timer = None
         self._cache = {}
         self._error_count = 0
+        self._loaded_count = 0
         self._processed_files = set()
         self._engine = None
-        self._preload_in_batches = True
-        self._batch_size = 5  # Process 5 components at once for better performance
-    
+        self._qml_root = Path(qml_root) if qml_root else DEFAULT_QML_ROOT
+        self._queue = []
+        self._in_flight = None
+        self._visible_page = None
+        self._stack_view = None
+        self._menu_categories = None
+        self._usage = self._load_usage()
+        self._input_filter = None
+        self._profiler = StartupProfiler.get_instance()
+
     @Property(float, notify=loadingProgressChanged)
     def progress(self):
         """Current loading progress from 0.0 to 1.0"""
         return self._progress
-    
+
     @Property(str, notify=statusMessageChanged)
     def statusMessage(self):
         """Current loading status message"""
         return self._status_message
-    
+
     def _update_progress(self, value):
         """Update loading progress"""
         self._progress = value
         self.loadingProgressChanged.emit(value)
-    
+
     def _update_status(self, message):
         """Update status message"""
         self._status_message = message
         self.statusMessageChanged.emit(message)
-    
+
+    def _key(self, path):
+        """Stable usage key for a file: its path relative to the QML root"""
+        try:
+            return Path(os.path.abspath(path)).relative_to(self._qml_root).as_posix()
+        except ValueError:
+            return Path(os.path.abspath(path)).as_posix()
+
     def add_component(self, path, description=None):
         """Add a component to preload, but only if it passes filtering"""
         # Skip if already processed
         normalized_path = os.path.normpath(path)
         if normalized_path in self._processed_files:
             return
-            
-        # Add valid files
-        if os.path.exists(path):
-            if os.path.getsize(path) == 0:
-                # Skip empty files silently
-                self._processed_files.add(normalized_path)
-                return
-                
-            self._components_to_load.append({
+        self._processed_files.add(normalized_path)
+
+        # Add valid files, skipping empty ones silently
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            component = {
                 'path': path,
+                'key': self._key(path),
                 'description': description or os.path.basename(path),
                 'loaded': False
-            })
-            self._processed_files.add(normalized_path)
-        else:
-            self._processed_files.add(normalized_path)
-    
+            }
+            self._components_to_load.append(component)
+            self._components_by_key[component['key']] = component
+
     def add_directory(self, directory, filter_ext='.qml'):
         """Recursively add all components from a directory"""
         if not os.path.exists(directory):
             # Silently skip non-existent directories
             return
-            
+
         for root, dirs, files in os.walk(directory):
             for file in files:
                 if file.endswith(filter_ext):
                     path = os.path.join(root, file)
                     rel_path = os.path.relpath(path, directory)
                     self.add_component(path, rel_path)
-    
+
     def start_preloading(self, qml_engine):
-        """Start preloading components"""
+        """Start preloading components in idle time"""
         self._engine = qml_engine
-        
-        # Skip preloading if no components were found
-        if not self._components_to_load:
+
+        app = QCoreApplication.instance()
+        if app is not None and self._input_filter is None:
+            self._input_filter = _InputActivityFilter(self)
+            app.installEventFilter(self._input_filter)
+
+        self._loading_timer = QTimer(self)
+        self._loading_timer.setInterval(IDLE_CHECK_INTERVAL_MS)
+        self._loading_timer.timeout.connect(self._on_idle_tick)
+
+        self._reschedule()
+        if not self._queue:
             self._update_status("No components to preload")
             self._update_progress(1.0)
             self.loadingFinished.emit()
             return
-        
-        # Create a QTimer for smooth progress updates and loading
-        self._loading_timer = QTimer(self)
-        
-        if self._preload_in_batches:
-            self._loading_timer.timeout.connect(self._load_component_batch)
-            self._loading_timer.start(10)  # Shorter interval for batch processing
-        else:
-            self._loading_timer.timeout.connect(self._load_next_component)
-            self._loading_timer.start(5)  # Load components every 5ms
-        
-        self._update_status(f"Preloading {len(self._components_to_load)} components...")
+
+        self._update_status(f"Preloading {len(self._queue)} components...")
         self._update_progress(0.01)
-    
+        self._loading_timer.start()
+
+    def track_navigation(self, stack_view):
+        """Follow the visible page of a StackView to record usage and reprioritise"""
+        self._stack_view = stack_view
+        stack_view.currentItemChanged.connect(self._on_current_item_changed)
+        self._on_current_item_changed()
+
     @Slot()
-    def _load_component_batch(self):
-        """Load a batch of components for better performance"""
-        batch_loaded = 0
-        components_remaining = False
-        
-        # Process a batch of components
-        for i, component in enumerate(self._components_to_load):
-            if not component['loaded']:
-                self._load_component(i)
-                batch_loaded += 1
-                components_remaining = True
-                
-                # Stop after processing batch_size components
-                if batch_loaded >= self._batch_size:
+    def _on_current_item_changed(self):
+        """Record a page visit and move the pages it links to up the queue"""
+        if self._stack_view is None:
+            return
+        item = self._stack_view.property("currentItem")
+        context = QQmlEngine.contextForObject(item) if isinstance(item, QQuickItem) else None
+        if context is None or not context.baseUrl().isLocalFile():
+            return
+
+        key = self._key(context.baseUrl().toLocalFile())
+        if key == self._visible_page:
+            return
+        self._visible_page = key
+        self._usage[key] = self._usage.get(key, 0) + 1
+        self._save_usage()
+
+        if self._engine is not None:
+            self._reschedule()
+            if self._queue and self._loading_timer is not None and not self._loading_timer.isActive():
+                self._loading_timer.start()
+
+    def _load_usage(self):
+        """Read per-user page usage counts"""
+        try:
+            usage = json.loads(QSettings().value(USAGE_SETTINGS_KEY, "{}") or "{}")
+            return {str(key): int(count) for key, count in usage.items()}
+        except (TypeError, ValueError):
+            return {}
+
+    def _save_usage(self):
+        QSettings().setValue(USAGE_SETTINGS_KEY, json.dumps(self._usage))
+
+    def _menu_sources(self):
+        """Component sources per MenuItems category, parsed once"""
+        if self._menu_categories is None:
+            self._menu_categories = {}
+            menu_file = self._qml_root / "components" / "menus" / "MenuItems.qml"
+            try:
+                text = menu_file.read_text(encoding="utf-8")
+            except OSError:
+                return self._menu_categories
+            for category, body in _MENU_CATEGORY_PATTERN.findall(text):
+                self._menu_categories[category] = _MENU_SOURCE_PATTERN.findall(body)
+        return self._menu_categories
+
+    def _linked_components(self, key):
+        """Keys of components a page can navigate to (QML literals and menu categories)"""
+        page = self._components_by_key.get(key)
+        path = Path(page['path']) if page else self._qml_root / key
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError:
+            return set()
+
+        sources = _QML_LITERAL_PATTERN.findall(text)
+        menus = self._menu_sources()
+        for category in _MENU_REFERENCE_PATTERN.findall(text):
+            sources.extend(menus.get(category, []))
+
+        linked = set()
+        for source in sources:
+            for base in (path.parent, self._qml_root):
+                candidate = self._key(os.path.normpath(base / source))
+                if candidate in self._components_by_key:
+                    linked.add(candidate)
                     break
-        
-        # Update overall progress
-        loaded_count = sum(1 for c in self._components_to_load if c['loaded'])
-        total_count = len(self._components_to_load)
-        self._update_progress(loaded_count / total_count)
-        
-        # Check if we're done
-        if not components_remaining or loaded_count >= total_count:
-            self._loading_timer.stop()
-            self._update_status(f"Preloading complete ({loaded_count} components, {self._error_count} errors)")
-            self._update_progress(1.0)
-            self.loadingFinished.emit()
-    
+        linked.discard(key)
+        return linked
+
+    def _reschedule(self):
+        """Rebuild the queue: pages linked from the visible one first, then by usage"""
+        linked = self._linked_components(self._visible_page) if self._visible_page else set()
+        popular = sorted((key for key, count in self._usage.items()
+                          if count > 0 and key in self._components_by_key),
+                         key=lambda key: self._usage[key], reverse=True)[:MAX_USAGE_PRELOADS]
+
+        scores = {}
+        for key in popular:
+            scores[key] = self._usage[key]
+        for key in linked:
+            scores[key] = LINKED_PAGE_BONUS + self._usage.get(key, 0)
+        # The visible page is already compiled
+        scores.pop(self._visible_page, None)
+
+        self._queue = sorted(
+            (self._components_by_key[key] for key in scores
+             if not self._components_by_key[key]['loaded'] and self._components_by_key[key] is not self._in_flight),
+            key=lambda component: scores[component['key']],
+            reverse=True
+        )
+
+    def _user_is_idle(self):
+        if self._input_filter is None:
+            return True
+        return (time.perf_counter() - self._input_filter.last_input) * 1000 >= IDLE_DELAY_MS
+
     @Slot()
-    def _load_next_component(self):
-        """Load the next component in the queue (single component mode)"""
-        # Find next unloaded component
-        for i, component in enumerate(self._components_to_load):
-            if not component['loaded']:
-                self._load_component(i)
-                # Update overall progress
-                loaded_count = sum(1 for c in self._components_to_load if c['loaded'])
-                total_count = len(self._components_to_load)
-                self._update_progress(loaded_count / total_count)
-                return
-        
-        # All components loaded
-        self._loading_timer.stop()
-        self._update_status(f"Preloading complete ({len(self._components_to_load)} components)")
-        self._update_progress(1.0)
-        self.loadingFinished.emit()
-    
-    def _load_component(self, index):
-        """Load a specific component"""
-        component = self._components_to_load[index]
-        
+    def _on_idle_tick(self):
+        """Start the next compile when nothing is in flight and the user is idle"""
+        if self._in_flight is not None or not self._user_is_idle():
+            return
+        while self._queue and self._queue[0]['loaded']:
+            self._queue.pop(0)
+        if not self._queue:
+            self._loading_timer.stop()
+            self._finish()
+            return
+        self._load_component(self._queue.pop(0))
+
+    def _load_component(self, component):
+        """Begin asynchronous compilation of a component"""
+        self._in_flight = component
+        component['started'] = time.perf_counter()
         try:
-            # Load component into cache
-            url = QUrl.fromLocalFile(component['path'])
-            qml_component = QQmlComponent(self._engine, url)
-            
-            # Use minimal waiting for loading to avoid blocking UI
-            if qml_component.isLoading():
-                # Mark for later loading instead of waiting
-                component['component'] = qml_component
-                # Will be checked on next timer tick
-                return
-            
-            # Handle errors silently
-            if qml_component.isError():
-                self._error_count += 1
-                # Don't print errors to console to avoid spam
-            else:
-                # Cache the component
-                self._cache[component['path']] = qml_component
-            
-            # Mark as loaded regardless of outcome
-            component['loaded'] = True
-            
-        except Exception:
-            component['loaded'] = True  # Mark as loaded to avoid getting stuck
+            qml_component = QQmlComponent(self._engine, self)
+            component['component'] = qml_component
+            qml_component.statusChanged.connect(
+                lambda status, component=component: self._on_component_status(component, status))
+            qml_component.loadUrl(QUrl.fromLocalFile(component['path']), QQmlComponent.CompilationMode.Asynchronous)
+            # Components already in the engine's type cache complete synchronously
+            self._on_component_status(component, qml_component.status())
+        except Exception as e:
+            logger.debug(f"Could not preload {component['description']}: {e}")
+            self._complete(component, error=True)
+
+    def _on_component_status(self, component, status):
+        if component['loaded'] or status in (QQmlComponent.Status.Loading, QQmlComponent.Status.Null):
+            return
+        error = status == QQmlComponent.Status.Error
+        if error:
+            component['component'].deleteLater()
+        else:
+            # Cache the component
+            self._cache[component['path']] = component['component']
+        self._complete(component, error=error)
+
+    def _complete(self, component, error):
+        """Mark a component done and update progress"""
+        component['loaded'] = True
+        component.pop('component', None)
+        if error:
             self._error_count += 1
-    
+        self._loaded_count += 1
+        self._profiler.record_qml(component['description'], component.pop('started', time.perf_counter()),
+                                  error=error)
+        if self._in_flight is component:
+            self._in_flight = None
+
+        remaining = len(self._queue)
+        total = self._loaded_count + remaining
+        self._update_progress(self._loaded_count / total if total else 1.0)
+
+    def _finish(self):
+        self._update_status(f"Preloading complete ({self._loaded_count} components, {self._error_count} errors)")
+        self._update_progress(1.0)
+        self.loadingFinished.emit()
+
     def get_component(self, path):
         """Retrieve a preloaded component if available"""
         return self._cache.get(path)
-    
+
     def get_stats(self):
         """Return statistics about preloaded components"""
         return {
             "total_components": len(self._components_to_load),
-            "loaded_components": sum(1 for c in self._components_to_load if c['loaded']),
+            "loaded_components": self._loaded_count,
+            "queued_components": len(self._queue),
             "error_count": self._error_count,
             "cache_size": len(self._cache)
         }
-    
+
     def find_missing_calculators(self, base_path):
         """Find calculator files that aren't being preloaded"""
         all_calculators = []
         known_calculators = []
         missing_calculators = []
-        
+
         # Recursively find all calculator QML files
         calculator_path = os.path.join(base_path, "qml", "calculators")
         if os.path.exists(calculator_path):
@@ -213,30 +363,30 @@ class PreloadManager(QObject):
                 for file in files:
                     if file.endswith('.qml'):
                         all_calculators.append(os.path.join(root, file))
-        
+
         # Check which ones are already in our loading list
         for component in self._components_to_load:
             if "calculators" in component['path']:
                 known_calculators.append(component['path'])
-        
+
         # Find calculators that aren't being loaded
         for calculator in all_calculators:
             normalized_path = os.path.normpath(calculator)
             if normalized_path not in known_calculators and normalized_path not in self._processed_files:
                 missing_calculators.append(normalized_path)
-        
+
         return missing_calculators
-    
+
     def add_missing_calculators(self, base_path):
         """Add any missing calculator files to the preload list"""
         missing = self.find_missing_calculators(base_path)
         added_count = 0
-        
+
         for calculator_path in missing:
             self.add_component(calculator_path)
             added_count += 1
-            
+
         if added_count > 0:
             print(f"Added {added_count} missing calculators to preload list")
-            
-        return added_count
\ No newline at end of file
+
+        return added_count
@@ -0,0 +1,224 @@
+"""Process pool for CPU-bound numeric kernels.
+
+Python threads serialise most NumPy/PyWavelets glue code on the GIL, so the
+heaviest transform kernels can be sharded across worker processes instead.
+Sample arrays are handed over through ``multiprocessing.shared_memory``
+rather than pickled, and each worker writes its slice of the result straight
+into a shared output buffer.
+
+Kernels are plain module-level functions with the signature::
+
+    kernel(inputs: Dict[str, np.ndarray], out: np.ndarray, start: int, stop: int, **params)
+
+and must fill ``out[start:stop]``. The same function is used inline when the
+work is too small to be worth a process hop or the pool is unavailable.
+"""
+import importlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import psutil
+
+from services.logger_config import configure_logger
+
+logger = configure_logger("qmltest", component="process_pool")
+
+# Work units (samples x evaluations) below which kernels run inline
+DEFAULT_OFFLOAD_THRESHOLD = 4_000_000
+
+# Modules imported by every worker during warm-up
+WARM_MODULES = ("numpy", "models.fourier_laplace_z.kernels")
+
+
+class SharedArray:
+    """NumPy array backed by a named shared memory block."""
+
+    def __init__(self, shape: Tuple[int, ...], dtype):
+        dtype = np.dtype(dtype)
+        nbytes = max(1, int(np.prod(shape)) * dtype.itemsize)
+        self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf)
+
+    @classmethod
+    def from_array(cls, values: np.ndarray) -> "SharedArray":
+        """Copy an existing array into shared memory."""
+        values = np.ascontiguousarray(values)
+        shared = cls(values.shape, values.dtype)
+        shared.array[...] = values
+        return shared
+
+    @property
+    def spec(self) -> Tuple[str, Tuple[int, ...], str]:
+        """Picklable descriptor used by workers to attach to the block."""
+        return self._shm.name, self.array.shape, self.array.dtype.str
+
+    def release(self) -> None:
+        """Drop the array view, close and unlink the block."""
+        self.array = None
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _attach(spec: Tuple[str, Tuple[int, ...], str]):
+    """Attach to a shared block created by the parent process."""
+    name, shape, dtype = spec
+    # Workers share the parent's resource tracker, so the parent's unlink
+    # also clears the registration made here
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def _warm_worker(modules: Iterable[str]) -> int:
+    """Import the kernel modules so the first real task pays no import cost."""
+    for module in modules:
+        importlib.import_module(module)
+    return multiprocessing.current_process().pid
+
+
+def _run_kernel(kernel: Callable, input_specs: Dict[str, tuple], out_spec: tuple,
+                start: int, stop: int, params: dict) -> None:
+    """Worker entry point: attach shared buffers and run one shard."""
+    blocks = []
+    try:
+        inputs = {}
+        for key, spec in input_specs.items():
+            shm, array = _attach(spec)
+            blocks.append(shm)
+            inputs[key] = array
+        shm, out = _attach(out_spec)
+        blocks.append(shm)
+        kernel(inputs, out, start, stop, **params)
+        del inputs, out
+    finally:
+        for shm in blocks:
+            shm.close()
+
+
+class ProcessKernelPool:
+    """Shared process pool for sharding numeric kernels across cores."""
+
+    _instance = None
+    _lock = threading.RLock()
+
+    @classmethod
+    def get_instance(cls):
+        """Get or create the singleton instance."""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD):
+        if max_workers is None:
+            cpu_count = psutil.cpu_count(logical=False) or 2
+            max_workers = max(1, cpu_count - 1)
+        self._max_workers = max_workers
+        self.offload_threshold = offload_threshold
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._available = True
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Create the executor on first use; spawn keeps Qt state out of workers."""
+        with self._lock:
+            if self._executor is None and self._available:
+                try:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self._max_workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                except Exception as e:
+                    logger.warning(f"Process pool unavailable, running kernels inline: {e}")
+                    self._available = False
+            return self._executor
+
+    def warm_up(self, modules: Iterable[str] = WARM_MODULES) -> None:
+        """Start every worker process and pre-import kernel modules (non-blocking)."""
+        executor = self._get_executor()
+        if executor is None:
+            return
+        modules = tuple(modules)
+        for _ in range(self._max_workers):
+            executor.submit(_warm_worker, modules)
+
+    def should_offload(self, work_units: int) -> bool:
+        """Check whether a job is large enough to benefit from other processes."""
+        return self._available and self._max_workers > 1 and work_units >= self.offload_threshold
+
+    def run_sharded(self, kernel: Callable, inputs: Dict[str, np.ndarray],
+                    out_shape: Tuple[int, ...], out_dtype, work_units: int = 0,
+                    **params) -> np.ndarray:
+        """Run kernel over the leading axis of the output, sharded across workers.
+
+        Falls back to a single inline call when the work is below the offload
+        threshold or the pool cannot be used.
+        """
+        out_shape = tuple(out_shape)
+        length = out_shape[0] if out_shape else 0
+
+        if length < 2 or not self.should_offload(work_units):
+            return self._run_inline(kernel, inputs, out_shape, out_dtype, params)
+
+        executor = self._get_executor()
+        if executor is None:
+            return self._run_inline(kernel, inputs, out_shape, out_dtype, params)
+
+        shared_inputs = {}
+        shared_out = None
+        try:
+            for key, value in inputs.items():
+                shared_inputs[key] = SharedArray.from_array(np.asarray(value))
+            shared_out = SharedArray(out_shape, out_dtype)
+
+            specs = {key: shared.spec for key, shared in shared_inputs.items()}
+            shards = min(self._max_workers, length)
+            bounds = np.linspace(0, length, shards + 1).astype(int)
+            futures = [
+                executor.submit(_run_kernel, kernel, specs, shared_out.spec,
+                                int(start), int(stop), params)
+                for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start
+            ]
+            wait(futures)
+            for future in futures:
+                future.result()  # Re-raise worker errors
+            return shared_out.array.copy()
+        except Exception as e:
+            logger.warning(f"Process pool run of {kernel.__name__} failed, running inline: {e}")
+            return self._run_inline(kernel, inputs, out_shape, out_dtype, params)
+        finally:
+            for shared in shared_inputs.values():
+                shared.release()
+            if shared_out is not None:
+                shared_out.release()
+
+    @staticmethod
+    def _run_inline(kernel: Callable, inputs: Dict[str, np.ndarray], out_shape,
+                    out_dtype, params: dict) -> np.ndarray:
+        out = np.empty(out_shape, dtype=out_dtype)
+        kernel({key: np.asarray(value) for key, value in inputs.items()},
+               out, 0, out_shape[0] if out_shape else 0, **params)
+        return out
+
+    def shutdown(self) -> None:
+        """Cancel queued shards and join all worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -1,55 +1,186 @@
-from PySide6.QtCore import QUrl
-from PySide6.QtQml import qmlRegisterSingletonType, qmlRegisterType
+"""QML type registration.
+
+Calculator classes are registered lazily: each QML module URI is mapped to
+the Python module and class that implement it, and the class is imported and
+registered only when the QML engine first resolves an ``import <URI>``
+statement. Most sessions use a handful of calculators, so the heavy
+dependencies of the rest (pandas, scipy, matplotlib, reportlab, pywt) are
+never imported before the first window appears.
 
+Imports are resolved through a ``QQmlAbstractUrlInterceptor``: the type loader
+asks for ``<URI>/qmldir`` on each import path before compiling a component
+that imports the module, and the interceptor registers the pending types at
+that moment.
+"""
+import importlib
 import os
+import sys
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from PySide6.QtCore import QUrl
+from PySide6.QtQml import QQmlAbstractUrlInterceptor, qmlRegisterSingletonType, qmlRegisterType
 
-from models.voltdrop.voltage_drop_orion import VoltageDropCalculator
-from models.theory.real_time_chart import RealTimeChart
-from models.basic.calculator import ConversionCalculator, PowerCalculator, ImpedanceCalculator, ChargingCalculator, KwFromCurrentCalculator
-from models.theory.transformer_calculator import TransformerCalculator
-from models.cable.voltage_drop_calculator import VoltageDropCalc
-from models.theory.motor_calculator import MotorCalculator
-from models.basic.power_factor_correction import PowerFactorCorrectionCalculator
-from models.cable.cable_ampacity import CableAmpacityCalculator
-from models.protection.protection_relay import ProtectionRelayCalculator
-from models.theory.harmonic_analysis import HarmonicAnalysisCalculator
-from models.theory.instrument_transformer import InstrumentTransformerCalculator
-from models.protection.discrimination_analyzer import DiscriminationAnalyzer
-from models.cable.charging_calculator import ChargingCalculator
-from models.protection.battery_calculator import BatteryCalculator
-from models.theory.machine_calculator import MachineCalculator
-from models.protection.earthing_calculator import EarthingCalculator
-from models.cable.transmission_calculator import TransmissionLineCalculator
-from models.protection.open_delta_transformer import DeltaTransformerCalculator
-from models.cable.switchboard_manager import SwitchboardManager
-from models.grid_wind.wind_turbine_calculator import WindTurbineCalculator
-from models.protection.transformer_line_calculator import TransformerLineCalculator
-from models.protection.fault_current_calculator import FaultCurrentCalculator
-from models.protection.ref_rgf_calculator import RefRgfCalculator
-from models.basic.voltage_divider_calculator import VoltageDividerCalculator
-from models.basic.ohms_law_calculator import OhmsLawCalculator
-from models.theory.sequence_component_calculator import SequenceComponentCalculator
-from utils.series_helper import SeriesHelper
-from models.theory.three_phase import ThreePhaseSineWaveModel
-from models.theory.rlc import RLCChart
-from models.protection.overcurrent_calculator import OvercurrentProtectionCalculator
-from models.protection.solkor_rf_calculator import SolkorRfCalculator
-from models.protection.vr32_cl7_calculator import VR32CL7Calculator
 from models.voltdrop.results_manager import ResultsManager
 from services.logger import QLogManager
-from models.theory.transformer_naming import TransformerNamingGuide
-from models.basic.base_impedance_calculator import BaseImpedanceCalculator
-from models.basic.per_unit_impedance_calculator import PerUnitImpedanceCalculator
-from models.cable.network_cabinet_calculator import NetworkCabinetCalculator
-from models.fourier_laplace_z.transform_calculator import TransformCalculator
-from models.fourier_laplace_z.z_transform_calculator import ZTransformCalculator
-from models.theory.calculus_calculator import CalculusCalculator
-from models.protection.lightning_protection_calculator import LightningProtectionCalculator
-from models.templates.wind_turbine_protection import WindTurbineProtectionTemplate
+from services.logger_config import configure_logger
+
+logger = configure_logger("qmltest", component="qml_types")
+
+# Imports before the first window should stay below this (seconds)
+STARTUP_IMPORT_BUDGET = 1.5
+
+# Third-party packages that should not be loaded by startup alone
+HEAVY_PACKAGES = ("pandas", "scipy", "matplotlib", "reportlab", "pywt")
+
+
+class QmlTypeSpec(NamedTuple):
+    """A QML type and the Python class implementing it."""
+    module: str
+    class_name: str
+    uri: str
+    major: int
+    minor: int
+    qml_name: str
+
+
+# All calculator types, registered on first import from QML
+QML_TYPES = (
+    QmlTypeSpec("models.cable.charging_calculator", "ChargingCalculator", "Charging", 1, 0, "ChargingCalculator"),
+    QmlTypeSpec("models.basic.calculator", "PowerCalculator", "PCalculator", 1, 0, "PowerCalculator"),
+    QmlTypeSpec("models.basic.calculator", "ImpedanceCalculator", "Impedance", 1, 0, "ImpedanceCalculator"),
+    QmlTypeSpec("models.theory.transformer_calculator", "TransformerCalculator", "Transformer", 1, 0, "TransformerCalculator"),
+    QmlTypeSpec("models.theory.motor_calculator", "MotorCalculator", "MotorStarting", 1, 0, "MotorStartingCalculator"),
+    QmlTypeSpec("models.basic.power_factor_correction", "PowerFactorCorrectionCalculator", "PFCorrection", 1, 0, "PowerFactorCorrectionCalculator"),
+    QmlTypeSpec("models.cable.cable_ampacity", "CableAmpacityCalculator", "CableAmpacity", 1, 0, "AmpacityCalculator"),
+    QmlTypeSpec("models.protection.protection_relay", "ProtectionRelayCalculator", "ProtectionRelay", 1, 0, "ProtectionRelayCalculator"),
+    QmlTypeSpec("models.theory.harmonic_analysis", "HarmonicAnalysisCalculator", "HarmonicAnalysis", 1, 0, "HarmonicAnalysisCalculator"),
+    QmlTypeSpec("models.theory.instrument_transformer", "InstrumentTransformerCalculator", "InstrumentTransformer", 1, 0, "InstrumentTransformerCalculator"),
+    QmlTypeSpec("models.protection.discrimination_analyzer", "DiscriminationAnalyzer", "DiscriminationAnalyzer", 1, 0, "DiscriminationAnalyzer"),
+    QmlTypeSpec("models.voltdrop.voltage_drop_orion", "VoltageDropCalculator", "VDrop", 1, 0, "VoltageDropCalculator"),
+    QmlTypeSpec("models.theory.real_time_chart", "RealTimeChart", "RealTime", 1, 0, "RealTimeChart"),
+    QmlTypeSpec("models.theory.three_phase", "ThreePhaseSineWaveModel", "Sine", 1, 0, "ThreePhaseSineWaveModel"),
+    QmlTypeSpec("models.cable.voltage_drop_calculator", "VoltageDropCalc", "VoltageDrop", 1, 0, "VoltageDropCalc"),
+    QmlTypeSpec("models.protection.battery_calculator", "BatteryCalculator", "Battery", 1, 0, "BatteryCalculator"),
+    QmlTypeSpec("models.basic.calculator", "ConversionCalculator", "Conversion", 1, 0, "ConversionCalculator"),
+    QmlTypeSpec("models.theory.machine_calculator", "MachineCalculator", "Machine", 1, 0, "MachineCalculator"),
+    QmlTypeSpec("models.protection.earthing_calculator", "EarthingCalculator", "Earthing", 1, 0, "EarthingCalculator"),
+    QmlTypeSpec("models.cable.transmission_calculator", "TransmissionLineCalculator", "Transmission", 1, 0, "TransmissionLineCalculator"),
+    QmlTypeSpec("models.protection.open_delta_transformer", "DeltaTransformerCalculator", "DeltaTransformer", 1, 0, "DeltaTransformerCalculator"),
+    QmlTypeSpec("utils.series_helper", "SeriesHelper", "SeriesHelper", 1, 0, "SeriesHelper"),
+    QmlTypeSpec("models.protection.ref_rgf_calculator", "RefRgfCalculator", "RefRgf", 1, 0, "RefRgfCalculator"),
+    QmlTypeSpec("models.basic.calculator", "KwFromCurrentCalculator", "KwFromCurrent", 1, 0, "KwFromCurrentCalculator"),
+    QmlTypeSpec("models.cable.switchboard_manager", "SwitchboardManager", "Switchboard", 1, 0, "SwitchboardManager"),
+    QmlTypeSpec("models.grid_wind.wind_turbine_calculator", "WindTurbineCalculator", "WindTurbine", 1, 0, "WindTurbineCalculator"),
+    QmlTypeSpec("models.basic.ohms_law_calculator", "OhmsLawCalculator", "OhmsLaw", 1, 0, "OhmsLawCalculator"),
+    QmlTypeSpec("models.protection.transformer_line_calculator", "TransformerLineCalculator", "TransformerLine", 1, 0, "TransformerLineCalculator"),
+    QmlTypeSpec("models.protection.fault_current_calculator", "FaultCurrentCalculator", "FaultCurrent", 1, 0, "FaultCurrentCalculator"),
+    QmlTypeSpec("models.basic.voltage_divider_calculator", "VoltageDividerCalculator", "VoltDivider", 1, 0, "VoltageDividerCalculator"),
+    QmlTypeSpec("models.theory.rlc", "RLCChart", "RLC", 1, 0, "RLCChart"),
+    QmlTypeSpec("models.protection.solkor_rf_calculator", "SolkorRfCalculator", "SolkorRfCalculator", 1, 0, "SolkorRfCalculator"),
+    QmlTypeSpec("models.protection.vr32_cl7_calculator", "VR32CL7Calculator", "VR32CL7Calculator", 1, 0, "VR32CL7Calculator"),
+    QmlTypeSpec("models.protection.overcurrent_calculator", "OvercurrentProtectionCalculator", "OvercurrentProtectionCalculator", 1, 0, "OvercurrentProtectionCalculator"),
+    QmlTypeSpec("models.theory.transformer_naming", "TransformerNamingGuide", "TransformerNamingGuide", 1, 0, "TransformerNamingGuide"),
+    QmlTypeSpec("models.basic.base_impedance_calculator", "BaseImpedanceCalculator", "BaseImpedanceCalculator", 1, 0, "BaseImpedanceCalculator"),
+    QmlTypeSpec("models.basic.per_unit_impedance_calculator", "PerUnitImpedanceCalculator", "PerUnitImpedance", 1, 0, "PerUnitImpedanceCalculator"),
+    QmlTypeSpec("models.cable.network_cabinet_calculator", "NetworkCabinetCalculator", "NetworkCabinetCalculator", 1, 0, "NetworkCabinetCalculator"),
+    QmlTypeSpec("models.theory.sequence_component_calculator", "SequenceComponentCalculator", "SequenceComponentCalculator", 1, 0, "SequenceComponentCalculator"),
+    QmlTypeSpec("models.fourier_laplace_z.transform_calculator", "TransformCalculator", "TransformCalculator", 1, 0, "TransformCalculator"),
+    QmlTypeSpec("models.fourier_laplace_z.z_transform_calculator", "ZTransformCalculator", "ZTransformCalculator", 1, 0, "ZTransformCalculator"),
+    QmlTypeSpec("models.theory.calculus_calculator", "CalculusCalculator", "Calculus", 1, 0, "CalculusCalculator"),
+    QmlTypeSpec("models.protection.lightning_protection_calculator", "LightningProtectionCalculator", "LightningProtectionCalculator", 1, 0, "LightningProtectionCalculator"),
+    QmlTypeSpec("models.templates.wind_turbine_protection", "WindTurbineProtectionTemplate", "WindTurbineProtection", 1, 0, "WindTurbineProtectionTemplate"),
+)
+
+
+class LazyTypeRegistry(QQmlAbstractUrlInterceptor):
+    """Registers QML types the first time the engine resolves their module.
+
+    The interceptor may be called from the QML type loader thread, so all
+    state is guarded by a lock; qmlRegisterType itself is thread-safe.
+    """
+
+    def __init__(self, specs=QML_TYPES):
+        super().__init__()
+        self._lock = threading.RLock()
+        self._pending: Dict[str, List[QmlTypeSpec]] = {}
+        for spec in specs:
+            self._pending.setdefault(spec.uri, []).append(spec)
+        # qmldir directories look like "App/Models" or "App/Models.1.0"
+        self._uri_paths = {uri.replace(".", "/"): uri for uri in self._pending}
+        self._load_times: List[tuple] = []
+
+    def intercept(self, url, data_type):
+        """Register the module an import is looking up; the URL is never changed."""
+        if data_type == QQmlAbstractUrlInterceptor.DataType.QmldirFile and self._pending:
+            uri = self._uri_for_qmldir(url.path())
+            if uri is not None:
+                self.register_uri(uri)
+        return url
+
+    def _uri_for_qmldir(self, path: str) -> Optional[str]:
+        """Map a qmldir lookup path to a pending module URI, if any."""
+        directory = path.rsplit("/qmldir", 1)[0]
+        for uri_path, uri in self._uri_paths.items():
+            if uri not in self._pending:
+                continue
+            if directory.endswith("/" + uri_path) or f"/{uri_path}." in directory:
+                return uri
+        return None
+
+    def register_uri(self, uri: str) -> bool:
+        """Import and register every type of a module URI (once)."""
+        with self._lock:
+            specs = self._pending.pop(uri, None)
+            if not specs:
+                return False
+
+            started = time.perf_counter()
+            for spec in specs:
+                try:
+                    type_class = getattr(importlib.import_module(spec.module), spec.class_name)
+                    qmlRegisterType(type_class, spec.uri, spec.major, spec.minor, spec.qml_name)
+                except Exception as e:
+                    logger.warning(f"Could not register type {spec.qml_name}: {e}")
+            elapsed = time.perf_counter() - started
+
+            self._load_times.append((uri, specs[0].module, elapsed))
+            logger.info(f"Registered QML module {uri} ({specs[0].module}) in {elapsed * 1000:.1f} ms")
+            return True
+
+    def register_all(self) -> None:
+        """Register every remaining type immediately (eager fallback)."""
+        for uri in list(self._pending):
+            self.register_uri(uri)
+
+    def is_registered(self, uri: str) -> bool:
+        with self._lock:
+            return uri not in self._pending
+
+    def import_report(self) -> List[tuple]:
+        """(uri, module, seconds) for each module loaded so far, slowest first."""
+        with self._lock:
+            return sorted(self._load_times, key=lambda entry: entry[2], reverse=True)
+
+
+_registry: Optional[LazyTypeRegistry] = None
+
+
+def get_type_registry() -> LazyTypeRegistry:
+    """Get the registry installed by register_qml_types."""
+    global _registry
+    if _registry is None:
+        _registry = LazyTypeRegistry()
+    return _registry
+
 
 def register_qml_types(engine, current_dir):
-    """Register all QML types and singletons."""
-    
+    """Register QML singletons and install lazy registration of calculator types.
+
+    Returns:
+        LazyTypeRegistry: The registry, kept alive for the engine's lifetime
+    """
     # Register Style singleton
     style_url = QUrl.fromLocalFile(os.path.join(current_dir, "qml", "components","style", "Style.qml"))
     menu_items_url = QUrl.fromLocalFile(os.path.join(current_dir, "qml", "components","menus", "MenuItems.qml"))
@@ -57,54 +188,34 @@ def register_qml_types(engine, current_dir):
     qmlRegisterSingletonType(style_url, "Style", 1, 0, "Style")
     qmlRegisterSingletonType(menu_items_url, "MenuItems", 1, 0, "MenuItems")
 
-    # Register common utility types
+    # Register common utility types (used by the main window itself)
     qmlRegisterType(ResultsManager, "App.Models", 1, 0, "ResultsManager")
     qmlRegisterType(QLogManager, "Logger", 1, 0, "LogManager")
 
-    # All types are now QObject subclasses
-    return [
-        (ChargingCalculator, "Charging", 1, 0, "ChargingCalculator"),
-        (PowerCalculator, "PCalculator", 1, 0, "PowerCalculator"),
-        (ImpedanceCalculator, "Impedance", 1, 0, "ImpedanceCalculator"),
-        (TransformerCalculator, "Transformer", 1, 0, "TransformerCalculator"),
-        (MotorCalculator, "MotorStarting", 1, 0, "MotorStartingCalculator"),
-        (PowerFactorCorrectionCalculator, "PFCorrection", 1, 0, "PowerFactorCorrectionCalculator"),
-        (CableAmpacityCalculator, "CableAmpacity", 1, 0, "AmpacityCalculator"),
-        (ProtectionRelayCalculator, "ProtectionRelay", 1, 0, "ProtectionRelayCalculator"),
-        (HarmonicAnalysisCalculator, "HarmonicAnalysis", 1, 0, "HarmonicAnalysisCalculator"),
-        (InstrumentTransformerCalculator, "InstrumentTransformer", 1, 0, "InstrumentTransformerCalculator"),
-        (DiscriminationAnalyzer, "DiscriminationAnalyzer", 1, 0, "DiscriminationAnalyzer"),
-        (VoltageDropCalculator, "VDrop", 1, 0, "VoltageDropCalculator"),
-        (RealTimeChart, "RealTime", 1, 0, "RealTimeChart"),
-        (ThreePhaseSineWaveModel, "Sine", 1, 0, "ThreePhaseSineWaveModel"),
-        (VoltageDropCalc, "VoltageDrop", 1, 0, "VoltageDropCalc"),
-        (BatteryCalculator, "Battery", 1, 0, "BatteryCalculator"),
-        (ConversionCalculator, "Conversion", 1, 0, "ConversionCalculator"),
-        (MachineCalculator, "Machine", 1, 0, "MachineCalculator"),
-        (EarthingCalculator, "Earthing", 1, 0, "EarthingCalculator"),
-        (TransmissionLineCalculator, "Transmission", 1, 0, "TransmissionLineCalculator"),
-        (DeltaTransformerCalculator, "DeltaTransformer", 1, 0, "DeltaTransformerCalculator"),
-        (SeriesHelper, "SeriesHelper", 1, 0, "SeriesHelper"),
-        (RefRgfCalculator, "RefRgf", 1, 0, "RefRgfCalculator"),
-        (KwFromCurrentCalculator, "KwFromCurrent", 1, 0, "KwFromCurrentCalculator"),
-        (SwitchboardManager, "Switchboard", 1, 0, "SwitchboardManager"),
-        (WindTurbineCalculator, "WindTurbine", 1, 0, "WindTurbineCalculator"),
-        (OhmsLawCalculator, "OhmsLaw", 1, 0, "OhmsLawCalculator"),
-        (TransformerLineCalculator, "TransformerLine", 1, 0, "TransformerLineCalculator"),
-        (FaultCurrentCalculator, "FaultCurrent", 1, 0, "FaultCurrentCalculator"),
-        (VoltageDividerCalculator, "VoltDivider", 1, 0, "VoltageDividerCalculator"),
-        (RLCChart, "RLC", 1, 0, "RLCChart"),
-        (SolkorRfCalculator, "SolkorRfCalculator", 1, 0, "SolkorRfCalculator"),
-        (VR32CL7Calculator, "VR32CL7Calculator", 1, 0, "VR32CL7Calculator"),
-        (OvercurrentProtectionCalculator, "OvercurrentProtectionCalculator", 1, 0, "OvercurrentProtectionCalculator"),
-        (TransformerNamingGuide, "TransformerNamingGuide", 1, 0, "TransformerNamingGuide"),
-        (BaseImpedanceCalculator, "BaseImpedanceCalculator", 1, 0, "BaseImpedanceCalculator"),
-        (PerUnitImpedanceCalculator, "PerUnitImpedance", 1, 0, "PerUnitImpedanceCalculator"),
-        (NetworkCabinetCalculator, "NetworkCabinetCalculator", 1, 0, "NetworkCabinetCalculator"),
-        (SequenceComponentCalculator, "SequenceComponentCalculator", 1, 0, "SequenceComponentCalculator"),
-        (TransformCalculator, "TransformCalculator", 1, 0, "TransformCalculator"),
-        (ZTransformCalculator, "ZTransformCalculator", 1, 0, "ZTransformCalculator"),
-        (CalculusCalculator, "Calculus", 1, 0, "CalculusCalculator"),
-        (LightningProtectionCalculator, "LightningProtectionCalculator", 1, 0, "LightningProtectionCalculator"),
-        (WindTurbineProtectionTemplate, "WindTurbineProtection", 1, 0, "WindTurbineProtectionTemplate"),
-    ]
+    # Calculator types are registered when a page first imports them
+    registry = get_type_registry()
+    engine.addUrlInterceptor(registry)
+    return registry
+
+
+def log_startup_import_report(module_import_time: float, budget: float = STARTUP_IMPORT_BUDGET) -> None:
+    """Log how long startup imports took and what they pulled in.
+
+    Args:
+        module_import_time: Seconds spent on the entry point's own imports
+        budget: Target for all imports before the first window; exceeding it
+            is logged as a warning
+    """
+    modules = get_type_registry().import_report()
+    elapsed = module_import_time + sum(seconds for _, _, seconds in modules)
+    heavy = [name for name in HEAVY_PACKAGES if name in sys.modules]
+
+    logger.info(f"Startup imports: {elapsed:.2f} s (budget {budget:.2f} s), "
+                f"{len(sys.modules)} modules loaded")
+    logger.info(f"  Application modules{'':<64} {module_import_time * 1000:8.1f} ms")
+    for uri, module, seconds in modules:
+        logger.info(f"  QML module {uri:<32} {module:<40} {seconds * 1000:8.1f} ms")
+    if heavy:
+        logger.info(f"  Heavy packages loaded: {', '.join(heavy)}")
+    if elapsed > budget:
+        logger.warning(f"Startup imports exceeded budget by {elapsed - budget:.2f} s")
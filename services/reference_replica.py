@@ -0,0 +1,156 @@
+"""Read-only in-memory replica of the static reference tables.
+
+The replica is a private ``:memory:`` database holding only the reference
+tables, created from their stored schema and filled with their rows, with the
+on-disk indexes rebuilt on top. Other tables, such as the calculation history,
+are never copied. DatabaseManager routes SELECTs that only touch reference
+tables here. It also keeps a version counter per table, bumped after every
+committed write, and the replica is rebuilt when a lookup touches a table
+whose version moved since the last copy.
+"""
+import logging
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+
+logger = logging.getLogger("qmltest.database.replica")
+
+# Tables that are seeded once and then only read by the calculators
+REFERENCE_TABLES = frozenset({
+    'cable_data',
+    'cable_materials',
+    'circuit_breakers',
+    'diversity_factors',
+    'fuse_characteristics',
+    'fuse_sizes',
+    'installation_methods',
+    'insulation_types',
+    'protection_curves',
+    'soil_resistivity',
+    'standards_reference',
+    'temperature_factors',
+    'voltage_systems',
+})
+
+_READ_TABLES = re.compile(r'\b(?:FROM|JOIN)\s+["`\[]?(\w+)', re.IGNORECASE)
+_WRITE_TABLES = re.compile(
+    r'\b(?:INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM|TABLE(?:\s+IF(?:\s+NOT)?\s+EXISTS)?)\s+["`\[]?(\w+)',
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=512)
+def read_tables(query):
+    """Tables read by a plain SELECT, or None for any other statement."""
+    if not query.lstrip().upper().startswith('SELECT'):
+        return None
+    return frozenset(name.lower() for name in _READ_TABLES.findall(query))
+
+
+@lru_cache(maxsize=512)
+def written_tables(query):
+    """Tables an INSERT/UPDATE/DELETE/DDL statement may modify."""
+    return frozenset(name.lower() for name in _WRITE_TABLES.findall(query))
+
+
+class ReferenceReplica:
+    """In-memory copy of the reference tables with version-based invalidation."""
+
+    def __init__(self, tables=REFERENCE_TABLES):
+        self.tables = frozenset(tables)
+        self._conn = None
+        self._versions = {}
+        self._unroutable = set()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.refreshes = 0
+
+    def covers(self, query):
+        """Tables of a query the replica can answer, or None."""
+        tables = read_tables(query)
+        if not tables or not tables <= self.tables or query in self._unroutable:
+            return None
+        return tables
+
+    def is_stale(self, tables, versions):
+        """True if never copied or any of the tables changed since the copy."""
+        if self._conn is None:
+            return True
+        return any(self._versions.get(name, 0) != versions.get(name, 0) for name in tables)
+
+    def refresh(self, source, versions):
+        """Copy the reference tables from a connection to the application database.
+
+        Args:
+            source: Open connection to the database to copy
+            versions: Table versions the copy corresponds to; take the snapshot
+                before calling so a concurrent write is never missed
+        """
+        replica = sqlite3.connect(":memory:", check_same_thread=False)
+        schema = source.execute(
+            "SELECT type, name, tbl_name, sql FROM sqlite_master "
+            "WHERE type IN ('table', 'index') AND sql IS NOT NULL AND name NOT LIKE 'sqlite_%'"
+        ).fetchall()
+        schema = [row for row in schema if row[2].lower() in self.tables]
+        names = [row[1] for row in schema if row[0] == 'table']
+
+        # Indexes are built after the rows are in, which is faster than
+        # maintaining them row by row
+        for kind, name, _, sql in schema:
+            if kind == 'table':
+                replica.execute(sql)
+                rows = source.execute(f'SELECT * FROM "{name}"')
+                columns = len(rows.description)
+                replica.executemany(
+                    f'INSERT INTO "{name}" VALUES ({", ".join("?" * columns)})', rows)
+        for kind, _, _, sql in schema:
+            if kind == 'index':
+                replica.execute(sql)
+        replica.commit()
+        replica.row_factory = sqlite3.Row
+
+        with self._lock:
+            previous, self._conn = self._conn, replica
+            self._versions = dict(versions)
+            self.refreshes += 1
+        if previous is not None:
+            previous.close()
+        logger.debug(f"Reference replica refreshed ({len(names)} tables copied)")
+
+    def lookup(self, query, params, tables, versions, source, one=False):
+        """Answer a read-only query, refreshing the copy first if it is stale.
+
+        Args:
+            query: SELECT over the given tables
+            params: Query parameters
+            tables: Tables the query reads, as returned by covers()
+            versions: Current table versions of the application database
+            source: Callable returning a context manager that yields a
+                connection to copy from
+            one: Return only the first row
+
+        Raises:
+            sqlite3.Error: If the query cannot run here; it is then excluded
+                from routing and the caller should use the database instead
+        """
+        with self._lock:
+            if self.is_stale(tables, versions):
+                snapshot = dict(versions)
+                with source() as conn:
+                    self.refresh(conn, snapshot)
+            try:
+                cursor = self._conn.execute(query, params)
+                result = cursor.fetchone() if one else cursor.fetchall()
+            except sqlite3.Error:
+                self._unroutable.add(query)
+                raise
+            self.hits += 1
+            return result
+
+    def close(self):
+        """Drop the in-memory copy; it is rebuilt on the next lookup."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
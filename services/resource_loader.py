@@ -0,0 +1,58 @@
+"""Registration of the application's compiled Qt resources.
+
+The preferred form is a binary ``data/resources.rcc`` built from
+``resources.qrc`` (see ``utils/build_resources.py``). ``QResource`` memory-maps
+it, so nothing is parsed or copied into the Python heap. The generated
+``data.rc_resources`` module, which embeds the same data as Python bytes, is
+only imported when the binary file is missing or cannot be registered.
+"""
+import importlib
+import os
+from pathlib import Path
+
+from PySide6.QtCore import QResource
+
+from services.logger_config import configure_logger
+
+logger = configure_logger("qmltest", component="resource_loader")
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_RCC_PATH = ROOT_DIR / "data" / "resources.rcc"
+QRC_PATH = ROOT_DIR / "resources.qrc"
+FALLBACK_MODULE = "data.rc_resources"
+
+_loaded_from = None
+
+
+def load_resources(rcc_path=None):
+    """Register the compiled resources once.
+
+    Args:
+        rcc_path: Binary resource file to register (default DEFAULT_RCC_PATH)
+
+    Returns:
+        str: "rcc" or "module" depending on the source used, or None if no
+        resources could be registered
+    """
+    global _loaded_from
+    if _loaded_from is not None:
+        return _loaded_from
+
+    rcc_path = Path(rcc_path) if rcc_path else DEFAULT_RCC_PATH
+    if rcc_path.exists():
+        if QRC_PATH.exists() and os.path.getmtime(QRC_PATH) > os.path.getmtime(rcc_path):
+            logger.warning(f"{rcc_path.name} is older than {QRC_PATH.name}; "
+                           f"run utils/build_resources.py to rebuild it")
+        if QResource.registerResource(str(rcc_path)):
+            _loaded_from = "rcc"
+            logger.info(f"Registered binary resources from {rcc_path}")
+            return _loaded_from
+        logger.warning(f"Could not register {rcc_path}, falling back to {FALLBACK_MODULE}")
+
+    try:
+        # Importing the generated module registers its embedded data
+        importlib.import_module(FALLBACK_MODULE)
+        _loaded_from = "module"
+    except ImportError as e:
+        logger.error(f"No compiled resources available: {e}")
+    return _loaded_from
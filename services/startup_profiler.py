@@ -0,0 +1,294 @@
+"""Startup profiler enabled with ``--profile-startup``.
+
+Records wall and CPU time for each startup phase, the cost of every module
+import (through a ``sys.meta_path`` hook) and QML component compile times.
+At the end of startup it writes a Chrome trace file (open it in
+chrome://tracing or https://ui.perfetto.dev) and logs a summary table.
+
+The profiler must be started before the application's own imports to see
+them, so this module only depends on the standard library at import time and
+the option is read from sys.argv by trace_path_from_argv rather than argparse:
+
+    --profile-startup              write startup_profile.json
+    --profile-startup PATH.json    write PATH.json (the path must end in .json)
+    --profile-startup=PATH         write PATH
+"""
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from typing import Dict, List, Optional
+
+# Default trace file written when --profile-startup is given without a path
+DEFAULT_TRACE_FILE = "startup_profile.json"
+
+# Rows shown per section of the summary table
+SUMMARY_ROWS = 15
+
+
+class _TimedLoader:
+    """Loader proxy timing exec_module; everything else is delegated."""
+
+    def __init__(self, loader, profiler, name):
+        self._loader = loader
+        self._profiler = profiler
+        self._name = name
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Put the real loader back so the module never sees the proxy
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        module.__loader__ = self._loader
+        with self._profiler.timed_import(self._name):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _ImportTimer(MetaPathFinder):
+    """Meta path finder that wraps the loaders found by the other finders."""
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self._profiler, fullname)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """Collects startup timings and writes them as a Chrome trace."""
+
+    _instance = None
+    _lock = threading.RLock()
+
+    @classmethod
+    def get_instance(cls):
+        """Get or create the singleton instance."""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_path = DEFAULT_TRACE_FILE
+        self._origin = time.perf_counter()
+        self._events: List[dict] = []
+        self._phases: List[dict] = []
+        self._imports: Dict[str, dict] = {}
+        self._qml: List[dict] = []
+        self._stacks = threading.local()
+        self._hook: Optional[_ImportTimer] = None
+        self._finished = False
+
+    def start(self, trace_path: Optional[str] = None, origin: Optional[float] = None) -> None:
+        """Enable profiling and install the import hook.
+
+        Args:
+            trace_path: Where to write the trace (default DEFAULT_TRACE_FILE)
+            origin: perf_counter() value treated as time zero, e.g. taken at
+                the very top of the entry point
+        """
+        self.enabled = True
+        if trace_path:
+            self.trace_path = trace_path
+        if origin is not None:
+            self._origin = origin
+        if self._hook is None:
+            self._hook = _ImportTimer(self)
+            sys.meta_path.insert(0, self._hook)
+
+    def stop_import_hook(self) -> None:
+        """Remove the import hook; already collected timings are kept."""
+        if self._hook is not None:
+            try:
+                sys.meta_path.remove(self._hook)
+            except ValueError:
+                pass
+            self._hook = None
+
+    def _add_event(self, category: str, name: str, start: float, end: float, **args) -> None:
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round((start - self._origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._events.append(event)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a startup phase (wall and process CPU time); no-op when disabled."""
+        if not self.enabled:
+            yield
+            return
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall_end = time.perf_counter()
+            cpu = time.process_time() - cpu_start
+            self.record_phase(name, wall_start, wall_end, cpu)
+
+    def record_phase(self, name: str, start: float, end: float, cpu: Optional[float] = None) -> None:
+        """Record a phase measured elsewhere (perf_counter start/end, CPU seconds)."""
+        if not self.enabled:
+            return
+        entry = {"name": name, "wall_ms": (end - start) * 1000,
+                 "cpu_ms": None if cpu is None else cpu * 1000}
+        with self._lock:
+            self._phases.append(entry)
+        args = {} if cpu is None else {"cpu_ms": round(cpu * 1000, 3)}
+        self._add_event("phase", name, start, end, **args)
+
+    @contextmanager
+    def timed_import(self, name: str):
+        """Time one module import, separating its own cost from nested imports."""
+        stack = getattr(self._stacks, "frames", None)
+        if stack is None:
+            stack = self._stacks.frames = []
+        frame = {"children": 0.0}
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            total = end - start
+            if stack:
+                stack[-1]["children"] += total
+            self_time = total - frame["children"]
+            with self._lock:
+                self._imports[name] = {"total_ms": total * 1000, "self_ms": self_time * 1000}
+            self._add_event("import", name, start, end, self_ms=round(self_time * 1000, 3))
+
+    def record_qml(self, name: str, start: float, end: Optional[float] = None, **args) -> None:
+        """Record a QML component compile that started at perf_counter() value start."""
+        if not self.enabled:
+            return
+        end = time.perf_counter() if end is None else end
+        with self._lock:
+            self._qml.append({"name": name, "ms": (end - start) * 1000})
+        self._add_event("qml", name, start, end, **args)
+
+    def mark(self, name: str) -> None:
+        """Record an instant event such as the first rendered frame."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._events.append({
+                "name": name, "cat": "mark", "ph": "i", "s": "p",
+                "ts": round((time.perf_counter() - self._origin) * 1e6, 1),
+                "pid": os.getpid(), "tid": threading.get_ident(),
+            })
+
+    def summary(self) -> dict:
+        """Machine-readable summary of the collected timings."""
+        with self._lock:
+            imports = sorted(self._imports.items(), key=lambda item: item[1]["self_ms"], reverse=True)
+            return {
+                "elapsed_ms": (time.perf_counter() - self._origin) * 1000,
+                "phases": list(self._phases),
+                "import_count": len(imports),
+                "import_self_ms": sum(entry["self_ms"] for _, entry in imports),
+                "imports": [dict(name=name, **entry) for name, entry in imports],
+                "qml": sorted(self._qml, key=lambda entry: entry["ms"], reverse=True),
+            }
+
+    def summary_table(self, rows: int = SUMMARY_ROWS) -> str:
+        """Human-readable summary: phases, slowest imports and QML compiles."""
+        summary = self.summary()
+        lines = [f"Startup profile ({summary['elapsed_ms']:.0f} ms since start)",
+                 f"{'Phase':<40} {'Wall ms':>10} {'CPU ms':>10}"]
+        for phase in summary["phases"]:
+            cpu = "-" if phase["cpu_ms"] is None else f"{phase['cpu_ms']:.1f}"
+            lines.append(f"{phase['name']:<40} {phase['wall_ms']:>10.1f} {cpu:>10}")
+
+        lines.append("")
+        lines.append(f"Imports: {summary['import_count']} modules, "
+                     f"{summary['import_self_ms']:.0f} ms total")
+        lines.append(f"{'Module':<50} {'Self ms':>10} {'Total ms':>10}")
+        for entry in summary["imports"][:rows]:
+            lines.append(f"{entry['name']:<50} {entry['self_ms']:>10.1f} {entry['total_ms']:>10.1f}")
+
+        if summary["qml"]:
+            lines.append("")
+            lines.append(f"QML compiles: {len(summary['qml'])} components, "
+                         f"{sum(entry['ms'] for entry in summary['qml']):.0f} ms total")
+            lines.append(f"{'Component':<50} {'ms':>10}")
+            for entry in summary["qml"][:rows]:
+                lines.append(f"{entry['name']:<50} {entry['ms']:>10.1f}")
+        return "\n".join(lines)
+
+    def write_trace(self, path: Optional[str] = None) -> str:
+        """Write collected events as a Chrome trace JSON file and return its path."""
+        path = path or self.trace_path
+        with self._lock:
+            events = list(self._events)
+        trace = {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": self.summary(),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f)
+        return path
+
+    def finish(self) -> Optional[str]:
+        """Stop collecting imports, write the trace and log the summary (once)."""
+        if not self.enabled or self._finished:
+            return None
+        self._finished = True
+        self.stop_import_hook()
+
+        from services.logger_config import configure_logger
+        logger = configure_logger("qmltest", component="startup_profiler")
+
+        table = self.summary_table()
+        print(table)
+        try:
+            path = self.write_trace()
+            logger.info(f"Startup trace written to {os.path.abspath(path)}")
+        except OSError as e:
+            path = None
+            logger.error(f"Could not write startup trace: {e}")
+        logger.info(table)
+        return path
+
+
+def trace_path_from_argv(argv) -> Optional[str]:
+    """Return the trace path for --profile-startup[=PATH], or None if not given.
+
+    A separate argument after the option is only taken as the path when it ends
+    in .json, so the option can be followed by other arguments.
+    """
+    for index, arg in enumerate(argv):
+        if arg == "--profile-startup":
+            following = argv[index + 1] if index + 1 < len(argv) else ""
+            return following if following.endswith(".json") else DEFAULT_TRACE_FILE
+        if arg.startswith("--profile-startup="):
+            return arg.split("=", 1)[1] or DEFAULT_TRACE_FILE
+    return None
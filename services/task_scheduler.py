@@ -0,0 +1,340 @@
+"""Unified priority scheduler for background calculations.
+
+All calculators submit work through the TaskScheduler singleton instead of
+creating their own thread pools. It provides:
+- Priority ordering of pending tasks
+- "Latest request wins" coalescing per key
+- Cooperative cancellation tokens
+- A bounded pending queue
+- Per-task timing statistics
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import psutil
+from PySide6.QtCore import QThreadPool, QRunnable
+
+from services.logger_config import configure_logger
+
+logger = configure_logger("qmltest", component="task_scheduler")
+
+# Higher values run first
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 0
+PRIORITY_LOW = -10
+
+
+class TaskCancelled(Exception):
+    """Raised by CancellationToken.raise_if_cancelled inside a task."""
+
+
+class CancellationToken:
+    """Cooperative cancellation flag shared between scheduler and task."""
+
+    __slots__ = ("_event",)
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """Abort the running task if a newer request superseded it."""
+        if self._event.is_set():
+            raise TaskCancelled()
+
+
+class TaskHandle:
+    """State of a submitted task."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, func: Callable, args: tuple, kwargs: dict, name: str,
+                 priority: int, key: Optional[Any]):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.name = name
+        self.priority = priority
+        self.key = key
+        self.token = CancellationToken()
+        self.state = self.PENDING
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.submitted_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._done = threading.Event()
+
+    def cancel(self) -> None:
+        """Request cancellation; pending tasks are dropped, running ones are signalled."""
+        self.token.cancel()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the task has finished, failed or been cancelled."""
+        return self._done.wait(timeout)
+
+    def _finish(self, state: str) -> None:
+        self.state = state
+        self.finished_at = time.perf_counter()
+        self._done.set()
+
+
+class _TaskRunnable(QRunnable):
+    """Adapter that runs a TaskHandle on the Qt thread pool."""
+
+    def __init__(self, scheduler: "TaskScheduler", handle: TaskHandle):
+        super().__init__()
+        self._scheduler = scheduler
+        self._handle = handle
+
+    def run(self):
+        self._scheduler._execute(self._handle)
+
+
+class TaskScheduler:
+    """Single priority scheduler used by every calculator for background work."""
+
+    _instance = None
+    _lock = threading.RLock()
+
+    @classmethod
+    def get_instance(cls):
+        """Get or create the singleton instance."""
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: int = 64):
+        """Initialize the scheduler.
+
+        Args:
+            max_workers: Number of worker threads; defaults to physical cores - 1
+            max_pending: Maximum number of queued (not yet running) tasks
+        """
+        if max_workers is None:
+            cpu_count = psutil.cpu_count(logical=False) or 2
+            # Leave a core free for the UI thread and the render loop
+            max_workers = max(1, cpu_count - 1)
+
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(max_workers)
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+
+        self._state_lock = threading.RLock()
+        self._heap = []  # (-priority, sequence, handle)
+        self._sequence = itertools.count()
+        self._running = 0
+        self._latest: Dict[Any, TaskHandle] = {}  # coalescing key -> newest handle
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._shutdown = False
+
+    def maxThreadCount(self) -> int:
+        """Get the number of worker threads - mimics QThreadPool."""
+        return self._max_workers
+
+    def submit(self, func: Callable, *args, name: Optional[str] = None,
+               priority: int = PRIORITY_NORMAL, key: Optional[Any] = None,
+               **kwargs) -> TaskHandle:
+        """Queue func(*args, **kwargs) for execution.
+
+        If the function accepts a ``token`` keyword it receives the task's
+        CancellationToken. When ``key`` is given, any earlier task with the
+        same key is cancelled so only the latest request runs to completion.
+        """
+        handle = TaskHandle(func, args, kwargs, name or getattr(func, "__qualname__", "task"),
+                            priority, key)
+
+        with self._state_lock:
+            stats = self._task_stats(handle.name)
+            stats["submitted"] += 1
+
+            if self._shutdown:
+                stats["rejected"] += 1
+                handle.token.cancel()
+                handle._finish(TaskHandle.CANCELLED)
+                return handle
+
+            if key is not None:
+                previous = self._latest.get(key)
+                if previous is not None and not previous.done:
+                    previous.token.cancel()
+                    self._task_stats(previous.name)["coalesced"] += 1
+                self._latest[key] = handle
+
+            self._drop_cancelled()
+            if len(self._heap) >= self._max_pending and not self._make_room(handle):
+                stats["rejected"] += 1
+                handle.token.cancel()
+                handle._finish(TaskHandle.CANCELLED)
+                return handle
+
+            heapq.heappush(self._heap, (-priority, next(self._sequence), handle))
+            self._dispatch()
+
+        return handle
+
+    def _task_stats(self, name: str) -> Dict[str, float]:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = {
+                "submitted": 0, "completed": 0, "failed": 0, "cancelled": 0,
+                "coalesced": 0, "rejected": 0, "total_run_ms": 0.0,
+                "max_run_ms": 0.0, "total_wait_ms": 0.0
+            }
+            self._stats[name] = stats
+        return stats
+
+    def _drop_cancelled(self) -> None:
+        """Remove pending tasks whose token was cancelled before they started."""
+        if not any(entry[2].token.cancelled for entry in self._heap):
+            return
+        kept = []
+        for entry in self._heap:
+            handle = entry[2]
+            if handle.token.cancelled:
+                self._task_stats(handle.name)["cancelled"] += 1
+                handle._finish(TaskHandle.CANCELLED)
+            else:
+                kept.append(entry)
+        heapq.heapify(kept)
+        self._heap = kept
+
+    def _make_room(self, incoming: TaskHandle) -> bool:
+        """Evict the lowest priority pending task if the incoming one outranks it."""
+        lowest = max(self._heap)  # Largest -priority / newest sequence
+        if -lowest[0] >= incoming.priority:
+            return False
+        self._heap.remove(lowest)
+        heapq.heapify(self._heap)
+        victim = lowest[2]
+        victim.token.cancel()
+        self._task_stats(victim.name)["rejected"] += 1
+        victim._finish(TaskHandle.CANCELLED)
+        return True
+
+    def _dispatch(self) -> None:
+        """Start pending tasks while worker slots are free."""
+        while self._heap and self._running < self._max_workers:
+            _, _, handle = heapq.heappop(self._heap)
+            if handle.token.cancelled:
+                self._task_stats(handle.name)["cancelled"] += 1
+                handle._finish(TaskHandle.CANCELLED)
+                continue
+            self._running += 1
+            handle.state = TaskHandle.RUNNING
+            runnable = _TaskRunnable(self, handle)
+            runnable.setAutoDelete(True)
+            self._pool.start(runnable)
+
+    def _execute(self, handle: TaskHandle) -> None:
+        """Run a task on a worker thread and record its timing."""
+        handle.started_at = time.perf_counter()
+        state = TaskHandle.FINISHED
+        try:
+            if handle.token.cancelled:
+                state = TaskHandle.CANCELLED
+            else:
+                kwargs = _with_token(handle.func, handle.kwargs, handle.token)
+                handle.result = handle.func(*handle.args, **kwargs)
+                if handle.token.cancelled:
+                    state = TaskHandle.CANCELLED
+        except TaskCancelled:
+            state = TaskHandle.CANCELLED
+        except Exception as e:
+            state = TaskHandle.FAILED
+            handle.error = e
+            logger.error(f"Error in task {handle.name}: {e}")
+            logger.exception(e)
+        finally:
+            handle._finish(state)
+            with self._state_lock:
+                stats = self._task_stats(handle.name)
+                run_ms = (handle.finished_at - handle.started_at) * 1000
+                stats["total_wait_ms"] += (handle.started_at - handle.submitted_at) * 1000
+                if state == TaskHandle.FINISHED:
+                    stats["completed"] += 1
+                    stats["total_run_ms"] += run_ms
+                    stats["max_run_ms"] = max(stats["max_run_ms"], run_ms)
+                elif state == TaskHandle.FAILED:
+                    stats["failed"] += 1
+                else:
+                    stats["cancelled"] += 1
+                if handle.key is not None and self._latest.get(handle.key) is handle:
+                    del self._latest[handle.key]
+                self._running -= 1
+                self._dispatch()
+
+    def cancel(self, key: Any) -> None:
+        """Cancel the pending or running task registered under key."""
+        with self._state_lock:
+            handle = self._latest.get(key)
+            if handle is not None:
+                handle.token.cancel()
+            self._drop_cancelled()
+
+    def cancel_all_tasks(self) -> None:
+        """Cancel every pending task and signal running ones to stop."""
+        with self._state_lock:
+            for _, _, handle in self._heap:
+                handle.token.cancel()
+            for handle in self._latest.values():
+                handle.token.cancel()
+            self._drop_cancelled()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue state and per-task timing statistics."""
+        with self._state_lock:
+            tasks = {}
+            for name, stats in self._stats.items():
+                entry = dict(stats)
+                entry["avg_run_ms"] = stats["total_run_ms"] / stats["completed"] if stats["completed"] else 0.0
+                started = stats["completed"] + stats["failed"]
+                entry["avg_wait_ms"] = stats["total_wait_ms"] / started if started else 0.0
+                tasks[name] = entry
+            return {
+                "active_count": self._running,
+                "max_thread_count": self._max_workers,
+                "queue_size": len(self._heap),
+                "max_queue_size": self._max_pending,
+                "tasks": tasks
+            }
+
+    def wait_for_done(self, timeout_ms: int = -1) -> bool:
+        """Block until all running tasks have finished."""
+        return self._pool.waitForDone(timeout_ms)
+
+    def shutdown(self, timeout_ms: int = 2000) -> None:
+        """Stop accepting work, cancel outstanding tasks and wait for workers."""
+        with self._state_lock:
+            self._shutdown = True
+        self.cancel_all_tasks()
+        self._pool.waitForDone(timeout_ms)
+
+
+def _with_token(func: Callable, kwargs: dict, token: CancellationToken) -> dict:
+    """Pass the cancellation token to functions that declare a ``token`` parameter."""
+    code = getattr(func, "__code__", None) or getattr(getattr(func, "__func__", None), "__code__", None)
+    if code is None:
+        return kwargs
+    if "token" in code.co_varnames[:code.co_argcount + code.co_kwonlyargcount] and "token" not in kwargs:
+        return dict(kwargs, token=token)
+    return kwargs
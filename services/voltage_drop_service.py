@@ -1,11 +1,23 @@
 import math
 import logging
 import os
+import numpy as np
 import pandas as pd
 from services.database_manager import DatabaseManager
 
 logger = logging.getLogger("qmltest.voltage_drop")
 
+# Voltage drop status bands (percent of system voltage), checked highest first
+DROP_STATUS_LIMITS = ((7.0, "SEVERE"), (5.0, "WARNING"), (2.0, "SUBMAIN"))
+
+
+def classify_drop_status(drop_percent):
+    """Map an array of drop percentages to status labels."""
+    drop_percent = np.asarray(drop_percent, dtype=np.float64)
+    conditions = [drop_percent > limit for limit, _ in DROP_STATUS_LIMITS]
+    labels = [label for _, label in DROP_STATUS_LIMITS]
+    return np.select(conditions, labels, default="OK")
+
 class VoltageDropService:
     """
     Service for voltage drop calculations using the central database manager.
@@ -334,18 +346,9 @@ class VoltageDropService:
             # Apply ADMD factor if enabled and using 415V
             admd_multiplier = admd_factor if (admd_enabled and voltage > 230) else 1.0
             
-            # Get temperature factor
-            insulation = 'XLPE' if material == 'Al' else 'PVC'
-            temp_factor = self.get_temperature_factor(temperature, insulation)
-            
-            # Get installation factor - extract code from installation_method string if needed
-            if ' - ' in installation_code:
-                install_code = installation_code.split(' - ')[0]
-            else:
-                install_code = installation_code
-                
-            install_data = self.get_installation_factor(install_code)
-            install_factor = install_data.get('base_factor', 1.0)
+            temp_factor, install_factor = self.get_derating_factors(
+                temperature, installation_code, material
+            )
             
             # Calculate voltage drop
             v_drop = (
@@ -365,6 +368,87 @@ class VoltageDropService:
             logger.error(f"Error calculating voltage drop: {e}")
             return 0.0
     
+    def get_derating_factors(self, temperature=25, installation_code="C", material=None):
+        """Resolve temperature and installation factors once for a recalculation.
+
+        ``installation_code`` may be a bare code or a "C - description" label.
+        Returns a ``(temp_factor, install_factor)`` tuple so callers evaluating a
+        whole cable table only pay for the two database lookups a single time.
+        """
+        insulation = 'XLPE' if material == 'Al' else 'PVC'
+        temp_factor = self.get_temperature_factor(temperature, insulation)
+
+        # Extract the code from an installation method label if needed
+        if ' - ' in installation_code:
+            install_code = installation_code.split(' - ')[0]
+        else:
+            install_code = installation_code
+
+        install_factor = self.get_installation_factor(install_code).get('base_factor', 1.0)
+        return temp_factor, install_factor
+
+    def calculate_voltage_drop_table(self, current, length, cable_data,
+                                     temperature=25, installation_code="C",
+                                     grouping_factor=1.0, admd_enabled=False,
+                                     admd_factor=1.5, voltage=415.0):
+        """Calculate voltage drop for every cable in ``cable_data`` in one array pass.
+
+        Produces the same values as calling ``calculate_voltage_drop`` and
+        ``calculate_rating_adjustments`` per row, but resolves the derating
+        factors once and evaluates the table with NumPy.
+
+        Returns a dict of NumPy arrays keyed by ``size``, ``mv_per_am``,
+        ``max_current``, ``voltage_drop``, ``drop_percent``, ``derated_rating``
+        and ``status``, or ``None`` if the inputs are invalid.
+        """
+        try:
+            if cable_data is None or len(cable_data) == 0:
+                return None
+
+            sizes = cable_data['size'].to_numpy(dtype=np.float64)
+            mv_per_am = cable_data['mv_per_am'].to_numpy(dtype=np.float64)
+            max_current = cable_data['max_current'].to_numpy(dtype=np.float64)
+
+            # The built-in tables carry no material column, in which case the
+            # scalar path falls back to PVC insulation - mirror that here
+            material = cable_data['material'].iloc[0] if 'material' in cable_data else None
+            temp_factor, install_factor = self.get_derating_factors(
+                temperature, installation_code, material
+            )
+
+            derated_rating = max_current * (temp_factor * install_factor * grouping_factor)
+
+            if current <= 0 or length <= 0:
+                voltage_drop = np.zeros_like(mv_per_am)
+            else:
+                admd_multiplier = admd_factor if (admd_enabled and voltage > 230) else 1.0
+                scale = (
+                    current *
+                    length *
+                    temp_factor *
+                    install_factor *
+                    grouping_factor *
+                    admd_multiplier /
+                    1000.0
+                )
+                voltage_drop = mv_per_am * scale
+
+            drop_percent = voltage_drop / voltage * 100.0
+
+            return {
+                'size': sizes,
+                'mv_per_am': mv_per_am,
+                'max_current': max_current,
+                'voltage_drop': voltage_drop,
+                'drop_percent': drop_percent,
+                'derated_rating': derated_rating,
+                'status': classify_drop_status(drop_percent),
+            }
+
+        except Exception as e:
+            logger.error(f"Error calculating voltage drop table: {e}")
+            return None
+
     def calculate_rating_adjustments(self, cable, temperature=25.0, grouping=1.0, 
                                    installation_method="C"):
         """Calculate adjusted cable rating based on derating factors."""
@@ -384,18 +468,9 @@ class VoltageDropService:
             if isinstance(material, pd.Series):
                 material = material.iloc[0]
                 
-            # Get temperature factor
-            insulation = 'XLPE' if material == 'Al' else 'PVC'
-            temp_factor = self.get_temperature_factor(temperature, insulation)
-            
-            # Get installation factor - extract code from installation_method string if needed
-            if ' - ' in installation_method:
-                install_code = installation_method.split(' - ')[0]
-            else:
-                install_code = installation_method
-                
-            install_data = self.get_installation_factor(install_code)
-            install_factor = install_data.get('base_factor', 1.0)
+            temp_factor, install_factor = self.get_derating_factors(
+                temperature, installation_method, material
+            )
             
             adjusted_rating = max_current * temp_factor * install_factor * grouping
             return adjusted_rating
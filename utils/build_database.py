@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Build the pre-populated data/application_data.db shipped with the application.
+
+The database is created with the full schema and reference data, stamped with
+the schema fingerprint, analysed and VACUUMed into a single compact file with
+a rollback journal. On first launch DatabaseManager then only reads the
+fingerprint instead of running the reference data loaders. Re-run this after
+changing the table definitions, the loaders or REFERENCE_DATA_VERSION.
+
+Usage:
+    python utils/build_database.py [--from EXISTING_DB] [--output PATH]
+
+--from upgrades and compacts a copy of an existing database (keeping rows
+the loaders do not create) instead of starting from an empty file.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT_DIR)
+from services.database_manager import DatabaseManager
+
+DATA_DIR = os.path.join(ROOT_DIR, 'data')
+DEFAULT_OUTPUT = os.path.join(DATA_DIR, 'application_data.db')
+# Built inside data/ so the loaders find their CSV files next to it
+BUILD_PATH = os.path.join(DATA_DIR, 'application_data.build.db')
+SIDE_FILES = ('-wal', '-shm', '-journal')
+
+
+def remove_database(path):
+    """Delete a database file together with its journal files."""
+    for suffix in ('',) + SIDE_FILES:
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def copy_database(source, target):
+    """Copy a database with the backup API so pending WAL pages are included."""
+    src = sqlite3.connect(source)
+    dst = sqlite3.connect(target)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
+def compact(path):
+    """Fold the WAL back in, switch to a rollback journal and VACUUM."""
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.execute("ANALYZE")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+
+def build_database(output=DEFAULT_OUTPUT, source=None):
+    """Build the shipped database and return its path."""
+    remove_database(BUILD_PATH)
+    if source:
+        print(f"Upgrading a copy of {source}")
+        copy_database(source, BUILD_PATH)
+
+    db_manager = DatabaseManager(BUILD_PATH)
+    stored = db_manager._stored_schema_fingerprint()
+    db_manager.close()
+    if stored != db_manager.schema_fingerprint:
+        raise RuntimeError("Schema check did not complete; fingerprint was not recorded")
+
+    compact(BUILD_PATH)
+
+    # Stale journal files next to the old database must not be applied to the new one
+    remove_database(output)
+    os.replace(BUILD_PATH, output)
+    print(f"Wrote {output} ({os.path.getsize(output)} bytes, fingerprint {stored[:12]})")
+    return output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the prebuilt application database")
+    parser.add_argument('--from', dest='source', help="Existing database to upgrade instead of starting empty")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Where to write the database")
+    args = parser.parse_args()
+
+    try:
+        build_database(args.output, args.source)
+    except (OSError, sqlite3.Error, RuntimeError) as e:
+        print(f"Error building database: {e}")
+        remove_database(BUILD_PATH)
+        sys.exit(1)
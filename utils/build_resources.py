@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Compile resources.qrc into the binary data/resources.rcc loaded at startup.
+
+The binary file is memory-mapped by QResource instead of being imported as a
+Python module of embedded bytes. Re-run this after changing resources.qrc or
+any file it lists; pass --python to also regenerate data/rc_resources.py,
+which is used as a fallback when the binary file is missing.
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+QRC_FILE = os.path.join(ROOT_DIR, 'resources.qrc')
+RCC_FILE = os.path.join(ROOT_DIR, 'data', 'resources.rcc')
+PY_FILE = os.path.join(ROOT_DIR, 'data', 'rc_resources.py')
+
+
+def run_rcc(*args):
+    """Run the PySide6 resource compiler from the qrc file's directory."""
+    command = ['pyside6-rcc', *args, QRC_FILE]
+    print(' '.join(command))
+    subprocess.run(command, cwd=ROOT_DIR, check=True)
+
+
+def build_resources(python_module=False):
+    """Build the binary resource file (and optionally the Python fallback)."""
+    run_rcc('--binary', '-o', RCC_FILE)
+    print(f"Wrote {RCC_FILE} ({os.path.getsize(RCC_FILE)} bytes)")
+
+    if python_module:
+        run_rcc('-o', PY_FILE)
+        print(f"Wrote {PY_FILE}")
+
+
+if __name__ == "__main__":
+    try:
+        build_resources(python_module='--python' in sys.argv)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Error building resources: {e}")
+        sys.exit(1)
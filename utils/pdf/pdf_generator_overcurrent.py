@@ -98,6 +98,17 @@ def create_results_section(results, styles):
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
         ]))
         elements.append(margin_table)
+        
+        sweep = result.get('sweep')
+        if sweep:
+            for violation in sweep['violations']:
+                elements.append(Paragraph(
+                    f"Margin below minimum from {violation['start']:.1f} A to {violation['end']:.1f} A "
+                    f"(worst {violation['worst_margin']:.2f} s at {violation['worst_current']:.1f} A)",
+                    styles['Normal']))
+            if sweep['crossings']:
+                crossings = ", ".join(f"{current:.1f} A" for current in sweep['crossings'])
+                elements.append(Paragraph(f"Curves cross at {crossings}", styles['Normal']))
         elements.append(Spacer(1, 0.2*inch))
     
     return elements
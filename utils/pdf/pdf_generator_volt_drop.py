@@ -69,7 +69,7 @@ class PDFGenerator(QObject):
                 formatted_row = []
                 for i, item in enumerate(row):
                     if isinstance(item, float):
-                        if i == 6:  # Drop percentage column
+                        if i == 7:  # Drop percentage column
                             formatted_row.append(f"{item:.1f}%")
                         else:
                             formatted_row.append(f"{item:.1f}")
@@ -78,7 +78,7 @@ class PDFGenerator(QObject):
                 table_rows.append(formatted_row)
             
             # Create the table
-            col_widths = [0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch]
+            col_widths = [0.8*inch] * 9
             table = Table(table_rows, colWidths=col_widths, repeatRows=1)
             
             # Apply table styles
@@ -96,23 +96,23 @@ class PDFGenerator(QObject):
             
             # Add special formatting for the status column
             for i in range(1, len(table_rows)):
-                status = table_rows[i][7]  # Status column
+                status = table_rows[i][8]  # Status column
                 if status == "SEVERE":
-                    table_style.append(('BACKGROUND', (7, i), (7, i), colors.mistyrose))
-                    table_style.append(('TEXTCOLOR', (7, i), (7, i), colors.darkred))
+                    table_style.append(('BACKGROUND', (8, i), (8, i), colors.mistyrose))
+                    table_style.append(('TEXTCOLOR', (8, i), (8, i), colors.darkred))
                 elif status == "WARNING":
-                    table_style.append(('BACKGROUND', (7, i), (7, i), colors.linen))
-                    table_style.append(('TEXTCOLOR', (7, i), (7, i), colors.darkorange))
+                    table_style.append(('BACKGROUND', (8, i), (8, i), colors.linen))
+                    table_style.append(('TEXTCOLOR', (8, i), (8, i), colors.darkorange))
                 elif status == "SUBMAIN":
-                    table_style.append(('BACKGROUND', (7, i), (7, i), colors.aliceblue))
-                    table_style.append(('TEXTCOLOR', (7, i), (7, i), colors.blue))
+                    table_style.append(('BACKGROUND', (8, i), (8, i), colors.aliceblue))
+                    table_style.append(('TEXTCOLOR', (8, i), (8, i), colors.blue))
                 elif status == "OK":
-                    table_style.append(('BACKGROUND', (7, i), (7, i), colors.mintcream))
-                    table_style.append(('TEXTCOLOR', (7, i), (7, i), colors.darkgreen))
+                    table_style.append(('BACKGROUND', (8, i), (8, i), colors.mintcream))
+                    table_style.append(('TEXTCOLOR', (8, i), (8, i), colors.darkgreen))
                 
                 # Alternate row colors for better readability
                 if i % 2 == 0:
-                    table_style.append(('BACKGROUND', (0, i), (6, i), colors.whitesmoke))
+                    table_style.append(('BACKGROUND', (0, i), (7, i), colors.whitesmoke))
             
             table.setStyle(TableStyle(table_style))
             elements.append(table)
@@ -31,10 +31,8 @@ class SeriesHelper(QObject):
     def fillSeriesFromArrays(self, series, x_values, y_values):
         """Fill a series from separate x and y arrays"""
         if series and len(x_values) == len(y_values):
-            points = []
-            for x, y in zip(x_values, y_values):
-                points.append(QPointF(float(x), float(y)))
-            self.fillSeries(series, points)
+            return replace_series(series, x_values, y_values)
+        return False
 
     @Slot(QXYSeries, list, list, int)
     def fillSeriesOptimized(self, series, x_values, y_values, max_points=500):
@@ -46,24 +44,14 @@ class SeriesHelper(QObject):
             y_values: List of y coordinates
             max_points: Maximum number of points to display
         """
-        if not series or not x_values or not y_values:
+        if not series or len(x_values) == 0 or len(y_values) == 0:
             return False
             
-        # Optimize point count if necessary
-        if len(x_values) > max_points:
-            x_opt, y_opt = self.downsample(x_values, y_values, max_points)
-        else:
-            x_opt, y_opt = x_values, y_values
-            
-        # Create optimized points list
-        points = []
-        for x, y in zip(x_opt, y_opt):
-            # Ensure valid point values (no NaN/Inf)
-            if self.is_valid_number(x) and self.is_valid_number(y):
-                points.append(QPointF(float(x), float(y)))
-                
+        # Optimize point count if necessary (invalid NaN/Inf points are dropped)
+        x_opt, y_opt = self.downsample(x_values, y_values, max_points)
+        
         # Replace all points in one operation
-        return self.fillSeries(series, points)
+        return replace_series(series, x_opt, y_opt)
     
     @Slot(QXYSeries, list, list, int, int)
     def fillSeriesParallel(self, series, x_values, y_values, max_points=500, min_points=50):
@@ -80,14 +68,14 @@ class SeriesHelper(QObject):
             max_points: Maximum number of points to display
             min_points: Minimum number of points for initial display
         """
-        if not series or not x_values or not y_values:
+        if not series or len(x_values) == 0 or len(y_values) == 0:
             return False
             
         # For very large datasets, do quick preview first
         if len(x_values) > 1000:
             # First display a quick, low-resolution preview
             x_preview, y_preview = self.downsample(x_values, y_values, min_points)
-            self.fillSeriesFromArrays(series, x_preview, y_preview)
+            self.fillSeriesFromArrays(series, x_preview.tolist(), y_preview.tolist())
             
            
             class DownsampleWorker(QObject):
@@ -103,7 +91,7 @@ class SeriesHelper(QObject):
                 def process(self):
                     try:
                         x_ds, y_ds = self.helper.downsample(self.x, self.y, self.max_pts)
-                        self.resultReady.emit(x_ds, y_ds)
+                        self.resultReady.emit(x_ds.tolist(), y_ds.tolist())
                     except Exception as e:
                         print(f"Error in downsampling worker: {e}")
             
@@ -147,101 +135,265 @@ class SeriesHelper(QObject):
     def downsample(self, x_values, y_values, max_points):
         """Downsample data while preserving important features
         
-        Uses LTTB (Largest-Triangle-Three-Buckets) algorithm which preserves
-        visually important points while reducing the total point count.
+        Uses LTTB (Largest-Triangle-Three-Buckets), which keeps visually
+        important points, and switches to M4 min/max decimation for very large
+        inputs so that no peak is dropped.
         
         Args:
-            x_values: List of x coordinates
-            y_values: List of y coordinates
+            x_values: Sequence or array of x coordinates
+            y_values: Sequence or array of y coordinates
             max_points: Target number of points
             
         Returns:
-            Tuple of (x_downsampled, y_downsampled)
+            Tuple of (x_downsampled, y_downsampled) NumPy arrays
         """
-        n = len(x_values)
-        
-        # If already below max_points or just slightly above, return original data
-        if n <= max_points * 1.1:
-            return x_values, y_values
-            
-        # For very large datasets, use simple stride-based downsampling
-        if n > 10000:
-            stride = n // max_points
-            return x_values[::stride], y_values[::stride]
-        
-        # Convert input to numpy arrays for faster operations
         try:
-            x_arr = np.array(x_values, dtype=float)
-            y_arr = np.array(y_values, dtype=float)
+            x_arr = np.asarray(x_values, dtype=float)
+            y_arr = np.asarray(y_values, dtype=float)
         except (TypeError, ValueError):
             # Fall back to simple stride-based downsampling if conversion fails
-            stride = max(1, n // max_points)
-            return x_values[::stride], y_values[::stride]
-            
-        # Handle NaN/inf values by replacing with interpolated values
+            stride = max(1, len(x_values) // max(1, max_points))
+            return np.asarray(x_values[::stride]), np.asarray(y_values[::stride])
+        
+        # Drop NaN/inf points - they cannot be plotted
         mask = np.isfinite(x_arr) & np.isfinite(y_arr)
-        if not np.all(mask):
-            # If there are invalid values, use only valid ones for downsampling
-            valid_indices = np.where(mask)[0]
-            if len(valid_indices) < 2:  # Need at least 2 points for interpolation
-                stride = max(1, n // max_points)
-                return x_values[::stride], y_values[::stride]
-                
-            x_arr = x_arr[valid_indices]
-            y_arr = y_arr[valid_indices]
-            n = len(x_arr)
+        if not mask.all():
+            x_arr = x_arr[mask]
+            y_arr = y_arr[mask]
         
-        # Always include first and last points
-        result_x = [x_arr[0]]
-        result_y = [y_arr[0]]
+        n = len(x_arr)
         
-        # If very few points remain after filtering, use them all
-        if n <= max_points:
-            return x_arr.tolist(), y_arr.tolist()
+        # If already below max_points or just slightly above, return original data
+        if n <= max_points * 1.1 or max_points < 3:
+            return x_arr, y_arr
         
-        # Calculate effective number of buckets
-        bucket_size = (n - 2) / (max_points - 2)
+        if n > MIN_MAX_THRESHOLD:
+            return min_max_decimate(x_arr, y_arr, max_points)
+        return lttb(x_arr, y_arr, max_points)
+
+
+# Inputs longer than this use M4 min/max decimation instead of LTTB
+MIN_MAX_THRESHOLD = 50000
+
+
+def replace_series(series, x_values, y_values):
+    """Replace all points of a QXYSeries from x and y arrays in one call.
+    
+    The arrays are handed to QXYSeries.replaceNp, which reads the float
+    buffers directly, so no QPointF is created per sample. Older bindings
+    without replaceNp fall back to a single replace() with a point list.
+    
+    Args:
+        series: The QXYSeries to fill
+        x_values: Sequence or array of x coordinates
+        y_values: Sequence or array of y coordinates (same length as x)
         
-        # Process all buckets except first and last point
-        for i in range(1, max_points - 1):
-            # Calculate bucket boundaries
-            start_idx = int((i - 1) * bucket_size) + 1
-            end_idx = int(i * bucket_size) + 1
-            
-            # Ensure valid range
-            if start_idx >= n or end_idx >= n:
-                break
-                
-            # Find point with maximum detail in current bucket
-            max_area_idx = start_idx
-            max_area = 0
-            
-            # Last selected point
-            ax, ay = result_x[-1], result_y[-1]
-            
-            for j in range(start_idx, end_idx):
-                # Current point
-                bx, by = x_arr[j], y_arr[j]
-                
-                # Next bucket representative (average point in next bucket)
-                next_end = min(n, int((i + 1) * bucket_size) + 1)
-                cx = np.mean(x_arr[end_idx:next_end])
-                cy = np.mean(y_arr[end_idx:next_end])
-                
-                # Calculate triangle area (represents information retention)
-                area = abs((ax * (by - cy) + bx * (cy - ay) + cx * (ay - by)) / 2)
-                
-                # Keep point that preserves most information
-                if area > max_area:
-                    max_area = area
-                    max_area_idx = j
-            
-            # Add chosen point to result
-            result_x.append(x_arr[max_area_idx])
-            result_y.append(y_arr[max_area_idx])
+    Returns:
+        bool: True if the series was filled
+    """
+    if series is None:
+        return False
+    try:
+        x = np.ascontiguousarray(x_values, dtype=np.float64)
+        y = np.ascontiguousarray(y_values, dtype=np.float64)
+        if x.shape != y.shape or x.ndim != 1:
+            raise ValueError(f"x and y must be 1-D arrays of equal length, got {x.shape} and {y.shape}")
+        if len(x) == 0:
+            series.clear()
+        elif hasattr(series, "replaceNp"):
+            series.replaceNp(x, y)
+        else:
+            series.replace([QPointF(px, py) for px, py in zip(x.tolist(), y.tolist())])
+        return True
+    except Exception as e:
+        print(f"Error filling series: {e}")
+        return False
+
+
+def replace_series_points(series, points):
+    """Replace all points of a QXYSeries from an (N, 2) array of x, y pairs."""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    return replace_series(series, points[:, 0], points[:, 1])
+
+
+def fill_time_series(series, x_values, y_values, stride=1):
+    """Fill a series with the finite points of a signal, keeping every stride-th sample.
+    
+    The series is left as it is when no point is finite.
+    
+    Returns:
+        dict: ``count`` of points, largest x (``maxX``, at least 0) and largest
+        magnitude of y (``maxAbsY``) for scaling the axes
+    """
+    step = max(1, int(stride))
+    x = np.asarray(x_values, dtype=np.float64)[::step]
+    y = np.asarray(y_values, dtype=np.float64)[::step]
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    if not x.size:
+        return {"count": 0, "maxX": 0.0, "maxAbsY": 0.0}
+    
+    replace_series(series, x, y)
+    return {"count": int(x.size), "maxX": float(max(x.max(), 0.0)), "maxAbsY": float(np.abs(y).max())}
+
+
+def fill_spectrum_series(magnitude_series, phase_series, frequencies, magnitude, phase, stride=1):
+    """Fill magnitude and phase series of a spectrum, keeping every stride-th bin.
+    
+    Bins beyond the shorter of frequencies and magnitude are ignored and
+    non-finite points are dropped from each series.
+    
+    Returns:
+        dict: ``count`` of magnitude points and the values the charts scale
+        their axes with: ``maxMagnitude`` and ``maxFrequency`` (at least 0),
+        ``peakFrequency`` (frequency of the largest magnitude over all bins, -1
+        for the first bin or no positive magnitude), ``cutoffFrequency`` (last
+        plotted frequency after the first above 10% of the peak, else
+        maxFrequency) and ``halfFrequency`` (first plotted frequency below 50% of
+        the peak, else the last one)
+    """
+    frequencies = np.asarray(frequencies, dtype=np.float64).ravel()
+    magnitude = np.asarray(magnitude, dtype=np.float64)
+    phase = np.asarray(phase, dtype=np.float64)
+    # Results that are not a 1-D spectrum (e.g. wavelet scalograms) plot nothing
+    if magnitude.ndim != 1:
+        magnitude = magnitude.ravel()[:0]
+    if phase.ndim != 1:
+        phase = phase.ravel()[:0]
+    n = min(len(frequencies), len(magnitude))
+    step = max(1, int(stride))
+    
+    f = frequencies[:n:step]
+    m = magnitude[:n:step]
+    keep = np.isfinite(f) & np.isfinite(m)
+    fx, my = f[keep], m[keep]
+    replace_series(magnitude_series, fx, my)
+    
+    p = phase[:min(n, len(phase)):step]
+    keep = np.isfinite(f[:len(p)]) & np.isfinite(p)
+    replace_series(phase_series, f[:len(p)][keep], p[keep])
+    
+    max_magnitude = float(max(my.max(), 0.0)) if my.size else 0.0
+    max_frequency = float(max(fx.max(), 0.0)) if fx.size else 0.0
+    
+    peak_frequency = -1.0
+    values = np.where(np.isnan(magnitude[:n]), -np.inf, magnitude[:n])
+    if n and values.max() > 0:
+        peak = int(np.argmax(values))
+        if peak > 0:
+            peak_frequency = float(frequencies[peak])
+    
+    above = np.nonzero(my[1:] > max_magnitude * 0.1)[0]
+    cutoff_frequency = float(fx[above[-1] + 1]) if above.size else max_frequency
+    
+    below = np.nonzero(my < max_magnitude * 0.5)[0]
+    if below.size:
+        half_frequency = float(fx[below[0]])
+    else:
+        half_frequency = float(fx[-1]) if fx.size else 0.0
+    
+    return {
+        "count": int(fx.size),
+        "maxMagnitude": max_magnitude,
+        "maxFrequency": max_frequency,
+        "peakFrequency": peak_frequency,
+        "cutoffFrequency": cutoff_frequency,
+        "halfFrequency": half_frequency,
+    }
+
+
+def _bucket_indices(start, stop, buckets):
+    """Split the index range [start, stop) into equal buckets.
+    
+    Returns:
+        Tuple of (index matrix, valid mask) with one row per bucket; rows are
+        padded to the longest bucket and padding is marked invalid
+    """
+    edges = np.linspace(start, stop, buckets + 1).astype(np.int64)
+    lengths = np.diff(edges)
+    offsets = np.arange(max(1, lengths.max()))
+    index = edges[:-1, None] + offsets[None, :]
+    valid = offsets[None, :] < lengths[:, None]
+    return np.minimum(index, stop - 1), valid
+
+
+def lttb(x, y, max_points):
+    """Vectorized Largest-Triangle-Three-Buckets downsampling.
+    
+    Interior points are grouped into max_points - 2 buckets and each bucket
+    keeps the point forming the largest triangle with the previous bucket's
+    average and the next bucket's average. Using the previous average rather
+    than the previously chosen point lets every bucket be scored at once.
+    
+    Args:
+        x: Array of x coordinates (finite)
+        y: Array of y coordinates (finite)
+        max_points: Number of points to keep, including both end points
         
-        # Add last point
-        result_x.append(x_arr[-1])
-        result_y.append(y_arr[-1])
+    Returns:
+        Tuple of (x, y) NumPy arrays
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= max_points or max_points < 3:
+        return x, y
+    
+    index, valid = _bucket_indices(1, n - 1, max_points - 2)
+    bx = x[index]
+    by = y[index]
+    
+    # Bucket averages, ignoring padding
+    counts = valid.sum(axis=1)
+    mean_x = np.where(valid, bx, 0.0).sum(axis=1) / counts
+    mean_y = np.where(valid, by, 0.0).sum(axis=1) / counts
+    
+    # Anchors: previous bucket average (first point for the first bucket)
+    # and next bucket average (last point for the last bucket)
+    ax = np.concatenate(([x[0]], mean_x[:-1]))[:, None]
+    ay = np.concatenate(([y[0]], mean_y[:-1]))[:, None]
+    cx = np.concatenate((mean_x[1:], [x[-1]]))[:, None]
+    cy = np.concatenate((mean_y[1:], [y[-1]]))[:, None]
+    
+    # Twice the triangle area - the factor doesn't change the argmax
+    area = np.abs((ax - cx) * (by - ay) - (ax - bx) * (cy - ay))
+    area[~valid] = -1.0
+    chosen = index[np.arange(len(index)), area.argmax(axis=1)]
+    
+    keep = np.concatenate(([0], chosen, [n - 1]))
+    return x[keep], y[keep]
+
+
+def min_max_decimate(x, y, max_points):
+    """M4 decimation: keep the first, last, minimum and maximum point of each bucket.
+    
+    Every local extreme at the bucket resolution survives, so peaks are never
+    lost however large the input is.
+    
+    Args:
+        x: Array of x coordinates (finite)
+        y: Array of y coordinates (finite)
+        max_points: Upper bound on the number of points returned
         
-        return result_x, result_y
+    Returns:
+        Tuple of (x, y) NumPy arrays in original order
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    buckets = max(1, max_points // 4)
+    if n <= max_points:
+        return x, y
+    
+    index, valid = _bucket_indices(0, n, buckets)
+    values = y[index]
+    rows = np.arange(len(index))
+    lengths = valid.sum(axis=1)
+    
+    first = index[:, 0]
+    last = index[rows, lengths - 1]
+    low = index[rows, np.where(valid, values, np.inf).argmin(axis=1)]
+    high = index[rows, np.where(valid, values, -np.inf).argmax(axis=1)]
+    
+    keep = np.unique(np.concatenate((first, last, low, high)))
+    return x[keep], y[keep]
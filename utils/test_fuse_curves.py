@@ -8,13 +8,13 @@ try:
     db = DatabaseManager.get_instance()
     print('Database manager loaded successfully')
     
-    # Check if fuse_curves table exists
-    result = db.fetch_all('SELECT name FROM sqlite_master WHERE type="table" AND name="fuse_curves"')
-    print('fuse_curves table exists:', len(result) > 0)
+    # Check if fuse_characteristics table exists
+    result = db.fetch_all('SELECT name FROM sqlite_master WHERE type="table" AND name="fuse_characteristics"')
+    print('fuse_characteristics table exists:', len(result) > 0)
     
     if len(result) > 0:
-        count_result = db.fetch_all('SELECT COUNT(*) as count FROM fuse_curves')
-        print('Number of fuse curve rows:', count_result[0]['count'])
+        count_result = db.fetch_all('SELECT COUNT(*) as count FROM fuse_characteristics')
+        print('Number of fuse curves:', count_result[0]['count'])
         
         # Test the protection relay methods
         from models.protection.protection_relay import ProtectionRelayCalculator
@@ -1,63 +1,84 @@
 #!/usr/bin/env python3
 """
-Script to update ABB CEF fuse curves in the database with corrected values.
-This script will clear existing fuse curve data and reload it with the updated values.
+Import fuse time-current curves from manufacturer CSV datasets.
+
+Each CSV row is one curve point; see services/fuse_curve_store.py for the
+columns. Curves whose content hash matches the stored curve are left
+untouched, so re-importing a dataset only rewrites the curves that changed.
+Without arguments the reference curves in data/fuse_curves.csv are
+re-imported.
+
+Usage:
+    python utils/update_fuse_curves.py [CSV ...] [--prune] [--database PATH]
+
+--prune deletes stored curves of the imported manufacturers that are missing
+from the datasets, so a dataset replaces the manufacturer's whole catalogue.
 """
 
+import argparse
 import os
 import sys
-import sqlite3
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT_DIR)
 from services.database_manager import DatabaseManager
+from services.fuse_curve_store import import_curves, read_csv
 from services.logger_config import configure_logger
 
 # Configure logging
 logger = configure_logger("update_fuse_curves")
 
-def update_fuse_curves():
-    """Update the fuse curves data in the database."""
+DEFAULT_CSV = os.path.join(ROOT_DIR, 'data', 'fuse_curves.csv')
+DEFAULT_DATABASE = os.path.join(ROOT_DIR, 'data', 'application_data.db')
+
+
+def update_fuse_curves(csv_paths=(DEFAULT_CSV,), prune=False, db_path=DEFAULT_DATABASE):
+    """Import curve datasets into the database in one transaction."""
     try:
-        # Get database manager instance
-        db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), 'data', 'application_data.db'))
         logger.info(f"Updating fuse curves in database: {db_path}")
-        
         db_manager = DatabaseManager.get_instance(db_path)
-        
-        # Clear existing fuse curve data
-        logger.info("Clearing existing fuse curve data...")
-        db_manager.execute_query("DELETE FROM fuse_curves")
-        
-        # Force reload of fuse curves
-        logger.info("Reloading fuse curves with updated data...")
-        db_manager._load_fuse_curves()
-        
-        # Verify the update
-        result = db_manager.fetch_one("SELECT COUNT(*) as count FROM fuse_curves")
-        count = result['count'] if result else 0
-        logger.info(f"Successfully updated fuse curves. Total records: {count}")
-        
-        # Show sample data
-        sample_data = db_manager.fetch_all("""
-            SELECT fuse_type, rating, COUNT(*) as point_count
-            FROM fuse_curves 
-            WHERE manufacturer = 'EATON' 
-            GROUP BY fuse_type, rating 
-            ORDER BY rating
+
+        records = []
+        for path in csv_paths:
+            curves = read_csv(path)
+            logger.info(f"Read {len(curves)} curves from {path}")
+            records.extend(curves)
+
+        # A failure in any dataset keeps the old curves
+        counts = import_curves(db_manager, records, prune)
+        print("Fuse curves: {added} added, {updated} updated, "
+              "{unchanged} unchanged, {removed} removed".format(**counts))
+
+        summary = db_manager.fetch_all("""
+            SELECT manufacturer, fuse_type, rating, point_count, length(multipliers) * 3 AS bytes
+            FROM fuse_characteristics
+            ORDER BY manufacturer, fuse_type, rating
         """)
-        
-        logger.info("Updated fuse curve summary:")
-        for row in sample_data:
-            logger.info(f"  {row['fuse_type']} {row['rating']}A: {row['point_count']} points")
-        
+        for row in summary:
+            print(f"  {row['manufacturer']} {row['fuse_type']} {row['rating']}A: "
+                  f"{row['point_count']} points ({row['bytes']} bytes)")
+
         return True
-        
+
     except Exception as e:
         logger.error(f"Error updating fuse curves: {e}")
         return False
 
-if __name__ == "__main__":
-    success = update_fuse_curves()
-    if success:
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('csv', nargs='*', default=[DEFAULT_CSV], help="Curve point CSV files")
+    parser.add_argument('--prune', action='store_true',
+                        help="Delete curves of the imported manufacturers missing from the datasets")
+    parser.add_argument('--database', default=DEFAULT_DATABASE, help="Database to update")
+    args = parser.parse_args()
+
+    if update_fuse_curves(args.csv, args.prune, os.path.abspath(args.database)):
         print("✅ Fuse curves updated successfully!")
     else:
         print("❌ Failed to update fuse curves!")
         sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
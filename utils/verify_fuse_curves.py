@@ -6,6 +6,7 @@ Script to verify the updated ABB CEF fuse curves data.
 import os
 import sys
 from services.database_manager import DatabaseManager
+from services.fuse_curve_index import FuseCurveIndex
 from services.logger_config import configure_logger
 
 # Configure logging
@@ -18,67 +19,32 @@ def verify_fuse_curves():
         db_path = os.path.abspath(os.path.join(os.path.dirname(__file__), 'data', 'application_data.db'))
         db_manager = DatabaseManager.get_instance(db_path)
         
-        # Check total count
-        result = db_manager.fetch_one("SELECT COUNT(*) as count FROM fuse_curves")
-        total_count = result['count'] if result else 0
-        print(f"Total fuse curve records: {total_count}")
+        fuse_index = FuseCurveIndex(db_manager)
         
-        # Check available ratings
-        ratings = db_manager.fetch_all("""
-            SELECT DISTINCT rating 
-            FROM fuse_curves 
-            WHERE manufacturer = 'ABB' AND fuse_type = 'CEF'
-            ORDER BY rating
-        """)
+        # Check total count
+        result = db_manager.fetch_one(
+            "SELECT COUNT(*) as count, SUM(point_count) as points FROM fuse_characteristics")
+        print(f"Total fuse curves: {result['count']} ({result['points'] or 0} points)")
         
         print("\nAvailable ABB CEF ratings:")
-        for row in ratings:
-            rating = row['rating']
-            
-            # Get sample data points for this rating
-            sample_points = db_manager.fetch_all("""
-                SELECT current_multiplier, melting_time 
-                FROM fuse_curves 
-                WHERE manufacturer = 'ABB' AND fuse_type = 'CEF' AND rating = ?
-                ORDER BY current_multiplier
-                LIMIT 5
-            """, (rating,))
+        for rating in fuse_index.ratings('ABB', 'CEF'):
+            curve = fuse_index.curve('ABB', 'CEF', rating)
             
+            # Sample data points for this rating
             print(f"  {rating}A fuse:")
-            for point in sample_points:
-                current = rating * point['current_multiplier']
-                time = point['melting_time']
+            for multiplier, time in zip(curve.multipliers[:5], curve.melting[:5]):
+                current = rating * multiplier
                 print(f"    {current:6.1f}A -> {time:8.3f}s")
         
         # Test specific values that should match the screenshot
         print("\nTesting specific values from screenshot:")
         
-        # Test 6.3A fuse at 2x rated current (should be around 30s)
-        test_point = db_manager.fetch_one("""
-            SELECT melting_time FROM fuse_curves 
-            WHERE manufacturer = 'ABB' AND fuse_type = 'CEF' AND rating = 6.3
-            AND current_multiplier = 2.0
-        """)
-        if test_point:
-            print(f"  6.3A fuse at 2x (12.6A): {test_point['melting_time']}s")
-        
-        # Test 25A fuse at 3x rated current (should be around 15s)
-        test_point = db_manager.fetch_one("""
-            SELECT melting_time FROM fuse_curves 
-            WHERE manufacturer = 'ABB' AND fuse_type = 'CEF' AND rating = 25
-            AND current_multiplier = 3.0
-        """)
-        if test_point:
-            print(f"  25A fuse at 3x (75A): {test_point['melting_time']}s")
-        
-        # Test 100A fuse at 5x rated current (should be around 6s)
-        test_point = db_manager.fetch_one("""
-            SELECT melting_time FROM fuse_curves 
-            WHERE manufacturer = 'ABB' AND fuse_type = 'CEF' AND rating = 100
-            AND current_multiplier = 5.0
-        """)
-        if test_point:
-            print(f"  100A fuse at 5x (500A): {test_point['melting_time']}s")
+        # 6.3A fuse at 2x rated current (should be around 30s),
+        # 25A fuse at 3x (around 15s) and 100A fuse at 5x (around 6s)
+        for rating, multiple in ((6.3, 2.0), (25, 3.0), (100, 5.0)):
+            time = fuse_index.melting_times('ABB', 'CEF', rating, rating * multiple)
+            if time is not None:
+                print(f"  {rating}A fuse at {multiple:g}x ({rating * multiple:g}A): {time:g}s")
         
         return True
         